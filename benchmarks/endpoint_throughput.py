@@ -0,0 +1,76 @@
+"""
+Throughput of the event callback endpoint for the different pacing modes.
+
+    python benchmarks/endpoint_throughput.py [n_frames]
+"""
+
+from dash_event_callback import Pacing, event_callback, stream_props
+from dash_event_callback._event_callback import (
+    SSE_CALLBACK_ENDPOINT,
+    SSECallbackComponent,
+    generate_deterministic_id,
+)
+from dash import Dash, Input, html
+import json
+import sys
+import time
+
+N_FRAMES = int(sys.argv[1]) if len(sys.argv) > 1 else 1000
+ROWS = [{"country": "Germany", "year": 2007, "pop": 82400996}] * 20
+
+MODES = {
+    "none": Pacing.none(),
+    "fixed 50ms (legacy)": Pacing.fixed(0.05),
+    "max_rate 200/s": Pacing.max_rate(200),
+    "max_rate 200/s burst 50": Pacing.max_rate(200, burst=50),
+    "coalesce 10ms": Pacing.coalesce(10),
+}
+
+
+def register(name, pacing):
+    dependency = Input(f"bench-{name}", "n_clicks")
+
+    def stream(n_clicks):
+        for _ in range(N_FRAMES):
+            yield stream_props("bench-table", {"rowTransaction": {"add": ROWS}})
+
+    stream.__qualname__ = f"stream_{name}"
+    event_callback(dependency, pacing=pacing)(stream)
+    return generate_deterministic_id(stream, (dependency,))
+
+
+callback_ids = {name: register(name, pacing) for name, pacing in MODES.items()}
+
+app = Dash(__name__)
+app.layout = html.Div([html.Button(id=f"bench-{name}") for name in MODES])
+client = app.server.test_client()
+
+
+def run(callback_id):
+    sse_id = json.dumps(SSECallbackComponent.ids.sse(callback_id))
+    payload = {"content": {"sse_callback_id": sse_id, "n_clicks": 1}}
+    start = time.perf_counter()
+    response = client.post(
+        SSE_CALLBACK_ENDPOINT,
+        json=payload,
+        headers={"Accept": "text/event-stream"},
+        buffered=False,
+    )
+    writes = 0
+    size = 0
+    for chunk in response.response:
+        writes += 1
+        size += len(chunk)
+    return time.perf_counter() - start, writes, size
+
+
+if __name__ == "__main__":
+    run(callback_ids["none"])  # warm up lazy imports
+    print(f"{N_FRAMES} frames per stream")
+    print(f"{'mode':<26}{'seconds':>10}{'frames/s':>12}{'writes':>10}{'MB':>8}")
+    for name, callback_id in callback_ids.items():
+        elapsed, writes, size = run(callback_id)
+        print(
+            f"{name:<26}{elapsed:>10.3f}{N_FRAMES / elapsed:>12.0f}"
+            f"{writes:>10}{size / 1e6:>8.2f}"
+        )
@@ -0,0 +1,47 @@
+"""
+Encoding a stream_props frame with the different FrameEncoder backends.
+
+    python benchmarks/frame_encoding.py
+"""
+
+from dash_event_callback import FrameEncoder, stream_props
+from dash import dcc
+import plotly.express as px
+import pandas as pd
+import numpy as np
+import timeit
+
+gapminder = px.data.gapminder()
+chunk = pd.concat([gapminder] * 3).head(5000)
+chunk["when"] = pd.Timestamp("2024-01-01")
+
+records = chunk.to_dict("records")
+figure = px.scatter(gapminder, x="gdpPercap", y="lifeExp")
+x, y = np.arange(100_000), np.random.rand(100_000)
+
+CASES = {
+    "5000 records": lambda: stream_props("grid", {"rowData": records}),
+    "figure": lambda: stream_props("graph", {"figure": figure}),
+    "component": lambda: stream_props("page", {"children": dcc.Graph(figure=figure)}),
+    "numpy columns": lambda: stream_props(
+        "graph", {"extendData": [{"x": [x], "y": [y]}, [0]]}
+    ),
+}
+
+
+if __name__ == "__main__":
+    backends = []
+    for backend in ("json", "orjson", "msgspec"):
+        try:
+            FrameEncoder.configure(backend)
+            backends.append(backend)
+        except ImportError:
+            print(f"{backend} is not installed, skipping")
+
+    print(f"{'case':<20}" + "".join(f"{backend + ' ms':>14}" for backend in backends))
+    for name, encode in CASES.items():
+        row = f"{name:<20}"
+        for backend in backends:
+            FrameEncoder.configure(backend)
+            row += f"{min(timeit.repeat(encode, number=1, repeat=5)) * 1e3:>14.2f}"
+        print(row)
@@ -0,0 +1,48 @@
+"""
+Refreshing a grid of N_ROWS rows in which CHANGED of the rows changed:
+bytes and time of resending `rowData` against a `GridDiff` transaction.
+
+    python benchmarks/grid_diff.py [n_rows] [changed]
+"""
+
+from dash_event_callback import GridDiff
+from dash_event_callback._dataframe import _grid_frame, _records_json
+import numpy as np
+import pandas as pd
+import sys
+import time
+
+N_ROWS = int(sys.argv[1]) if len(sys.argv) > 1 else 50_000
+CHANGED = float(sys.argv[2]) if len(sys.argv) > 2 else 0.01
+
+rng = np.random.default_rng(0)
+df = pd.DataFrame(
+    {
+        "id": np.arange(N_ROWS),
+        "country": [f"Country {i % 142}" for i in range(N_ROWS)],
+        "year": 1952 + np.arange(N_ROWS) % 12 * 5,
+        "pop": rng.random(N_ROWS) * 1e6,
+        "lifeExp": rng.random(N_ROWS) * 40 + 40,
+        "gdpPercap": rng.random(N_ROWS) * 1e4,
+    }
+)
+refreshed = df.copy()
+rows = rng.choice(N_ROWS, int(N_ROWS * CHANGED), replace=False)
+refreshed.loc[rows, "pop"] *= 1.01
+
+
+def timed(make):
+    start = time.perf_counter()
+    frames = make()
+    return sum(map(len, frames)), (time.perf_counter() - start) * 1000
+
+
+grid = GridDiff("grid")
+list(grid.update(df))
+
+full_bytes, full_ms = timed(lambda: [_grid_frame("grid", b'{"rowData":' + _records_json(refreshed) + b"}")])
+diff_bytes, diff_ms = timed(lambda: list(grid.update(refreshed)))
+
+print(f"{N_ROWS} rows, {len(rows)} changed")
+print(f"rowData      {full_bytes / 1e6:8.2f} MB {full_ms:8.1f} ms")
+print(f"GridDiff     {diff_bytes / 1e6:8.2f} MB {diff_ms:8.1f} ms  ({diff_bytes / full_bytes:.1%} of the bytes)")
@@ -0,0 +1,55 @@
+"""
+Overlapping the generator with the writes: a stream whose items take
+FETCH_MS to produce, written to a client that takes SEND_MS per frame,
+with and without `prefetch`.
+
+    python benchmarks/prefetch.py [n_items]
+"""
+
+from dash_event_callback import stream_props
+from dash_event_callback._event_callback import _SSEServerObject, run_callback
+import asyncio
+import random
+import sys
+import time
+
+N_ITEMS = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+FETCH_MS = 5
+SEND_MS = 5
+
+
+def jitter(ms):
+    # Partitions and sends don't take the same time every step.
+    return random.uniform(0.5, 1.5) * ms / 1000
+
+
+def sync_partitions():
+    for i in range(N_ITEMS):
+        time.sleep(jitter(FETCH_MS))
+        yield stream_props("grid", {"rowTransaction": {"add": [{"i": i}]}})
+
+
+async def async_partitions():
+    for i in range(N_ITEMS):
+        await asyncio.sleep(jitter(FETCH_MS))
+        yield stream_props("grid", {"rowTransaction": {"add": [{"i": i}]}})
+
+
+async def measure(func, prefetch):
+    sse_obj = _SSEServerObject(func, None, [], timeout=None, prefetch=prefetch)
+
+    async def write(chunk):
+        await asyncio.sleep(jitter(SEND_MS))
+
+    start = time.perf_counter()
+    await run_callback(sse_obj, "benchmark", {}, write, "benchmark")
+    return time.perf_counter() - start
+
+
+if __name__ == "__main__":
+    print(f"{N_ITEMS} items, {FETCH_MS}ms per item, {SEND_MS}ms per send")
+    print(f"{'generator':<18}{'prefetch':>10}{'items/s':>10}")
+    for func in (sync_partitions, async_partitions):
+        for prefetch in (None, 1, 4, 16):
+            elapsed = asyncio.run(measure(func, prefetch))
+            print(f"{func.__name__:<18}{str(prefetch):>10}{N_ITEMS / elapsed:>10.0f}")
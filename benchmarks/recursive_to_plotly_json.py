@@ -0,0 +1,131 @@
+"""
+recursive_to_plotly_json against the implementation it replaced.
+
+    python benchmarks/recursive_to_plotly_json.py
+"""
+
+from dash_event_callback.helper import recursive_to_plotly_json
+from dash import dcc, html
+import plotly.express as px
+import pandas as pd
+import numpy as np
+import copy
+import timeit
+
+
+def legacy_recursive_to_plotly_json(component):
+    """The previous implementation: optional imports and attribute probes on every call."""
+    if component is None or isinstance(component, (str, int, float, bool)):
+        return component
+
+    try:
+        import numpy as np
+
+        if isinstance(component, np.ndarray):
+            return component.tolist()
+        elif np.isscalar(component) and not isinstance(
+            component, (bool, int, float, complex)
+        ):
+            return component.item()
+    except (ImportError, AttributeError):
+        pass
+
+    try:
+        import pandas as pd
+
+        if isinstance(component, (pd.Series, pd.DataFrame)):
+            return component.to_dict()
+        elif isinstance(component, pd.Timestamp):
+            return component.isoformat()
+        elif component is pd.NaT:
+            return None
+    except (ImportError, AttributeError):
+        pass
+
+    try:
+        import datetime
+
+        if isinstance(component, (datetime.date, datetime.datetime)):
+            return component.isoformat()
+    except (ImportError, AttributeError):
+        pass
+
+    try:
+        import decimal
+
+        if isinstance(component, decimal.Decimal):
+            return float(component)
+    except (ImportError, AttributeError):
+        pass
+
+    if hasattr(component, "to_plotly_json"):
+        component = component.to_plotly_json()
+
+    if hasattr(component, "tolist"):
+        try:
+            return component.tolist()
+        except Exception:
+            pass
+
+    if hasattr(component, "to_dict"):
+        try:
+            return component.to_dict()
+        except Exception:
+            pass
+
+    if isinstance(component, dict):
+        for key, value in list(component.items()):
+            if isinstance(value, list):
+                component[key] = [legacy_recursive_to_plotly_json(item) for item in value]
+            else:
+                component[key] = legacy_recursive_to_plotly_json(value)
+    elif isinstance(component, list):
+        component = [legacy_recursive_to_plotly_json(item) for item in component]
+    else:
+        try:
+            return str(component)
+        except Exception:
+            return None
+
+    return component
+
+
+def component_tree(depth=4, width=4):
+    if depth == 0:
+        return html.Span("leaf", style={"color": "red"}, className="leaf")
+    return html.Div(
+        [component_tree(depth - 1, width) for _ in range(width)],
+        id={"type": "node", "index": depth},
+    )
+
+
+gapminder = px.data.gapminder()
+records = pd.concat([gapminder] * 3).head(5000).to_dict("records")
+mixed_records = [
+    {**row, "when": pd.Timestamp("2024-01-01"), "score": np.float32(row["lifeExp"])}
+    for row in records
+]
+
+CASES = {
+    "component tree (4x4)": lambda: component_tree(),
+    "5000 records": lambda: copy.deepcopy(records),
+    "5000 records (numpy/pandas values)": lambda: copy.deepcopy(mixed_records),
+    "figure": lambda: dcc.Graph(figure=px.scatter(gapminder, x="gdpPercap", y="lifeExp")),
+}
+
+
+if __name__ == "__main__":
+    print(f"{'case':<38}{'legacy ms':>12}{'dispatch ms':>14}{'speedup':>10}")
+    for name, make in CASES.items():
+        timings = []
+        for convert in (legacy_recursive_to_plotly_json, recursive_to_plotly_json):
+            # Inputs are built outside of the timing, the legacy version mutates them.
+            inputs = [make() for _ in range(5)]
+            timings.append(
+                min(timeit.repeat(lambda: convert(inputs.pop()), number=1, repeat=5))
+            )
+        legacy, dispatch = timings
+        print(
+            f"{name:<38}{legacy * 1e3:>12.2f}{dispatch * 1e3:>14.2f}"
+            f"{legacy / dispatch:>9.1f}x"
+        )
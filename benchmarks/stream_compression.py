@@ -0,0 +1,36 @@
+"""
+Per-frame gzip compression of a DataFrame stream: bytes on the wire and
+compression time for different chunk sizes and levels.
+
+    python benchmarks/stream_compression.py [n_rows]
+"""
+
+from dash_event_callback import stream_dataframe
+from dash_event_callback._compression import GzipFrames
+import plotly.express as px
+import pandas as pd
+import sys
+import time
+
+N_ROWS = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+
+gapminder = px.data.gapminder()
+df = pd.concat([gapminder] * (N_ROWS // len(gapminder) + 1)).head(N_ROWS)
+df = df.reset_index(drop=True)
+
+
+if __name__ == "__main__":
+    print(f"{N_ROWS} rows")
+    print(f"{'chunk rows':>10}{'level':>7}{'MB raw':>10}{'MB gzip':>10}{'ratio':>8}{'ms/frame':>10}")
+    for chunk_rows in (10, 100, 1000, 10_000):
+        frames = list(stream_dataframe("grid", df, chunk_rows))
+        raw = sum(len(frame) for frame in frames)
+        for level in (1, 6):
+            gzip = GzipFrames(level)
+            start = time.perf_counter()
+            sent = sum(len(gzip.compress(frame)) for frame in frames) + len(gzip.finish())
+            elapsed = time.perf_counter() - start
+            print(
+                f"{chunk_rows:>10}{level:>7}{raw / 1e6:>10.2f}{sent / 1e6:>10.2f}"
+                f"{raw / sent:>8.1f}{elapsed / len(frames) * 1e3:>10.3f}"
+            )
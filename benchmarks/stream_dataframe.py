@@ -0,0 +1,57 @@
+"""
+Streaming a DataFrame into an ag-grid: stream_dataframe against
+stream_props with `to_dict("records")` chunks.
+
+    python benchmarks/stream_dataframe.py [n_rows]
+"""
+
+from dash_event_callback import FrameEncoder, stream_dataframe, stream_props
+import plotly.express as px
+import pandas as pd
+import sys
+import time
+import tracemalloc
+
+N_ROWS = int(sys.argv[1]) if len(sys.argv) > 1 else 200_000
+CHUNK_ROWS = 5000
+
+gapminder = px.data.gapminder()
+df = pd.concat([gapminder] * (N_ROWS // len(gapminder) + 1)).head(N_ROWS)
+df = df.reset_index(drop=True)
+df["when"] = pd.Timestamp("2024-01-01")
+
+
+def records_frames(df):
+    for start in range(0, len(df), CHUNK_ROWS):
+        rows = df.iloc[start : start + CHUNK_ROWS].to_dict("records")
+        if start == 0:
+            columnDefs = [{"field": col} for col in df.columns]
+            yield stream_props("grid", {"rowData": rows, "columnDefs": columnDefs})
+        else:
+            yield stream_props("grid", {"rowTransaction": {"add": rows}})
+
+
+def measure(frames):
+    tracemalloc.start()
+    start = time.perf_counter()
+    size = sum(len(frame) for frame in frames)
+    elapsed = time.perf_counter() - start
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return elapsed, size, peak
+
+
+if __name__ == "__main__":
+    print(f"{N_ROWS} rows, {CHUNK_ROWS} rows per frame")
+    print(f"{'method':<34}{'rows/s':>12}{'MB sent':>10}{'peak MB':>10}")
+    for backend in ("json", "orjson"):
+        try:
+            FrameEncoder.configure(backend)
+        except ImportError:
+            continue
+        for name, frames in (
+            (f"to_dict records ({backend})", records_frames(df)),
+            (f"stream_dataframe ({backend})", stream_dataframe("grid", df, CHUNK_ROWS)),
+        ):
+            elapsed, size, peak = measure(frames)
+            print(f"{name:<34}{N_ROWS / elapsed:>12.0f}{size / 1e6:>10.1f}{peak / 1e6:>10.1f}")
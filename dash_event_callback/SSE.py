@@ -34,6 +34,11 @@ Keyword arguments:
 - done (boolean; optional):
     A boolean indicating if the (current) stream has ended.
 
+- max_flush_rate (number; optional):
+    Maximum number of times per second the streamed updates are
+    applied to the components. By default they are applied once per
+    animation frame.
+
 - options (dict; optional):
     Options passed to the SSE constructor.
 
@@ -66,7 +71,11 @@ Keyword arguments:
 
 - value (string; optional):
     The data value. Either the latest, or the concatenated depending
-    on the `concat` property."""
+    on the `concat` property.
+
+- worker_threshold (number; optional):
+    Frames of at least this many characters are parsed in a Web Worker
+    instead of the main thread. Off by default."""
     _children_props = []
     _base_nodes = ['children']
     _namespace = 'dash_event_callback'
@@ -93,11 +102,13 @@ Keyword arguments:
         value: typing.Optional[str] = None,
         done: typing.Optional[bool] = None,
         update_component: typing.Optional[bool] = None,
+        max_flush_rate: typing.Optional[NumberType] = None,
+        worker_threshold: typing.Optional[NumberType] = None,
         **kwargs
     ):
-        self._prop_names = ['id', 'concat', 'done', 'options', 'update_component', 'url', 'value']
+        self._prop_names = ['id', 'concat', 'done', 'max_flush_rate', 'options', 'update_component', 'url', 'value', 'worker_threshold']
         self._valid_wildcard_attributes =            []
-        self.available_properties = ['id', 'concat', 'done', 'options', 'update_component', 'url', 'value']
+        self.available_properties = ['id', 'concat', 'done', 'max_flush_rate', 'options', 'update_component', 'url', 'value', 'worker_threshold']
         self.available_wildcard_properties =            []
         _explicit_args = kwargs.pop('_explicit_args')
         _locals = locals()
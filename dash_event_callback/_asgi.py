@@ -0,0 +1,218 @@
+from ._event_callback import (
+    SSE_CALLBACK_ENDPOINT,
+    SSE_CANCEL_ENDPOINT,
+    parse_sse_request,
+    stream_callback,
+)
+from ._cancellation import StreamCancellation
+from ._heartbeat import with_heartbeat
+from ._compression import GzipFrames, StreamCompression
+from ._multiplex import (
+    MULTIPLEX_CANCEL_ENDPOINT,
+    MULTIPLEX_ENDPOINT,
+    MULTIPLEX_STREAM_HEADER,
+    MULTIPLEX_TAB_HEADER,
+    StreamMultiplex,
+)
+from urllib.parse import parse_qs
+from functools import partial
+import typing as _t
+import asyncio
+import json
+
+_ASGIApp: _t.TypeAlias = _t.Callable[
+    [_t.Dict[str, _t.Any], _t.Callable, _t.Callable], _t.Awaitable[None]
+]
+
+
+def make_asgi_app(fallback: _ASGIApp, routes_pathname_prefix: str = "/") -> _ASGIApp:
+    """
+    Serve event callback streams natively on an ASGI server.
+
+    Requests to the event callback endpoints are handled on the server's event
+    loop, so concurrent streams share one loop instead of holding a thread
+    each. Every other request is passed on to `fallback`, e.g. the Dash app
+    wrapped with `asgiref.wsgi.WsgiToAsgi(app.server)`.
+
+    >>> asgi_app = make_asgi_app(WsgiToAsgi(app.server))
+    >>> uvicorn.run(asgi_app)
+    """
+    prefix = routes_pathname_prefix.rstrip("/")
+    routes = {
+        ("POST", prefix + SSE_CALLBACK_ENDPOINT): _serve_stream,
+        ("POST", prefix + SSE_CANCEL_ENDPOINT): _cancel_invocation,
+        ("GET", prefix + MULTIPLEX_ENDPOINT): _serve_multiplex,
+        ("POST", prefix + MULTIPLEX_CANCEL_ENDPOINT): _cancel_multiplexed,
+    }
+
+    async def app(scope, receive, send):
+        handler = scope["type"] == "http" and routes.get((scope["method"], scope["path"]))
+        if handler:
+            await handler(scope, receive, send)
+        else:
+            await fallback(scope, receive, send)
+
+    return app
+
+
+def _headers(scope) -> _t.Dict[str, str]:
+    return {
+        key.decode("latin-1").lower(): value.decode("latin-1")
+        for key, value in scope["headers"]
+    }
+
+
+async def _read_body(receive) -> bytes:
+    body = b""
+    more_body = True
+    while more_body:
+        message = await receive()
+        body += message.get("body", b"")
+        more_body = message.get("more_body", False)
+    return body
+
+
+async def _respond(send, status: int, body: bytes = b"", content_type: bytes | None = None):
+    headers = [(b"content-type", content_type)] if content_type else []
+    await send({"type": "http.response.start", "status": status, "headers": headers})
+    await send({"type": "http.response.body", "body": body})
+
+
+async def _follow(receive, stream: _t.Callable[[], _t.Awaitable[None]]) -> bool:
+    """Await `stream`, cancel it when the client disconnects. Returns whether it completed."""
+    task = asyncio.create_task(stream())
+    disconnected = asyncio.Event()
+
+    async def watch_disconnect():
+        while (await receive())["type"] != "http.disconnect":
+            pass
+        disconnected.set()
+        task.cancel()
+
+    watcher = asyncio.create_task(watch_disconnect())
+    try:
+        await task
+    except asyncio.CancelledError:
+        if not disconnected.is_set():
+            raise
+        return False
+    finally:
+        watcher.cancel()
+    return True
+
+
+async def _serve_multiplex(scope, receive, send):
+    tab = parse_qs(scope["query_string"].decode("latin-1")).get("tab", [None])[0]
+    if not tab:
+        await _respond(send, 400)
+        return
+
+    await send(
+        {
+            "type": "http.response.start",
+            "status": 200,
+            "headers": [
+                (b"content-type", b"text/event-stream"),
+                (b"cache-control", b"no-cache"),
+            ],
+        }
+    )
+
+    async def write(chunk: bytes):
+        await send({"type": "http.response.body", "body": chunk, "more_body": True})
+
+    await _follow(receive, partial(with_heartbeat(partial(StreamMultiplex.serve, tab)), write))
+
+
+async def _cancel_invocation(scope, receive, send):
+    invocation_id = json.loads(await _read_body(receive)).get("invocation")
+    if not invocation_id:
+        await _respond(send, 400)
+        return
+    cancelled = StreamCancellation.cancel(invocation_id)
+    await _respond(
+        send, 200, json.dumps({"cancelled": cancelled}).encode(), b"application/json"
+    )
+
+
+async def _cancel_multiplexed(scope, receive, send):
+    data = json.loads(await _read_body(receive))
+    cancelled = await StreamMultiplex.cancel(data["tab"], data["stream"])
+    await _respond(
+        send, 200, json.dumps({"cancelled": cancelled}).encode(), b"application/json"
+    )
+
+
+async def _serve_stream(scope, receive, send):
+    headers = _headers(scope)
+    tab = headers.get(MULTIPLEX_TAB_HEADER.lower())
+    if tab:
+        # Multiplexed: start in the background, frames go over the tab's stream.
+        callback_id, content = parse_sse_request(json.loads(await _read_body(receive)))
+        stream_id = headers.get(MULTIPLEX_STREAM_HEADER.lower())
+        if not stream_id:
+            await _respond(send, 400)
+            return
+        await StreamMultiplex.start(
+            tab, stream_id, partial(stream_callback, callback_id, content)
+        )
+        await _respond(send, 202)
+        return
+
+    accept = headers.get("accept", "")
+    if "text/event-stream" not in accept and "*/*" not in accept:
+        await _respond(send, 400)
+        return
+
+    callback_id, content = parse_sse_request(json.loads(await _read_body(receive)))
+    gzip: GzipFrames | None = None
+    started = False
+
+    async def start(first_chunk: bytes):
+        nonlocal gzip, started
+        response_headers = [
+            (b"content-type", b"text/event-stream"),
+            (b"cache-control", b"no-cache"),
+        ]
+        if StreamCompression.enabled:
+            response_headers.append((b"vary", b"Accept-Encoding"))
+            gzip = StreamCompression.negotiate(headers.get("accept-encoding"), first_chunk)
+            if gzip:
+                response_headers.append((b"content-encoding", b"gzip"))
+
+        started = True
+        await send(
+            {"type": "http.response.start", "status": 200, "headers": response_headers}
+        )
+
+    async def write(chunk: bytes):
+        # Headers wait for the first frame, it decides about compression.
+        if not started:
+            await start(chunk)
+        if gzip:
+            chunk = gzip.compress(chunk)
+        await send({"type": "http.response.body", "body": chunk, "more_body": True})
+
+    stream = partial(
+        with_heartbeat(
+            partial(
+                stream_callback,
+                callback_id,
+                content,
+                last_event_id=headers.get("last-event-id"),
+            )
+        ),
+        write,
+    )
+    if not await _follow(receive, stream):
+        return
+
+    if not started:
+        await start(b"")
+    await send(
+        {
+            "type": "http.response.body",
+            "body": gzip.finish() if gzip else b"",
+            "more_body": False,
+        }
+    )
@@ -0,0 +1,128 @@
+from contextlib import asynccontextmanager
+from dataclasses import dataclass
+from collections import deque
+import typing as _t
+import asyncio
+
+write_type: _t.TypeAlias = _t.Callable[[bytes], _t.Awaitable[None]]
+
+POLICIES: _t.Final = ("block", "drop_oldest", "latest")
+
+
+@dataclass(frozen=True)
+class Backpressure:
+    """
+    What an event callback does when its client reads slower than the
+    generator yields.
+
+    Frames wait in an outgoing buffer of at most `max_frames` frames. When
+    it is full:
+    >>> Backpressure.block()             # the generator waits for the client (default)
+    >>> Backpressure.block(32)           # ... once 32 frames are buffered
+    >>> Backpressure.drop_oldest(32)     # the oldest buffered update is dropped
+    >>> Backpressure.latest(32)          # buffered updates collapse to the latest value per (component, prop)
+
+    Only `stream_props` updates are dropped or collapsed. Other frames (e.g.
+    errors) and accumulating props like `rowTransaction` are never lost, the
+    generator waits for the client instead.
+    """
+
+    policy: _t.Literal["block", "drop_oldest", "latest"] = "block"
+    max_frames: int = 1
+
+    def __post_init__(self):
+        if self.policy not in POLICIES:
+            raise ValueError(f"Backpressure policy must be one of {POLICIES}")
+        if self.max_frames < 1:
+            raise ValueError("Backpressure max_frames must be at least 1")
+
+    @classmethod
+    def block(cls, max_frames: int = 1) -> "Backpressure":
+        return cls("block", max_frames)
+
+    @classmethod
+    def drop_oldest(cls, max_frames: int = 16) -> "Backpressure":
+        return cls("drop_oldest", max_frames)
+
+    @classmethod
+    def latest(cls, max_frames: int = 16) -> "Backpressure":
+        return cls("latest", max_frames)
+
+
+@asynccontextmanager
+async def backpressured(
+    write: write_type,
+    backpressure: Backpressure,
+    collapse: _t.Callable[[_t.List[bytes]], _t.List[bytes]],
+    droppable: _t.Callable[[bytes], bool],
+) -> _t.AsyncIterator[write_type]:
+    """
+    Yield a `write` that puts frames into the outgoing buffer of a stream,
+    a background task passes them on to `write` as fast as the client reads.
+
+    `collapse` merges buffered frames for the `latest` policy, `droppable`
+    tells which frames the `drop_oldest` policy may drop. Leaving the
+    context writes the rest of the buffer.
+    """
+    if backpressure == Backpressure():
+        # A single frame in flight is what the transport already does.
+        yield write
+        return
+
+    max_frames = backpressure.max_frames
+    frames: deque = deque()
+    pending = asyncio.Event()
+    space = asyncio.Event()
+    closed = False
+
+    async def drain():
+        while True:
+            if not frames:
+                if closed:
+                    return
+                pending.clear()
+                await pending.wait()
+                continue
+            frame = frames.popleft()
+            space.set()
+            await write(frame)
+
+    drainer = asyncio.create_task(drain())
+    # Wake up a waiting writer if the client is gone.
+    drainer.add_done_callback(lambda _: space.set())
+
+    def shrink():
+        if backpressure.policy == "latest":
+            collapsed = collapse(list(frames))
+            frames.clear()
+            frames.extend(collapsed)
+        elif backpressure.policy == "drop_oldest":
+            # The newest frame is kept, the writer waits for room instead.
+            for index in range(len(frames) - 1):
+                if droppable(frames[index]):
+                    del frames[index]
+                    return
+
+    async def buffered_write(frame: bytes):
+        if drainer.done():
+            drainer.result()
+        frames.append(frame)
+        pending.set()
+        if len(frames) > max_frames:
+            shrink()
+        while len(frames) > max_frames and not drainer.done():
+            space.clear()
+            await space.wait()
+        if drainer.done():
+            drainer.result()
+
+    try:
+        yield buffered_write
+    except BaseException:
+        drainer.cancel()
+        await asyncio.gather(drainer, return_exceptions=True)
+        raise
+
+    closed = True
+    pending.set()
+    await drainer
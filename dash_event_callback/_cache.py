@@ -0,0 +1,169 @@
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from pathlib import Path
+import typing as _t
+import asyncio
+import hashlib
+import os
+import struct
+import tempfile
+import time
+
+
+class StreamCache(ABC):
+    """
+    Cache of the frames of completed event callback streams.
+
+    Pass an instance as `event_callback(cache=...)`: a request with the same
+    inputs as a completed stream replays its frames without running the
+    generator. Entries expire `ttl` seconds after they were stored and the
+    least recently used entries are evicted once the cache holds more than
+    `max_bytes`. Streams that fail or are cancelled are not cached. With
+    `paced=False` cached frames are sent at once instead of with the pacing
+    of the callback.
+
+    Implement `get`, `set` and `clear` for other stores.
+    """
+
+    def __init__(self, ttl: float | None = 3600.0, max_bytes: int = 64 * 2**20, paced: bool = True):
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        self.paced = paced
+
+    def _expires(self) -> float:
+        return time.time() + self.ttl if self.ttl is not None else float("inf")
+
+    @abstractmethod
+    async def get(self, key: str) -> _t.List[bytes] | None:
+        """The frames stored for `key`, `None` on a miss."""
+
+    @abstractmethod
+    async def set(self, key: str, frames: _t.List[bytes]) -> None:
+        """Store the frames of a completed stream for `key`."""
+
+    @abstractmethod
+    async def clear(self) -> None:
+        """Drop all entries."""
+
+
+class MemoryStreamCache(StreamCache):
+    """Streams cached in the memory of this process."""
+
+    def __init__(self, ttl: float | None = 3600.0, max_bytes: int = 64 * 2**20, paced: bool = True):
+        super().__init__(ttl, max_bytes, paced)
+        self._entries: OrderedDict[str, _t.Tuple[float, _t.List[bytes], int]] = OrderedDict()
+        self._size = 0
+
+    async def get(self, key: str) -> _t.List[bytes] | None:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        expires, frames, size = entry
+        if expires < time.time():
+            del self._entries[key]
+            self._size -= size
+            return None
+        self._entries.move_to_end(key)
+        return frames
+
+    async def set(self, key: str, frames: _t.List[bytes]) -> None:
+        size = sum(len(frame) for frame in frames)
+        if size > self.max_bytes:
+            return
+        if key in self._entries:
+            self._size -= self._entries.pop(key)[2]
+        self._entries[key] = (self._expires(), frames, size)
+        self._size += size
+        while self._size > self.max_bytes:
+            self._size -= self._entries.popitem(last=False)[1][2]
+
+    async def clear(self) -> None:
+        self._entries.clear()
+        self._size = 0
+
+
+class DiskStreamCache(StreamCache):
+    """
+    Streams cached as files in `directory`, shared by all workers on the host.
+
+    The modification time of a file is its last use, eviction removes the
+    oldest files first.
+    """
+
+    _HEADER = struct.Struct("<d")
+    _LENGTH = struct.Struct("<I")
+
+    def __init__(
+        self,
+        directory: str | os.PathLike,
+        ttl: float | None = 3600.0,
+        max_bytes: int = 256 * 2**20,
+        paced: bool = True,
+    ):
+        super().__init__(ttl, max_bytes, paced)
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+
+    def _path(self, key: str) -> Path:
+        return self.directory / (hashlib.sha256(key.encode("utf-8")).hexdigest() + ".sse")
+
+    def _read(self, key: str) -> _t.List[bytes] | None:
+        path = self._path(key)
+        try:
+            data = path.read_bytes()
+        except FileNotFoundError:
+            return None
+
+        (expires,) = self._HEADER.unpack_from(data)
+        if expires < time.time():
+            path.unlink(missing_ok=True)
+            return None
+        os.utime(path)
+
+        frames = []
+        offset = self._HEADER.size
+        while offset < len(data):
+            (length,) = self._LENGTH.unpack_from(data, offset)
+            offset += self._LENGTH.size
+            frames.append(data[offset : offset + length])
+            offset += length
+        return frames
+
+    def _write(self, key: str, frames: _t.List[bytes]):
+        data = [self._HEADER.pack(self._expires())]
+        for frame in frames:
+            data.append(self._LENGTH.pack(len(frame)))
+            data.append(frame)
+
+        fd, tmp = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+        with os.fdopen(fd, "wb") as f:
+            f.writelines(data)
+        os.replace(tmp, self._path(key))
+        self._evict()
+
+    def _evict(self):
+        files = []
+        for path in self.directory.glob("*.sse"):
+            try:
+                stat = path.stat()
+            except FileNotFoundError:
+                continue
+            files.append((stat.st_mtime, stat.st_size, path))
+
+        size = sum(file_size for _, file_size, _ in files)
+        for _, file_size, path in sorted(files):
+            if size <= self.max_bytes:
+                break
+            path.unlink(missing_ok=True)
+            size -= file_size
+
+    async def get(self, key: str) -> _t.List[bytes] | None:
+        return await asyncio.to_thread(self._read, key)
+
+    async def set(self, key: str, frames: _t.List[bytes]) -> None:
+        if sum(len(frame) for frame in frames) <= self.max_bytes:
+            await asyncio.to_thread(self._write, key, frames)
+
+    async def clear(self) -> None:
+        for path in self.directory.glob("*.sse"):
+            path.unlink(missing_ok=True)
@@ -0,0 +1,136 @@
+from contextvars import ContextVar
+import typing as _t
+import asyncio
+import threading
+import time
+
+
+class StreamCancelled(Exception):
+    """Raised by `CancelToken.raise_if_cancelled` once the invocation was cancelled."""
+
+
+class CancelToken:
+    """
+    Cooperative cancellation of an event callback invocation.
+
+    Sync generators can't be interrupted while they are blocked in a step,
+    check the token between units of work, or wait with `sleep`, to stop
+    as soon as the invocation is cancelled or its `timeout` is over.
+    `remaining()` is the time left until the timeout, e.g. to size query
+    chunks.
+
+    >>> token = cancel_token()
+    >>> for batch in cursor:
+    ...     token.raise_if_cancelled()
+    ...     yield stream_props("table", {"rowData": batch})
+    """
+
+    def __init__(self, deadline: float | None = None, event: threading.Event | None = None):
+        self._event = threading.Event() if event is None else event
+        # `time.monotonic()` at which the invocation times out
+        self.deadline = deadline
+
+    @property
+    def cancelled(self) -> bool:
+        return self._event.is_set()
+
+    @property
+    def expired(self) -> bool:
+        return self.deadline is not None and time.monotonic() >= self.deadline
+
+    def remaining(self) -> float | None:
+        """Seconds until the invocation times out, `None` without a timeout."""
+        if self.deadline is None:
+            return None
+        return max(self.deadline - time.monotonic(), 0.0)
+
+    def cancel(self):
+        self._event.set()
+
+    def raise_if_cancelled(self):
+        if self._event.is_set():
+            raise StreamCancelled("The event callback was cancelled")
+        if self.expired:
+            raise TimeoutError("The event callback timed out")
+
+    def sleep(self, seconds: float) -> bool:
+        """
+        Sleep for `seconds`, return early with `True` if the invocation is
+        cancelled or times out in the meantime.
+        """
+        remaining = self.remaining()
+        if remaining is not None and remaining < seconds:
+            return self._event.wait(remaining) or True
+        return self._event.wait(seconds)
+
+
+_current_token: ContextVar[CancelToken | None] = ContextVar(
+    "dash_event_callback_cancel_token", default=None
+)
+
+
+def cancel_token() -> CancelToken:
+    """The cancel token of the running event callback invocation."""
+    token = _current_token.get()
+    if token is None:
+        # Outside an invocation nothing can cancel it.
+        token = CancelToken()
+    return token
+
+
+class StreamCancellation:
+    """
+    Registry of the running event callback invocations by invocation id.
+
+    `cancel` sets the invocation's `CancelToken`, cancels its task and
+    closes the generator, it is called by the cancel endpoint when the
+    `cancel` condition of an `event_callback` is met.
+    """
+
+    _invocations: _t.Dict[str, _t.Tuple[CancelToken, asyncio.Task]] = {}
+
+    @classmethod
+    def register(cls, invocation_id: str, token: CancelToken, task: asyncio.Task):
+        cls._invocations[invocation_id] = (token, task)
+
+    @classmethod
+    def unregister(cls, invocation_id: str, task: asyncio.Task):
+        entry = cls._invocations.get(invocation_id)
+        if entry is not None and entry[1] is task:
+            del cls._invocations[invocation_id]
+
+    @classmethod
+    def running(cls) -> _t.List[str]:
+        return list(cls._invocations)
+
+    @classmethod
+    def cancel(cls, invocation_id: str) -> bool:
+        """Cancel the invocation `invocation_id`, safe to call from any thread."""
+        entry = cls._invocations.pop(invocation_id, None)
+        if entry is None:
+            return False
+        token, task = entry
+        token.cancel()
+        task.get_loop().call_soon_threadsafe(task.cancel)
+        return True
+
+
+async def run_cancellable(invocation_id: str, token: CancelToken, coro: _t.Coroutine) -> bool:
+    """
+    Run `coro` in a task that `StreamCancellation.cancel(invocation_id)` cancels.
+
+    Returns `False` if the invocation was cancelled, its cancellation ends
+    the task quietly. Cancelling the calling task is propagated as usual.
+    """
+    task = asyncio.create_task(coro)
+    StreamCancellation.register(invocation_id, token, task)
+    try:
+        await task
+        return True
+    except asyncio.CancelledError:
+        # Only swallow the cancellation of the invocation, not of this task.
+        if asyncio.current_task().cancelling() or not token.cancelled:
+            raise
+        return False
+    finally:
+        StreamCancellation.unregister(invocation_id, task)
@@ -0,0 +1,115 @@
+import typing as _t
+import zlib
+
+
+def _accepts_gzip(accept_encoding: str | None) -> bool:
+    for coding in (accept_encoding or "").split(","):
+        name, _, params = coding.strip().partition(";")
+        if name.strip().lower() not in ("gzip", "*"):
+            continue
+        quality = params.strip()
+        if quality.startswith("q="):
+            try:
+                return float(quality[2:]) > 0
+            except ValueError:
+                return False
+        return True
+    return False
+
+
+class GzipFrames:
+    """
+    Incremental gzip stream that can be decoded frame by frame.
+
+    Every chunk is compressed and sync-flushed on its own, so the client
+    can decode a frame as soon as it arrives, while the compression window
+    is shared by the whole stream.
+    """
+
+    def __init__(self, level: int):
+        self._compressor = zlib.compressobj(level, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+
+    def compress(self, chunk: bytes) -> bytes:
+        return self._compressor.compress(chunk) + self._compressor.flush(zlib.Z_SYNC_FLUSH)
+
+    def finish(self) -> bytes:
+        return self._compressor.flush(zlib.Z_FINISH)
+
+
+class StreamCompression:
+    """
+    Opt-in gzip compression of event callback streams.
+
+    A stream is compressed when the client accepts gzip and its first frame
+    (or first coalesced batch) is at least `min_size` bytes, the encoding
+    has to be chosen before the body starts, streams whose first frame takes
+    longer than a heartbeat are always compressed. Every frame is flushed on
+    its own, so compression never holds back an update.
+
+    >>> StreamCompression.configure(min_size=2048, level=5)
+    """
+
+    enabled: bool = False
+    min_size: int = 1024
+    level: int = 6
+
+    @classmethod
+    def configure(
+        cls,
+        enabled: bool = True,
+        min_size: int | None = None,
+        level: int | None = None,
+    ):
+        if level is not None and not 1 <= level <= 9:
+            raise ValueError("level must be between 1 and 9")
+        cls.enabled = enabled
+        if min_size is not None:
+            cls.min_size = min_size
+        if level is not None:
+            cls.level = level
+
+    @classmethod
+    def negotiate(cls, accept_encoding: str | None, first_chunk: bytes) -> GzipFrames | None:
+        """
+        Return the compressor for a stream starting with `first_chunk`, if it
+        should be compressed. A stream that starts with a comment (a heartbeat
+        while its first frame is slow) is compressed regardless of its size.
+        """
+        if (
+            cls.enabled
+            and (len(first_chunk) >= cls.min_size or first_chunk.startswith(b":"))
+            and _accepts_gzip(accept_encoding)
+        ):
+            return GzipFrames(cls.level)
+        return None
+
+
+def compress_chunks(
+    chunks: _t.Iterator[bytes], accept_encoding: str | None
+) -> _t.Tuple[_t.Iterator[bytes], bool]:
+    """
+    Wait for the first chunk of `chunks` and compress the stream if it should be.
+
+    Returns the chunks to send and whether they are gzip encoded. Closing the
+    returned iterator closes `chunks`.
+    """
+    first = next(chunks, None)
+    gzip = None if first is None else StreamCompression.negotiate(accept_encoding, first)
+
+    def send():
+        try:
+            if first is None:
+                return
+            if gzip is None:
+                yield first
+                yield from chunks
+                return
+
+            yield gzip.compress(first)
+            for chunk in chunks:
+                yield gzip.compress(chunk)
+            yield gzip.finish()
+        finally:
+            chunks.close()
+
+    return send(), gzip is not None
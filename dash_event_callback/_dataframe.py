@@ -0,0 +1,163 @@
+from ._event_callback import SINGLE_UPDATE_TOKEN
+from ._encoding import FrameEncoder, ServerSentEvent
+import typing as _t
+
+if _t.TYPE_CHECKING:
+    import pandas as pd
+
+
+def _records_json(df: "pd.DataFrame") -> bytes:
+    return df.to_json(
+        orient="records", date_format="iso", double_precision=15
+    ).encode("utf-8")
+
+
+def _grid_frame(component_id: str | _t.Dict[str, _t.Any], props: bytes) -> bytes:
+    return ServerSentEvent(
+        b'["' + SINGLE_UPDATE_TOKEN.encode() + b'",'
+        + FrameEncoder.dumps(component_id) + b"," + props + b"]"
+    ).encode()
+
+
+def stream_dataframe(
+    component_id: str | _t.Dict[str, _t.Any],
+    df: "pd.DataFrame | _t.Iterable[pd.DataFrame]",
+    chunk_rows: int = 1000,
+    column_defs: _t.List[_t.Dict[str, _t.Any]] | None = None,
+    append: bool = False,
+) -> _t.Iterator[bytes]:
+    """
+    Stream a DataFrame into an ag-grid, `chunk_rows` rows per frame.
+
+    The first frame replaces `rowData` and sends the `columnDefs` (derived
+    from the columns unless given), every further frame adds its rows with a
+    `rowTransaction`. With `append=True` all rows are added to the rows the
+    grid already has. Rows are serialized column-wise by pandas, without
+    building a dict per row.
+
+    `df` can also be an iterable of DataFrames, e.g. the partitions of a
+    query result, which are streamed as one table.
+
+    >>> yield from stream_dataframe("grid", df, chunk_rows=500)
+    >>> yield from stream_dataframe("grid", read_partitions(query), append=True)
+    """
+    import pandas as pd
+
+    if chunk_rows < 1:
+        raise ValueError("chunk_rows must be at least 1")
+
+    frames = [df] if isinstance(df, pd.DataFrame) else df
+    first = not append
+
+    for frame in frames:
+        if first and column_defs is None:
+            column_defs = [{"field": str(column)} for column in frame.columns]
+
+        for start in range(0, len(frame), chunk_rows):
+            rows = _records_json(frame.iloc[start : start + chunk_rows])
+
+            if first:
+                props = (
+                    b'{"columnDefs":' + FrameEncoder.dumps(column_defs)
+                    + b',"rowData":' + rows + b"}"
+                )
+                first = False
+            else:
+                props = b'{"rowTransaction":{"add":' + rows + b"}}"
+
+            yield _grid_frame(component_id, props)
+
+    if first:
+        # Nothing to stream, still clear the grid.
+        yield _grid_frame(
+            component_id,
+            b'{"columnDefs":' + FrameEncoder.dumps(column_defs or []) + b',"rowData":[]}',
+        )
+
+
+class GridDiff:
+    """
+    Keep an ag-grid in sync with successive snapshots of a DataFrame.
+
+    The first snapshot replaces `rowData` and sends the `columnDefs`, every
+    further one is compared with the last, keyed by the `row_id` column,
+    and only the added, changed and removed rows are sent with a
+    `rowTransaction`. The comparison is column-wise, without a dict per row.
+    Snapshots without changes send nothing, snapshots that change as many
+    rows as they have (or other columns) replace `rowData`.
+
+    The grid has to identify its rows by the same column, e.g.
+    `getRowId="params.data.id"`. Added rows are appended, rows whose
+    position changed stay where they are.
+
+    >>> grid = GridDiff("grid", row_id="id")
+    >>> while True:
+    ...     yield from grid.update(read_table())
+    ...     yield stream_sleep(5)
+    """
+
+    def __init__(
+        self,
+        component_id: str | _t.Dict[str, _t.Any],
+        row_id: str = "id",
+        column_defs: _t.List[_t.Dict[str, _t.Any]] | None = None,
+    ):
+        self.component_id = component_id
+        self.row_id = row_id
+        self.column_defs = column_defs
+        # The last snapshot, indexed by row id
+        self._snapshot: "pd.DataFrame | None" = None
+
+    def reset(self):
+        """Send the next snapshot as a whole again."""
+        self._snapshot = None
+
+    def update(self, df: "pd.DataFrame") -> _t.Iterator[bytes]:
+        """Yield the frame that turns the grid's rows into `df`, if any."""
+        import pandas as pd
+
+        ids = df[self.row_id]
+        if not ids.is_unique:
+            raise ValueError(f"The row id column {self.row_id!r} has duplicate values")
+
+        previous = self._snapshot
+        # A copy, so changing `df` in place doesn't change the snapshot.
+        snapshot = df.copy()
+        snapshot.index = pd.Index(ids.to_numpy())
+        self._snapshot = snapshot
+
+        if previous is None or not previous.columns.equals(snapshot.columns):
+            column_defs = self.column_defs
+            if column_defs is None:
+                column_defs = [{"field": str(column)} for column in df.columns]
+            yield _grid_frame(
+                self.component_id,
+                b'{"columnDefs":' + FrameEncoder.dumps(column_defs)
+                + b',"rowData":' + _records_json(df) + b"}",
+            )
+            return
+
+        added = ~snapshot.index.isin(previous.index)
+        removed = previous[~previous.index.isin(snapshot.index)]
+        kept = snapshot[~added]
+        old = previous.reindex(kept.index)
+        changed = ((kept != old) & ~(kept.isna() & old.isna())).any(axis=1).to_numpy()
+
+        n_added, n_changed = int(added.sum()), int(changed.sum())
+        if n_added + n_changed + len(removed) == 0:
+            return
+        if n_added + n_changed + len(removed) >= len(snapshot):
+            # The transaction would be as large as the rows themselves.
+            yield _grid_frame(self.component_id, b'{"rowData":' + _records_json(df) + b"}")
+            return
+
+        transaction = []
+        if n_added:
+            transaction.append(b'"add":' + _records_json(snapshot[added]))
+        if n_changed:
+            transaction.append(b'"update":' + _records_json(kept[changed]))
+        if len(removed):
+            transaction.append(b'"remove":' + _records_json(removed[[self.row_id]]))
+        yield _grid_frame(
+            self.component_id, b'{"rowTransaction":{' + b",".join(transaction) + b"}}"
+        )
@@ -0,0 +1,131 @@
+from .helper import recursive_to_plotly_json
+from dataclasses import dataclass
+import typing as _t
+import json
+
+backend_type: _t.TypeAlias = _t.Literal["json", "orjson", "msgspec", "auto"]
+
+
+def _json_dumps(obj) -> bytes:
+    return json.dumps(recursive_to_plotly_json(obj)).encode("utf-8")
+
+
+def _json_backend():
+    return _json_dumps, json.loads
+
+
+def _orjson_backend():
+    import orjson
+
+    option = orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS
+
+    def dumps(obj) -> bytes:
+        return orjson.dumps(obj, default=recursive_to_plotly_json, option=option)
+
+    return dumps, orjson.loads
+
+
+def _msgspec_backend():
+    import msgspec
+
+    def enc_hook(obj):
+        value = recursive_to_plotly_json(obj)
+        if value is obj:
+            # A subclass of a JSON type (e.g. numpy.float64), msgspec only
+            # encodes the exact types and would call the hook again.
+            for tp in (bool, int, float, str, dict, list):
+                if isinstance(obj, tp):
+                    return tp(obj)
+        return value
+
+    encoder = msgspec.json.Encoder(enc_hook=enc_hook, decimal_format="number")
+    return encoder.encode, msgspec.json.decode
+
+
+@dataclass(frozen=True)
+class ServerSentEvent:
+    """
+    One event of an event stream, `data` is sent as it is.
+
+    An event without `data` is not dispatched by browsers, it only sets
+    the last event id or the reconnect delay of the client.
+    """
+
+    data: bytes | None = None
+    event: str | None = None
+    id: str | None = None
+    retry: int | None = None
+
+    def encode(self) -> bytes:
+        if self.event is None and self.id is None and self.retry is None:
+            return b"data: " + (self.data or b"") + b"\n\n"
+
+        fields = []
+        if self.event is not None:
+            fields.append(b"event: " + self.event.encode())
+        if self.id is not None:
+            fields.append(b"id: " + self.id.encode())
+        if self.retry is not None:
+            fields.append(b"retry: " + str(self.retry).encode())
+        if self.data is not None:
+            fields.append(b"data: " + self.data)
+        return b"\n".join(fields) + b"\n\n"
+
+
+# Backend name -> factory of its (dumps, loads) pair
+_BACKENDS: _t.Final = {
+    "json": _json_backend,
+    "orjson": _orjson_backend,
+    "msgspec": _msgspec_backend,
+}
+
+
+class FrameEncoder:
+    """
+    JSON backend used to serialize the payload of SSE frames.
+
+    `json` (default) converts the payload with `recursive_to_plotly_json`
+    and serializes it with the standard library. `orjson` and `msgspec`
+    serialize in a single pass and only fall back to the conversion for
+    values they can't handle natively (Dash components, pandas objects,
+    Decimals, ...), numpy arrays are serialized without `.tolist()` by orjson.
+    `auto` picks the fastest installed backend.
+
+    >>> FrameEncoder.configure("orjson")
+    """
+
+    backend: str = "json"
+    _dumps: _t.Callable[[_t.Any], bytes] = staticmethod(_json_dumps)
+    _loads: _t.Callable[[bytes], _t.Any] = staticmethod(json.loads)
+
+    @classmethod
+    def configure(cls, backend: backend_type = "auto"):
+        if backend == "auto":
+            for candidate in ("orjson", "msgspec", "json"):
+                try:
+                    return cls.configure(candidate)
+                except ImportError:
+                    continue
+
+        if backend not in _BACKENDS:
+            raise ValueError(
+                f"Unknown encoder backend {backend!r}, expected one of {list(_BACKENDS)}"
+            )
+
+        dumps, loads = _BACKENDS[backend]()
+        cls._dumps = staticmethod(dumps)
+        cls._loads = staticmethod(loads)
+        cls.backend = backend
+
+    @classmethod
+    def dumps(cls, obj: _t.Any) -> bytes:
+        return cls._dumps(obj)
+
+    @classmethod
+    def loads(cls, data: bytes) -> _t.Any:
+        return cls._loads(data)
+
+    @classmethod
+    def frame(cls, obj: _t.Any) -> bytes:
+        """Encode `obj` as the data of an SSE frame."""
+        return ServerSentEvent(cls._dumps(obj)).encode()
@@ -1,4 +1,22 @@
-from .helper import recursive_to_plotly_json
+from ._encoding import FrameEncoder
+from ._pacing import Pacing, paced
+from ._runtime import _Sleep, iterate_on_loop, iterate_source, run_on_loop
+from ._limiter import StreamLimiter
+from ._patch import SET_OP, diff_value
+from ._compression import StreamCompression, compress_chunks
+from ._cache import StreamCache
+from ._heartbeat import with_heartbeat
+from ._backpressure import Backpressure, backpressured
+from ._cancellation import CancelToken, StreamCancellation, _current_token, run_cancellable
+from ._process import ProcessSource
+from ._multiplex import (
+    MULTIPLEX_CANCEL_ENDPOINT,
+    MULTIPLEX_ENDPOINT,
+    MULTIPLEX_STREAM_HEADER,
+    MULTIPLEX_TAB_HEADER,
+    StreamMultiplex,
+)
+from ._replay import StreamExpired, StreamReplay, parse_event_id, stream_key
 from .SSE import SSE
 
 # from ._utils import recursive_to_plotly_json
@@ -7,28 +25,39 @@ from dash._callback import clientside_callback
 
 from flask import stream_with_context, make_response, request, abort
 from dash.dependencies import DashDependency
+from contextlib import aclosing
 from dataclasses import dataclass
+from functools import cached_property, partial
 from dash import html, State
 from dash.dcc import Store
 import typing as _t
+import asyncio
 import json
 import inspect
 import hashlib
 import time
+import uuid
 import warnings
 
 SSE_CALLBACK_ENDPOINT: _t.Final[str] = "/dash_update_component_sse"
 STEAM_SEPERATOR: _t.Final[str] = "__concatsep__"
 SSE_CALLBACK_ID_KEY: _t.Final[str] = "sse_callback_id"
-STREAMING_TIMEOUT: _t.Final[int] = 1 * 60  # 1 minute
+SSE_INVOCATION_ID_KEY: _t.Final[str] = "sse_invocation_id"
+SSE_CANCEL_ENDPOINT: _t.Final[str] = SSE_CALLBACK_ENDPOINT + "/cancel"
+STREAMING_TIMEOUT: _t.Final[int] = 1 * 60  # 1 minute, default `timeout` of event callbacks
 ERROR_TOKEN: _t.Final = "[ERROR]"
 SINGLE_UPDATE_TOKEN: _t.Final = "[SINGLE]"
 BATCH_UPDATE_TOKEN: _t.Final = "[BATCH]"
+PATCH_UPDATE_TOKEN: _t.Final = "[PATCH]"
 
-signal_type: _t.TypeAlias = _t.Literal["[ERROR]", "[SINGLE]", "[BATCH]"]
+signal_type: _t.TypeAlias = _t.Literal["[ERROR]", "[SINGLE]", "[BATCH]", "[PATCH]"]
 batch_props_type: _t.TypeAlias = _t.List[
     _t.Tuple[str | _t.Dict[str, _t.Any], _t.Dict[str, _t.Any]]
 ]
+# Props whose updates are applied incrementally and must not be collapsed.
+ACCUMULATING_PROPS: _t.Final = frozenset(
+    {"rowTransaction", "sendNotifications", "extendData", "prependData"}
+)
 
 
 def get_callback_id(callback_id: str):
@@ -44,32 +73,102 @@ class SSECallbackComponent(html.Div):
         sse = lambda idx: {"type": "dash-event-stream", "index": idx}
         store = lambda idx: {"type": "dash-event-stream-store", "index": idx}
 
-    def __init__(self, callback_id: str, concat: bool = True):
+    def __init__(self, callback_id: str, concat: bool = True, **sse_props):
+        # Unset props keep the defaults of the SSE component.
+        sse_props = {name: value for name, value in sse_props.items() if value is not None}
         super().__init__(
             [
-                SSE(id=self.ids.sse(callback_id), concat=concat, update_component=True),
+                SSE(id=self.ids.sse(callback_id), concat=concat, update_component=True, **sse_props),
                 Store(id=self.ids.store(callback_id), data={}, storage_type="memory"),
             ],
         )
 
 
-@dataclass
-class ServerSentEvent:
-    data: str
-    event: str | None = None
-    id: int | None = None
-    retry: int | None = None
-
-    def encode(self) -> bytes:
-        message = f"data: {self.data}"
-        if self.event is not None:
-            message = f"{message}\nevent: {self.event}"
-        if self.id is not None:
-            message = f"{message}\nid: {self.id}"
-        if self.retry is not None:
-            message = f"{message}\nretry: {self.retry}"
-        message = f"{message}\n\n"
-        return message.encode("utf-8")
+class _PropsFrame(bytes):
+    """
+    An encoded `stream_props` frame that can decode its (component_id, props) updates.
+
+    The updates are decoded from the frame itself, not taken from the yielded
+    objects: those may change after the yield, while the frame still waits
+    to be merged.
+    """
+
+    token: _t.ClassVar[str] = BATCH_UPDATE_TOKEN
+
+    @classmethod
+    def encode(cls, updates: batch_props_type):
+        """A frame of `updates`, which must not be changed afterwards."""
+        frame = cls(FrameEncoder.frame([cls.token, None, updates]))
+        frame.__dict__["updates"] = updates
+        return frame
+
+    @cached_property
+    def updates(self) -> batch_props_type:
+        token, component_id, payload = FrameEncoder.loads(self[len(b"data: ") : -2])
+        if token == SINGLE_UPDATE_TOKEN:
+            return [(component_id, payload)]
+        return [(component_id, props) for component_id, props in payload]
+
+
+class _PatchFrame(_PropsFrame):
+    """A [PATCH] frame, its updates map each prop to a list of patch operations."""
+
+    token: _t.ClassVar[str] = PATCH_UPDATE_TOKEN
+
+
+def _is_droppable(frame: bytes) -> bool:
+    """Whether a slow client may miss `frame`: updates that don't accumulate on the client."""
+    # Patches build on each other, they are only collapsed.
+    return type(frame) is _PropsFrame and all(
+        ACCUMULATING_PROPS.isdisjoint(props) for _, props in frame.updates
+    )
+
+
+def _component_key(component_id: str | _t.Dict[str, _t.Any]) -> str:
+    if isinstance(component_id, str):
+        return component_id
+    return json.dumps(component_id, sort_keys=True)
+
+
+class _PropsDiffer:
+    """
+    Turns the `stream_props` frames of one stream into [PATCH] frames.
+
+    Keeps the last value sent per (component, prop) as the client received
+    it, so every frame only carries the operations to get from that value
+    to the new one. Values are taken from the decoded frame, a snapshot of
+    the props at the time they were yielded. Accumulating props are always
+    sent whole.
+    """
+
+    def __init__(self):
+        self._sent: _t.Dict[_t.Tuple[str, str], _t.Any] = {}
+
+    def __call__(self, frame: bytes) -> bytes:
+        if type(frame) is not _PropsFrame:
+            return frame
+
+        patches = []
+        for component_id, props in frame.updates:
+            key = _component_key(component_id)
+            prop_ops = {}
+            for prop, value in props.items():
+                if prop in ACCUMULATING_PROPS:
+                    prop_ops[prop] = [[SET_OP, [], value]]
+                    continue
+
+                if (key, prop) in self._sent:
+                    ops = diff_value(self._sent[(key, prop)], value)
+                else:
+                    ops = [[SET_OP, [], value]]
+                self._sent[(key, prop)] = value
+                if ops:
+                    prop_ops[prop] = ops
+
+            if prop_ops:
+                patches.append((component_id, prop_ops))
+
+        return _PatchFrame.encode(patches) if patches else b""
 
 
 @dataclass
@@ -77,6 +176,18 @@ class _SSEServerObject:
     func: _t.Callable
     on_error: _t.Optional[_t.Callable]
     reset_props: batch_props_type
+    pacing: Pacing = Pacing()
+    max_concurrent: int | None = None
+    diff: bool = False
+    resumable: bool = False
+    single_flight: bool = False
+    cache: StreamCache | None = None
+    timeout: float | None = STREAMING_TIMEOUT
+    idle_timeout: float | None = None
+    prefetch: int | None = None
+    backpressure: Backpressure = Backpressure()
+    blocking: bool = False
+    executor: _t.Literal["thread", "process"] = "thread"
 
     @property
     def func_name(self):
@@ -151,6 +262,8 @@ def generate_reset_callback_function(
     args_str = ", ".join(param_names)
     # Build function parameters list, ensuring valid JS when there are no non-SSE args
     params_list = f"{args_str}, sseUrl" if args_str else "sseUrl"
+    # The store of the SSE component holds the id of the running invocation
+    params_list = f"{params_list}, streamStore"
 
     # Create the condition check
     condition_check = " && ".join(close_conditions)
@@ -165,6 +278,16 @@ def generate_reset_callback_function(
                 return window.dash_clientside.no_update;
             }}
 
+            // Stop the generator on the server right away
+            if (streamStore && streamStore.invocation) {{
+                fetch("{SSE_CANCEL_ENDPOINT}", {{
+                    method: "POST",
+                    headers: {{ "Content-Type": "application/json" }},
+                    body: JSON.stringify({{ invocation: streamStore.invocation }}),
+                    keepalive: true,
+                }});
+            }}
+
             setProps = window.dash_clientside.set_props;
             setProps({sse_id_obj}, {{done: true, url: null}});
             setProps({store_id_obj}, {{data: {{}}}});
@@ -176,12 +299,18 @@ def generate_reset_callback_function(
     return js_code
 
 
-def generate_clientside_callback(input_ids, sse_callback_id, prevent_initial_call):
+def generate_clientside_callback(
+    input_ids, sse_callback_id, prevent_initial_call, multiplex=False
+):
     args_str = ", ".join(input_ids)
     start = "false" if prevent_initial_call else "true"
     sse_id_obj = SSECallbackComponent.ids.sse(sse_callback_id)
     str_sse_id = json.dumps(sse_id_obj)
-    property_assignments = [f"    'sse_callback_id': '{str_sse_id}'"]
+    str_store_id = json.dumps(SSECallbackComponent.ids.store(sse_callback_id))
+    property_assignments = [
+        f"    '{SSE_CALLBACK_ID_KEY}': '{str_sse_id}'",
+        f"    '{SSE_INVOCATION_ID_KEY}': invocation",
+    ]
 
     for input_id in input_ids:
         property_assignments.append(f'    "{input_id}": {input_id}')
@@ -190,6 +319,9 @@ def generate_clientside_callback(input_ids, sse_callback_id, prevent_initial_cal
 
     js_code = f"""
         function({args_str}) {{
+            // Identifies this run, e.g. to cancel it on the server
+            const invocation = Math.random().toString(36).slice(2) + Date.now().toString(36);
+
             // Create payload object with all inputs
             const payload = {{
                 ...{payload_obj},
@@ -201,10 +333,13 @@ def generate_clientside_callback(input_ids, sse_callback_id, prevent_initial_cal
                 payload: JSON.stringify({{ content: payload }}),
                 headers: {{ "Content-Type": "application/json" }},
                 method: "POST",
-
+                multiplex: {json.dumps(MULTIPLEX_ENDPOINT if multiplex else None)},
+                // The SSE component opens a new connection only for a new invocation
+                invocation,
             }};
 
             // Set props for the SSE component
+            window.dash_clientside.set_props({str_store_id}, {{ data: {{ invocation }} }});
             window.dash_clientside.set_props(
                 {str_sse_id},
                 {{
@@ -227,6 +362,12 @@ def generate_deterministic_id(func: _t.Callable, dependencies: _t.Tuple) -> str:
     return hashlib.sha256(unique_string.encode("utf-8")).hexdigest()
 
 
+def generate_flight_key(callback_id: str, content: _t.Dict[str, _t.Any]) -> str:
+    """Identify an invocation by its callback and a canonical hash of its inputs."""
+    inputs = json.dumps(content, sort_keys=True, separators=(",", ":"), default=str)
+    return f"{callback_id}:{hashlib.sha256(inputs.encode('utf-8')).hexdigest()}"
+
+
 @_t.overload
 def stream_props(
     component_id: str | dict[str, _t.Any], props: dict[str, _t.Any], /
@@ -268,11 +409,7 @@ def stream_props(
     """
 
     if batch is not None:
-        response = [
-            BATCH_UPDATE_TOKEN,
-            None,
-            [(cid, recursive_to_plotly_json(p)) for cid, p in batch],
-        ]
+        response = [BATCH_UPDATE_TOKEN, None, list(batch)]
 
     elif props is None:
         if not isinstance(arg1, list):
@@ -280,25 +417,76 @@ def stream_props(
                 "Batch form requires a list of (component_id, props) tuples."
             )
 
-        response = [
-            BATCH_UPDATE_TOKEN,
-            None,
-            [(cid, recursive_to_plotly_json(p)) for cid, p in arg1],
-        ]
+        response = [BATCH_UPDATE_TOKEN, None, list(arg1)]
 
     else:
         if arg1 is None or isinstance(arg1, list):
             raise TypeError("Single form requires component_id and props.")
 
         component_id = arg1
-        response = [
-            SINGLE_UPDATE_TOKEN,
-            component_id,
-            recursive_to_plotly_json(props),
-        ]
+        response = [SINGLE_UPDATE_TOKEN, component_id, props]
 
-    event = ServerSentEvent(json.dumps(response))
-    return event.encode()
+    return _PropsFrame(FrameEncoder.frame(response))
+
+
+def merge_frames(frames: _t.List[bytes]) -> bytes:
+    """
+    Merge consecutive `stream_props` frames into a single [BATCH] frame.
+
+    Repeated updates of the same component prop collapse to the last value.
+    Props that accumulate on the client (e.g. `rowTransaction`) are never
+    collapsed, a repeated update starts a new batch instead. Consecutive
+    [PATCH] frames are merged by chaining their operations. Frames that were
+    not created by `stream_props` are passed through in order.
+    """
+    if len(frames) == 1:
+        return frames[0]
+    return b"".join(collapse_frames(frames))
+
+
+def collapse_frames(frames: _t.List[bytes]) -> _t.List[bytes]:
+    """The frames of `merge_frames` before they are joined, merged updates stay `_PropsFrame`s."""
+    chunks: _t.List[bytes] = []
+    pending: _t.Dict[str, _t.Tuple[_t.Any, _t.Dict[str, _t.Any]]] = {}
+    pending_type: _t.Type[_PropsFrame] = _PropsFrame
+
+    def flush():
+        if pending:
+            chunks.append(pending_type.encode(list(pending.values())))
+            pending.clear()
+
+    for frame in frames:
+        if not isinstance(frame, _PropsFrame):
+            flush()
+            chunks.append(frame)
+            continue
+
+        if type(frame) is not pending_type:
+            flush()
+            pending_type = type(frame)
+
+        for component_id, props in frame.updates:
+            key = _component_key(component_id)
+            if key in pending:
+                merged = pending[key][1]
+                if not ACCUMULATING_PROPS.isdisjoint(merged.keys() & props.keys()):
+                    flush()
+
+            if key not in pending:
+                pending[key] = (component_id, {})
+            merged = pending[key][1]
+
+            if pending_type is _PatchFrame:
+                for prop, ops in props.items():
+                    if ops[0][0] == SET_OP and not ops[0][1]:
+                        merged[prop] = list(ops)
+                    else:
+                        merged.setdefault(prop, []).extend(ops)
+            else:
+                merged.update(props)
+
+    flush()
+    return chunks
 
 
 def event_callback(
@@ -308,20 +496,66 @@ def event_callback(
     reset_props: batch_props_type = [],
     prevent_initial_call=True,
     concat: bool = True,
+    pacing: Pacing = Pacing(),
+    max_concurrent: int | None = None,
+    diff: bool = False,
+    resumable: bool = False,
+    single_flight: bool = False,
+    cache: StreamCache | None = None,
+    multiplex: bool | None = None,
+    timeout: float | None = STREAMING_TIMEOUT,
+    idle_timeout: float | None = None,
+    prefetch: int | None = None,
+    backpressure: Backpressure = Backpressure(),
+    blocking: bool = False,
+    executor: _t.Literal["thread", "process"] = "thread",
+    max_flush_rate: float | None = None,
+    worker_threshold: int | None = None,
 ):
     def decorator(func: _t.Callable) -> _t.Callable:
-        if not inspect.isgeneratorfunction(func):
-            raise ValueError("Event callback must be a generator function")
+        if not (inspect.isgeneratorfunction(func) or inspect.isasyncgenfunction(func)):
+            raise ValueError("Event callback must be a generator or async generator function")
+        if executor not in ("thread", "process"):
+            raise ValueError('executor must be "thread" or "process"')
+        if executor == "process":
+            if not inspect.isgeneratorfunction(func):
+                raise ValueError('executor="process" requires a sync generator function')
+            # Frames come back from the process as plain bytes, without their updates.
+            if diff or pacing.merge or backpressure.policy != "block":
+                raise ValueError(
+                    'executor="process" supports neither diff, merged pacing nor dropping backpressure'
+                )
+        if prefetch is not None and prefetch < 1:
+            raise ValueError("prefetch must be at least 1")
 
         sig = inspect.signature(func)
         param_names = list(sig.parameters.keys())
         callback_id = generate_deterministic_id(func, dependencies)
 
-        sse_obj = _SSEServerObject(func, on_error, reset_props)
+        sse_obj = _SSEServerObject(
+            func,
+            on_error,
+            reset_props,
+            pacing,
+            max_concurrent,
+            diff,
+            resumable,
+            single_flight,
+            cache,
+            timeout,
+            idle_timeout,
+            prefetch,
+            backpressure,
+            blocking,
+            executor,
+        )
         _SSEServerObjects.add_func(sse_obj, callback_id)
 
         clientside_function = generate_clientside_callback(
-            param_names, callback_id, prevent_initial_call
+            param_names,
+            callback_id,
+            prevent_initial_call,
+            StreamMultiplex.enabled if multiplex is None else multiplex,
         )
         clientside_callback(
             clientside_function,
@@ -331,7 +565,12 @@ def event_callback(
 
         @hooks.layout()
         def add_sse_component(layout):
-            component = SSECallbackComponent(callback_id, concat)
+            component = SSECallbackComponent(
+                callback_id,
+                concat,
+                max_flush_rate=max_flush_rate,
+                worker_threshold=worker_threshold,
+            )
             return (
                 [component] + layout
                 if isinstance(layout, list)
@@ -349,6 +588,9 @@ def event_callback(
             )
             if reset_callback_function:
                 reset_dependencies = [dependency for dependency, _ in cancel_w_sse]
+                reset_dependencies.append(
+                    State(SSECallbackComponent.ids.store(callback_id), "data")
+                )
                 clientside_callback(
                     reset_callback_function,
                     *reset_dependencies,
@@ -360,13 +602,11 @@ def event_callback(
     return decorator
 
 
-@hooks.route(SSE_CALLBACK_ENDPOINT, methods=["POST"])
-def sync_sse_callback_endpoint():
+def send_signal(payload: _t.Dict = {}) -> bytes:
+    return FrameEncoder.frame([ERROR_TOKEN, None, payload])
 
-    if "text/event-stream" not in request.accept_mimetypes:
-        abort(400)
 
-    data = request.get_json()
+def parse_sse_request(data: _t.Dict) -> _t.Tuple[str, _t.Dict[str, _t.Any]]:
     content = data["content"].copy()
     ctx = content.pop("callback_context", {})
     callback_id = get_callback_id(content.pop(SSE_CALLBACK_ID_KEY))
@@ -374,56 +614,312 @@ def sync_sse_callback_endpoint():
     if not callback_id:
         raise ValueError("callback_id is required")
 
-    def send_signal(payload: _t.Dict = {}):
-        response = [ERROR_TOKEN, None, payload]
-        event = ServerSentEvent(json.dumps(response))
-        return event.encode()
+    return callback_id, content
+
+
+async def stream_callback(
+    callback_id: str,
+    content: _t.Dict[str, _t.Any],
+    write: _t.Callable[[bytes], _t.Awaitable[None]],
+    last_event_id: str | None = None,
+):
+    """
+    Run the event callback `callback_id` and `write` its frames as they are produced.
+
+    Resumable and single-flight callbacks run detached from the connection
+    and are followed through their replay buffer. A request with
+    `last_event_id` resumes a running stream, a single-flight request joins
+    the running stream with the same inputs instead of starting a new one.
+    Cancelling such a request stops following the stream, the stream itself
+    is cancelled with its last follower.
+    """
+    sse_obj = _SSEServerObjects.get_func(callback_id)
+
+    if not sse_obj:
+        error_message = f"Could not find function for sse id {callback_id}"
+        await write(send_signal({"error": error_message}))
+        return
+
+    content = content.copy()
+    invocation_id = content.pop(SSE_INVOCATION_ID_KEY, None) or uuid.uuid4().hex
+
+    if not (sse_obj.resumable or sse_obj.single_flight):
+        async with backpressured(
+            write, sse_obj.backpressure, collapse_frames, _is_droppable
+        ) as write:
+            await run_callback(sse_obj, callback_id, content, write, invocation_id)
+        return
+
+    try:
+        flight = generate_flight_key(callback_id, content) if sse_obj.single_flight else None
+        stream_id, after = None, 0
+        if last_event_id:
+            stream_id, after = parse_event_id(last_event_id)
+        elif flight:
+            stream_id = await StreamReplay.join(flight, callback_id)
+
+        if stream_id is None:
+            stream_id = StreamReplay.new_stream_id()
+            await StreamReplay.start(
+                stream_key(callback_id, stream_id),
+                stream_id,
+                # The stream may be shared, cancelling a request only detaches it.
+                partial(
+                    run_callback,
+                    sse_obj,
+                    callback_id,
+                    content,
+                    invocation_id=uuid.uuid4().hex,
+                ),
+                flight,
+            )
 
-    @stream_with_context
-    def callback_generator():
-        sse_obj = _SSEServerObjects.get_func(callback_id)
+        key = stream_key(callback_id, stream_id)
+        following = StreamReplay.follow(key, write, after)
+        if not await run_cancellable(invocation_id, CancelToken(), following):
+            StreamReplay.detach(key)
 
-        if not sse_obj:
-            error_message = f"Could not find function for sse id {callback_id}"
-            yield send_signal({"error": error_message})
+    except StreamExpired as e:
+        await write(
+            send_signal(
+                {
+                    "error": str(e),
+                    "handle_error": True,
+                    "reset_props": sse_obj.reset_props
+                }
+            )
+        )
+
+
+async def run_callback(
+    sse_obj: _SSEServerObject,
+    callback_id: str,
+    content: _t.Dict[str, _t.Any],
+    write: _t.Callable[[bytes], _t.Awaitable[None]],
+    invocation_id: str,
+):
+    """
+    Run the generator of `sse_obj` and `write` its paced frames.
+
+    The stream ends quietly when `invocation_id` is cancelled through
+    `StreamCancellation`.
+    """
+    on_error = sse_obj.on_error
+    differ = _PropsDiffer() if sse_obj.diff else None
+    cache = sse_obj.cache
+    cache_key = generate_flight_key(callback_id, content) if cache else None
+    # Frames of the stream for the cache, dropped once they exceed its size.
+    recorded: _t.List[bytes] | None = [] if cache else None
+    recorded_size = 0
+
+    if cache:
+        frames = await cache.get(cache_key)
+        if frames is not None:
+            await replay_frames(frames, sse_obj.pacing if cache.paced else None, write)
             return
 
-        on_error = sse_obj.on_error
+    def timed_out() -> TimeoutError:
+        return TimeoutError(
+            f"Callback {sse_obj.func_name} | {callback_id} exceeded its timeout of {sse_obj.timeout}s"
+        )
 
-        try:
-            start_time = time.time()
-            for item in sse_obj.func(**content):
-                elapsed = time.time() - start_time
-                if elapsed > STREAMING_TIMEOUT:
-                    raise TimeoutError(f"Timeout for callback: {sse_obj.func_name} | {callback_id}")
-
-                if item is None:
-                    warnings.warn(
-                        f"Callback generator functions should not return None values - Callback: {sse_obj.func_name} | {callback_id}"
-                    )
+    async def items(source):
+        if sse_obj.timeout is None and sse_obj.idle_timeout is None:
+            async for item in source:
+                if isinstance(item, _Sleep):
+                    await asyncio.sleep(item.seconds)
+                else:
+                    yield item
+            return
+
+        # Bound every wait for the next item, the generator may be blocked in a step.
+        while True:
+            wait = sse_obj.idle_timeout
+            remaining = token.remaining()
+            if remaining is not None:
+                wait = remaining if wait is None else min(wait, remaining)
+
+            try:
+                async with asyncio.timeout(wait) as limit:
+                    item = await anext(source)
+            except StopAsyncIteration:
+                return
+            except TimeoutError:
+                if not limit.expired():
+                    raise
+                if token.expired:
+                    raise timed_out() from None
+                raise TimeoutError(
+                    f"Callback {sse_obj.func_name} | {callback_id} produced nothing for {sse_obj.idle_timeout}s"
+                ) from None
+
+            if isinstance(item, _Sleep):
+                # A generator waiting in `stream_sleep` is not idle, the wait
+                # only counts toward its timeout.
+                remaining = token.remaining()
+                if remaining is not None and remaining <= item.seconds:
+                    await asyncio.sleep(remaining)
+                    raise timed_out()
+                await asyncio.sleep(item.seconds)
+                continue
+
+            yield item
+
+    async def produce(source):
+        nonlocal recorded, recorded_size
+        async for item in items(source):
+            if item is None:
+                warnings.warn(
+                    f"Callback generator functions should not return None values - Callback: {sse_obj.func_name} | {callback_id}"
+                )
+                continue
+
+            if differ:
+                item = differ(item)
+                if not item:
                     continue
 
-                yield item
-                time.sleep(0.05)
+            if recorded is not None:
+                recorded.append(bytes(item))
+                recorded_size += len(item)
+                if recorded_size > cache.max_bytes:
+                    recorded = None
+
+            yield item
+
+    async def consume():
+        # Sync generators copy this context, the token is visible to them as well.
+        _current_token.set(token)
+        try:
+            async with StreamLimiter.slot(callback_id, sse_obj.max_concurrent):
+                if sse_obj.timeout is not None:
+                    token.deadline = time.monotonic() + sse_obj.timeout
+                if sse_obj.executor == "process":
+                    source = ProcessSource(sse_obj.func, content, token, sse_obj.prefetch or 1)
+                else:
+                    source = iterate_source(sse_obj.func(**content), sse_obj.prefetch, sse_obj.blocking)
+                join = merge_frames if sse_obj.pacing.merge else b"".join
+                try:
+                    async with aclosing(paced(produce(source), sse_obj.pacing, join)) as chunks:
+                        async for chunk in chunks:
+                            await write(chunk)
+                finally:
+                    await source.aclose()
+
+            if recorded is not None:
+                await cache.set(cache_key, recorded)
 
         except Exception as e:
+            if token.cancelled:
+                return
+
             handle_error = True
             if on_error:
                 handle_error = False
-                yield on_error(e)
+                await write(on_error(e))
+
+            await write(
+                send_signal(
+                    {
+                        "error": str(e),
+                        "handle_error": handle_error,
+                        "reset_props": sse_obj.reset_props
+                    }
+                )
+            )
 
-            yield send_signal(
-                {
-                    "error": str(e),
-                    "handle_error": handle_error,
-                    "reset_props": sse_obj.reset_props
-                }
+    token = CancelToken()
+    await run_cancellable(invocation_id, token, consume())
+
+
+async def replay_frames(
+    frames: _t.List[bytes],
+    pacing: Pacing | None,
+    write: _t.Callable[[bytes], _t.Awaitable[None]],
+):
+    """`write` cached frames, with `pacing` or all at once."""
+    if pacing is None:
+        await write(b"".join(frames))
+        return
+
+    async def iterate():
+        for frame in frames:
+            yield frame
+
+    async with aclosing(paced(iterate(), pacing)) as chunks:
+        async for chunk in chunks:
+            await write(chunk)
+
+
+@hooks.route(SSE_CALLBACK_ENDPOINT, methods=["POST"])
+def sync_sse_callback_endpoint():
+    tab = request.headers.get(MULTIPLEX_TAB_HEADER)
+    if tab:
+        # Multiplexed: start in the background, frames go over the tab's stream.
+        callback_id, content = parse_sse_request(request.get_json())
+        stream_id = request.headers.get(MULTIPLEX_STREAM_HEADER) or abort(400)
+        run_on_loop(
+            StreamMultiplex.start(
+                tab, stream_id, partial(stream_callback, callback_id, content)
             )
+        )
+        return "", 202
+
+    if "text/event-stream" not in request.accept_mimetypes:
+        abort(400)
+
+    callback_id, content = parse_sse_request(request.get_json())
+    chunks = iterate_on_loop(
+        with_heartbeat(
+            partial(
+                stream_callback,
+                callback_id,
+                content,
+                last_event_id=request.headers.get("Last-Event-ID"),
+            )
+        )
+    )
 
-    response = make_response(callback_generator())
+    headers = {
+        "Content-Type": "text/event-stream",
+        "Cache-Control": "no-cache",
+        "Transfer-Encoding": "chunked",
+    }
+    if StreamCompression.enabled:
+        chunks, compressed = compress_chunks(
+            chunks, request.headers.get("Accept-Encoding")
+        )
+        headers["Vary"] = "Accept-Encoding"
+        if compressed:
+            headers["Content-Encoding"] = "gzip"
+
+    response = make_response(stream_with_context(chunks))
+    response.headers.update(headers)
+    return response
+
+
+@hooks.route(SSE_CANCEL_ENDPOINT, methods=["POST"])
+def sync_sse_cancel_endpoint():
+    invocation_id = request.get_json().get("invocation") or abort(400)
+    return {"cancelled": StreamCancellation.cancel(invocation_id)}
+
+
+@hooks.route(MULTIPLEX_ENDPOINT, methods=["GET"])
+def sync_multiplex_endpoint():
+    tab = request.args.get("tab") or abort(400)
+    chunks = iterate_on_loop(with_heartbeat(partial(StreamMultiplex.serve, tab)))
+
+    response = make_response(stream_with_context(chunks))
     response.headers.update({
         "Content-Type": "text/event-stream",
         "Cache-Control": "no-cache",
         "Transfer-Encoding": "chunked",
     })
     return response
+
+
+@hooks.route(MULTIPLEX_CANCEL_ENDPOINT, methods=["POST"])
+def sync_multiplex_cancel_endpoint():
+    data = request.get_json()
+    cancelled = run_on_loop(StreamMultiplex.cancel(data["tab"], data["stream"]))
+    return {"cancelled": cancelled}
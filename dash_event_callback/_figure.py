@@ -0,0 +1,126 @@
+from ._event_callback import stream_props
+import typing as _t
+
+if _t.TYPE_CHECKING:
+    import numpy as np
+
+downsample_type: _t.TypeAlias = _t.Literal["lttb", "minmax"]
+
+
+def _as_numbers(values: "np.ndarray") -> "np.ndarray":
+    import numpy as np
+
+    if np.issubdtype(values.dtype, np.datetime64) or np.issubdtype(values.dtype, np.timedelta64):
+        return values.astype("int64").astype("float64")
+    return values.astype("float64")
+
+
+def _lttb(x: "np.ndarray", y: "np.ndarray", n: int) -> "np.ndarray":
+    """Indices of the `n` points that Largest-Triangle-Three-Buckets keeps."""
+    import numpy as np
+
+    size = len(y)
+    edges = np.linspace(1, size - 1, n - 1).astype(int)
+    keep = np.empty(n, dtype=int)
+    keep[0], keep[-1] = 0, size - 1
+
+    previous = 0
+    for bucket in range(n - 2):
+        start, end = edges[bucket], edges[bucket + 1]
+        # The third corner is the average of the next bucket.
+        next_end = edges[bucket + 2] if bucket + 2 < n - 1 else size
+        next_x = x[end:next_end].mean()
+        next_y = y[end:next_end].mean()
+
+        area = np.abs(
+            (x[previous] - next_x) * (y[start:end] - y[previous])
+            - (x[previous] - x[start:end]) * (next_y - y[previous])
+        )
+        previous = keep[bucket + 1] = start + int(np.argmax(np.nan_to_num(area, nan=-1.0)))
+
+    return keep
+
+
+def _minmax(y: "np.ndarray", n: int) -> "np.ndarray":
+    """Indices of the minimum and maximum of `n // 2` buckets, in order."""
+    import numpy as np
+
+    buckets = max(n // 2, 1)
+    bucket = np.arange(len(y)) * buckets // len(y)
+    # Sorted by bucket, then value: the first of a bucket is its min, the last its max.
+    order = np.lexsort((y, bucket))
+    starts = np.searchsorted(bucket[order], np.arange(buckets))
+    ends = np.append(starts[1:], len(y)) - 1
+    return np.unique(np.concatenate([order[starts], order[ends]]))
+
+
+def _downsample(data: _t.Mapping[str, _t.Any], method: downsample_type, n: int) -> _t.Dict[str, _t.Any]:
+    import numpy as np
+
+    if "y" not in data:
+        raise ValueError("Downsampling requires the `y` values of every trace")
+
+    y = np.asarray(data["y"])
+    size = len(y)
+    if size <= n:
+        return dict(data)
+
+    y_values = _as_numbers(y)
+    if method == "lttb":
+        x_values = _as_numbers(np.asarray(data["x"])) if "x" in data else np.arange(size, dtype="float64")
+        keep = _lttb(x_values, y_values, n)
+    else:
+        keep = _minmax(y_values, n)
+
+    # Per point arrays (x, text, marker.color, ...) keep the same points.
+    return {
+        key: np.asarray(values)[keep] if np.ndim(values) and len(values) == size else values
+        for key, values in data.items()
+    }
+
+
+def stream_extend(
+    graph_id: str | _t.Dict[str, _t.Any],
+    traces: _t.Mapping[int, _t.Mapping[str, _t.Any]] | _t.Sequence[_t.Mapping[str, _t.Any]],
+    max_points: int | None = None,
+    downsample: downsample_type | None = None,
+    frame_points: int | None = None,
+) -> bytes:
+    """
+    Append points to the traces of a `dcc.Graph` with its `extendData`.
+
+    Only the new points are sent and the graph redraws incrementally, so a
+    frame's size doesn't depend on the length of the history. `traces` maps
+    trace indices (or positions, for a list) to the new values of their data
+    keys. The graph keeps the last `max_points` points of every trace.
+
+    With `downsample` the new points of every trace are reduced to
+    `frame_points` points (`max_points` by default): `"lttb"` keeps the
+    visual shape of the line, `"minmax"` keeps the extremes of every bucket,
+    e.g. the spikes of a sensor feed. Downsampling requires numpy.
+
+    >>> yield stream_extend("live", {0: {"x": timestamps, "y": values}}, max_points=5000)
+    >>> yield stream_extend("live", [{"y": a}, {"y": b}], max_points=5000, downsample="minmax", frame_points=500)
+    """
+    if isinstance(traces, _t.Mapping):
+        indices = list(traces)
+        updates = list(traces.values())
+    else:
+        indices = list(range(len(traces)))
+        updates = list(traces)
+
+    if downsample is not None:
+        if downsample not in ("lttb", "minmax"):
+            raise ValueError('downsample must be "lttb" or "minmax"')
+        points = frame_points or max_points
+        if points is None or points < 3:
+            raise ValueError("Downsampling requires frame_points or max_points of at least 3")
+        updates = [_downsample(update, downsample, points) for update in updates]
+
+    keys = list(dict.fromkeys(key for update in updates for key in update))
+    if any(update.keys() != set(keys) for update in updates):
+        raise ValueError("All traces have to extend the same data keys")
+
+    extension = {key: [update[key] for update in updates] for key in keys}
+    extend_data = [extension, indices] if max_points is None else [extension, indices, max_points]
+    return stream_props(graph_id, {"extendData": extend_data})
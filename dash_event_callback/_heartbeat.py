@@ -0,0 +1,70 @@
+import typing as _t
+import asyncio
+import time
+
+HEARTBEAT_FRAME: _t.Final = b": ping\n\n"
+
+stream_type: _t.TypeAlias = _t.Callable[
+    [_t.Callable[[bytes], _t.Awaitable[None]]], _t.Awaitable[None]
+]
+
+
+class StreamHeartbeat:
+    """
+    Comment frames (`: ping`) sent while a stream has nothing to send.
+
+    Proxies drop connections that stay quiet for too long, and a server
+    only notices a closed browser tab when it writes to it. A heartbeat is
+    sent after `interval` seconds without a frame, if writing it fails the
+    client is gone and the stream is cancelled. `None` disables heartbeats.
+
+    >>> StreamHeartbeat.configure(interval=10)
+    """
+
+    interval: float | None = 15.0
+
+    @classmethod
+    def configure(cls, interval: float | None = 15.0):
+        if interval is not None and interval <= 0:
+            raise ValueError("interval must be positive")
+        cls.interval = interval
+
+
+def with_heartbeat(stream: stream_type) -> stream_type:
+    """Wrap `stream(write)` so that it writes a heartbeat whenever it goes quiet."""
+
+    async def run(write: _t.Callable[[bytes], _t.Awaitable[None]]):
+        interval = StreamHeartbeat.interval
+        if interval is None:
+            await stream(write)
+            return
+
+        last_write = time.monotonic()
+        writing = 0
+
+        async def tracked_write(chunk: bytes):
+            nonlocal last_write, writing
+            # A write that waits for a slow client is not quiet.
+            writing += 1
+            try:
+                await write(chunk)
+            finally:
+                writing -= 1
+                last_write = time.monotonic()
+
+        task = asyncio.create_task(stream(tracked_write))
+        try:
+            while True:
+                quiet = 0 if writing else time.monotonic() - last_write
+                await asyncio.wait({task}, timeout=max(interval - quiet, 0))
+                if task.done():
+                    return task.result()
+                if not writing and time.monotonic() - last_write >= interval:
+                    # Raises once the client is gone, which cancels the stream below.
+                    await tracked_write(HEARTBEAT_FRAME)
+        finally:
+            if not task.done():
+                task.cancel()
+                await asyncio.gather(task, return_exceptions=True)
+
+    return run
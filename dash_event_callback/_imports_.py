@@ -1,8 +1,45 @@
 from .SSE import SSE
 from ._event_callback import event_callback, stream_props
+from ._pacing import Pacing
+from ._runtime import StreamRuntime, stream_sleep
+from ._asgi import make_asgi_app
+from ._limiter import StreamLimiter
+from ._encoding import FrameEncoder
+from ._dataframe import stream_dataframe, GridDiff
+from ._figure import stream_extend
+from ._compression import StreamCompression
+from ._replay import StreamReplay, ReplayBackend, MemoryReplayBackend
+from ._cache import StreamCache, MemoryStreamCache, DiskStreamCache
+from ._multiplex import StreamMultiplex
+from ._heartbeat import StreamHeartbeat
+from ._cancellation import CancelToken, StreamCancellation, StreamCancelled, cancel_token
+from ._backpressure import Backpressure
 
 __all__ = [
     "SSE",
     "event_callback",
     "stream_props",
+    "Pacing",
+    "StreamRuntime",
+    "stream_sleep",
+    "make_asgi_app",
+    "StreamLimiter",
+    "FrameEncoder",
+    "stream_dataframe",
+    "GridDiff",
+    "stream_extend",
+    "StreamCompression",
+    "StreamReplay",
+    "ReplayBackend",
+    "MemoryReplayBackend",
+    "StreamCache",
+    "MemoryStreamCache",
+    "DiskStreamCache",
+    "StreamMultiplex",
+    "StreamHeartbeat",
+    "CancelToken",
+    "StreamCancellation",
+    "StreamCancelled",
+    "cancel_token",
+    "Backpressure",
 ]
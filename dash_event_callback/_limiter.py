@@ -0,0 +1,134 @@
+from contextlib import asynccontextmanager
+from collections import Counter, deque
+import typing as _t
+import asyncio
+
+
+class StreamLimitExceeded(Exception):
+    """Raised when a stream could not be admitted within `StreamLimiter.max_wait`."""
+
+
+class StreamLimiter:
+    """
+    Admission control for concurrently running event callback streams.
+
+    Streams above the global (`max_streams`) or per callback
+    (`max_streams_per_callback`, or `max_concurrent` of `event_callback`)
+    maximum wait in a FIFO queue. A stream that is not admitted within
+    `max_wait` seconds, or that finds `max_queued` streams already waiting,
+    is rejected with an [ERROR] frame. The limits are unlimited by default,
+    `configure` only changes the limits it is given.
+
+    >>> StreamLimiter.configure(max_streams=16, max_streams_per_callback=4, max_wait=2)
+    >>> StreamLimiter.stats()
+    {'active': 3, 'queued': 0, 'rejected': 0, 'callbacks': {...}}
+    """
+
+    max_streams: int | None = None
+    max_streams_per_callback: int | None = None
+    max_queued: int | None = None
+    max_wait: float = 5.0
+
+    _active: int = 0
+    _active_per_callback: Counter = Counter()
+    _queue: deque = deque()
+    _rejected: int = 0
+
+    @classmethod
+    def configure(
+        cls,
+        max_streams: int | None = None,
+        max_streams_per_callback: int | None = None,
+        max_queued: int | None = None,
+        max_wait: float | None = None,
+    ):
+        if max_streams is not None:
+            cls.max_streams = max_streams
+        if max_streams_per_callback is not None:
+            cls.max_streams_per_callback = max_streams_per_callback
+        if max_queued is not None:
+            cls.max_queued = max_queued
+        if max_wait is not None:
+            cls.max_wait = max_wait
+
+    @classmethod
+    def stats(cls) -> _t.Dict[str, _t.Any]:
+        queued = Counter(callback_id for callback_id, _, _ in cls._queue)
+        return {
+            "active": cls._active,
+            "queued": len(cls._queue),
+            "rejected": cls._rejected,
+            "callbacks": {
+                callback_id: {
+                    "active": cls._active_per_callback[callback_id],
+                    "queued": queued[callback_id],
+                }
+                for callback_id in cls._active_per_callback.keys() | queued.keys()
+            },
+        }
+
+    @classmethod
+    def _has_room(cls, callback_id: str, limit: int | None) -> bool:
+        limit = limit or cls.max_streams_per_callback
+        if cls.max_streams and cls._active >= cls.max_streams:
+            return False
+        return not limit or cls._active_per_callback[callback_id] < limit
+
+    @classmethod
+    def _admit(cls, callback_id: str):
+        cls._active += 1
+        cls._active_per_callback[callback_id] += 1
+
+    @classmethod
+    def _release(cls, callback_id: str):
+        cls._active -= 1
+        cls._active_per_callback[callback_id] -= 1
+        if not cls._active_per_callback[callback_id]:
+            del cls._active_per_callback[callback_id]
+
+        # Wake waiters in FIFO order, skipping those whose callback is still full.
+        for entry in list(cls._queue):
+            waiting_id, limit, admitted = entry
+            if admitted.done() or not cls._has_room(waiting_id, limit):
+                continue
+            cls._queue.remove(entry)
+            cls._admit(waiting_id)
+            admitted.set_result(True)
+
+    @classmethod
+    @asynccontextmanager
+    async def slot(cls, callback_id: str, limit: int | None = None):
+        """Hold one stream slot of `callback_id` for the duration of the block."""
+        if cls._has_room(callback_id, limit):
+            cls._admit(callback_id)
+        else:
+            await cls._wait(callback_id, limit)
+
+        try:
+            yield
+        finally:
+            cls._release(callback_id)
+
+    @classmethod
+    async def _wait(cls, callback_id: str, limit: int | None):
+        if cls.max_queued is not None and len(cls._queue) >= cls.max_queued:
+            cls._rejected += 1
+            raise StreamLimitExceeded("Too many event callbacks are waiting, try again later")
+
+        entry = (callback_id, limit, asyncio.get_running_loop().create_future())
+        cls._queue.append(entry)
+        try:
+            await asyncio.wait_for(asyncio.shield(entry[2]), cls.max_wait)
+        except (asyncio.TimeoutError, asyncio.CancelledError) as e:
+            if entry[2].done():
+                # Admitted in the same iteration the wait ended, give the slot back.
+                cls._release(callback_id)
+            else:
+                entry[2].cancel()
+                cls._queue.remove(entry)
+            if isinstance(e, asyncio.CancelledError):
+                raise
+            cls._rejected += 1
+            raise StreamLimitExceeded(
+                f"Event callback was not admitted within {cls.max_wait}s, the server is busy"
+            ) from None
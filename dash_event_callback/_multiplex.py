@@ -0,0 +1,151 @@
+from ._replay import DONE_FRAME
+import typing as _t
+import asyncio
+
+MULTIPLEX_ENDPOINT: _t.Final[str] = "/dash_event_callback_multiplex"
+MULTIPLEX_CANCEL_ENDPOINT: _t.Final[str] = MULTIPLEX_ENDPOINT + "/cancel"
+MULTIPLEX_TAB_HEADER: _t.Final[str] = "X-Dash-Multiplex-Tab"
+MULTIPLEX_STREAM_HEADER: _t.Final[str] = "X-Dash-Multiplex-Stream"
+
+
+class _Channel:
+    def __init__(self, max_frames: int):
+        # Streams wait for room, like for a slow client of their own connection.
+        self.frames: asyncio.Queue = asyncio.Queue(max_frames)
+        self.streams: _t.Dict[str, asyncio.Task] = {}
+        # The task sending the frames to the tab's current connection.
+        self.reader: asyncio.Task | None = None
+
+
+def tag_events(chunk: bytes, stream_id: str) -> bytes:
+    """Set the event type of every event in `chunk` to `stream_id`."""
+    tag = b"event: " + stream_id.encode() + b"\n"
+    return tag + chunk[:-2].replace(b"\n\n", b"\n\n" + tag) + chunk[-2:]
+
+
+class StreamMultiplex:
+    """
+    One connection per browser tab for all of its event callback streams.
+
+    The tab opens a single long-lived stream at `MULTIPLEX_ENDPOINT`, event
+    callbacks are started with ordinary POST requests that return at once,
+    and their frames are sent over the tab's stream tagged with the id of
+    the invocation. This keeps many concurrent streams below the browser's
+    connection limit per host. At most `max_frames` frames of a tab wait to
+    be sent, further writes wait until there is room, so a slow or
+    disconnected tab holds its generators back. A tab that stays
+    disconnected for `attach_timeout` seconds has its streams cancelled.
+    A tab has one connection at a time: when it connects again, e.g. after
+    a network error, the new connection replaces the earlier one.
+
+    Call `configure` before the event callbacks are defined, or opt in per
+    callback with `event_callback(multiplex=True)`.
+
+    >>> StreamMultiplex.configure(enabled=True)
+    """
+
+    enabled: bool = False
+    attach_timeout: float = 10.0
+    max_frames: int = 64
+
+    _channels: _t.Dict[str, _Channel] = {}
+
+    @classmethod
+    def configure(
+        cls,
+        enabled: bool = True,
+        attach_timeout: float | None = None,
+        max_frames: int | None = None,
+    ):
+        if max_frames is not None and max_frames < 1:
+            raise ValueError("max_frames must be at least 1")
+        cls.enabled = enabled
+        if attach_timeout is not None:
+            cls.attach_timeout = attach_timeout
+        if max_frames is not None:
+            cls.max_frames = max_frames
+
+    @classmethod
+    def _channel(cls, tab: str) -> _Channel:
+        channel = cls._channels.get(tab)
+        if channel is None:
+            channel = cls._channels[tab] = _Channel(cls.max_frames)
+            cls._expire_later(tab, channel)
+        return channel
+
+    @classmethod
+    def _expire_later(cls, tab: str, channel: _Channel):
+        def expire():
+            if channel.reader is not None or cls._channels.get(tab) is not channel:
+                return
+            del cls._channels[tab]
+            for task in channel.streams.values():
+                task.cancel()
+
+        asyncio.get_running_loop().call_later(cls.attach_timeout, expire)
+
+    @classmethod
+    async def start(
+        cls,
+        tab: str,
+        stream_id: str,
+        stream: _t.Callable[[_t.Callable[[bytes], _t.Awaitable[None]]], _t.Awaitable[None]],
+    ):
+        """Run `stream(write)` in the background and send its frames to `tab`."""
+        channel = cls._channel(tab)
+        previous = channel.streams.get(stream_id)
+        if previous is not None:
+            previous.cancel()
+
+        async def write(chunk: bytes):
+            await channel.frames.put(tag_events(chunk, stream_id))
+
+        async def run():
+            try:
+                await stream(write)
+            finally:
+                # Nobody reads the frames of an expired tab anymore.
+                if cls._channels.get(tab) is channel:
+                    await write(DONE_FRAME)
+
+        task = asyncio.create_task(run())
+        channel.streams[stream_id] = task
+
+        def remove(_):
+            if channel.streams.get(stream_id) is task:
+                del channel.streams[stream_id]
+
+        task.add_done_callback(remove)
+
+    @classmethod
+    async def cancel(cls, tab: str, stream_id: str) -> bool:
+        channel = cls._channels.get(tab)
+        task = channel and channel.streams.get(stream_id)
+        if not task:
+            return False
+        task.cancel()
+        return True
+
+    @classmethod
+    async def serve(cls, tab: str, write: _t.Callable[[bytes], _t.Awaitable[None]]):
+        """`write` the frames of all streams of `tab` until the connection closes."""
+        channel = cls._channel(tab)
+        task = asyncio.current_task()
+        previous, channel.reader = channel.reader, task
+        if previous is not None:
+            previous.cancel()
+        try:
+            await write(b": connected\n\n")
+            while True:
+                chunks = [await channel.frames.get()]
+                while not channel.frames.empty():
+                    chunks.append(channel.frames.get_nowait())
+                await write(b"".join(chunks))
+        except asyncio.CancelledError:
+            # Replaced by a newer connection of the tab, this one ends quietly.
+            if channel.reader is task or task.uncancel():
+                raise
+        finally:
+            if channel.reader is task:
+                channel.reader = None
+                cls._expire_later(tab, channel)
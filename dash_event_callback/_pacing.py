@@ -0,0 +1,143 @@
+from contextlib import aclosing
+from dataclasses import dataclass
+import typing as _t
+import asyncio
+import time
+
+
+@dataclass(frozen=True)
+class Pacing:
+    """
+    Flush policy for the frames of an event callback.
+
+    The default writes every frame as soon as the generator yields it.
+
+    Forms:
+    >>> Pacing.none()
+    >>> Pacing.fixed(0.05)         # at least 50ms between two writes
+    >>> Pacing.max_rate(30)        # at most 30 writes per second
+    >>> Pacing.max_rate(30, burst=10)
+    >>> Pacing.coalesce(25)        # write all frames produced within 25ms at once
+    >>> Pacing.coalesce(25, merge=True)  # ... merged into a single [BATCH] frame
+    """
+
+    interval: float = 0.0
+    burst: int = 1
+    window: float = 0.0
+    merge: bool = False
+
+    def __post_init__(self):
+        if self.interval < 0 or self.window < 0:
+            raise ValueError("Pacing interval and window must not be negative")
+        if self.burst < 1:
+            raise ValueError("Pacing burst must be at least 1")
+
+    @classmethod
+    def none(cls) -> "Pacing":
+        return cls()
+
+    @classmethod
+    def fixed(cls, seconds: float) -> "Pacing":
+        return cls(interval=seconds)
+
+    @classmethod
+    def max_rate(cls, per_second: float, burst: int = 1) -> "Pacing":
+        if per_second <= 0:
+            raise ValueError("max_rate requires a positive rate")
+        return cls(interval=1 / per_second, burst=burst)
+
+    @classmethod
+    def coalesce(cls, ms: float, merge: bool = False) -> "Pacing":
+        return cls(window=ms / 1000, merge=merge)
+
+
+class _Pacer:
+    """Per-stream pacing state (generic cell rate algorithm)."""
+
+    def __init__(self, pacing: Pacing):
+        self.interval = pacing.interval
+        self.tolerance = (pacing.burst - 1) * pacing.interval
+        self._tat = 0.0
+
+    def delay(self, now: float) -> float:
+        if not self.interval:
+            return 0.0
+        return max(0.0, self._tat - self.tolerance - now)
+
+    def sent(self, now: float):
+        if self.interval:
+            self._tat = max(self._tat, now) + self.interval
+
+
+_DONE = object()
+
+
+async def paced(
+    frames: _t.AsyncIterator[bytes],
+    pacing: Pacing,
+    join: _t.Callable[[_t.List[bytes]], bytes] = b"".join,
+) -> _t.AsyncIterator[bytes]:
+    """Yield `frames` (or `join`ed groups of them) no faster than `pacing` allows."""
+    pacer = _Pacer(pacing)
+    chunks = _coalesced(frames, pacing.window, join) if pacing.window else frames
+
+    async with aclosing(chunks):
+        async for chunk in chunks:
+            delay = pacer.delay(time.monotonic())
+            if delay:
+                await asyncio.sleep(delay)
+            yield chunk
+            pacer.sent(time.monotonic())
+
+
+async def _coalesced(
+    frames: _t.AsyncIterator[bytes],
+    window: float,
+    join: _t.Callable[[_t.List[bytes]], bytes],
+) -> _t.AsyncIterator[bytes]:
+    """
+    Join all frames produced within `window` seconds of the first one.
+
+    Frames are pulled by a separate task, so a frame is never held back
+    longer than `window` while the generator is blocked.
+    """
+    handoff: asyncio.Queue = asyncio.Queue()
+
+    async def produce():
+        try:
+            async for frame in frames:
+                await handoff.put(frame)
+        except Exception as e:
+            await handoff.put(e)
+        await handoff.put(_DONE)
+
+    producer = asyncio.create_task(produce())
+
+    async def take(timeout=None):
+        item = await asyncio.wait_for(handoff.get(), timeout)
+        if isinstance(item, Exception):
+            raise item
+        return item
+
+    try:
+        while True:
+            item = await take()
+            if item is _DONE:
+                return
+
+            group = [item]
+            deadline = time.monotonic() + window
+            while (remaining := deadline - time.monotonic()) > 0:
+                try:
+                    item = await take(remaining)
+                except asyncio.TimeoutError:
+                    break
+                if item is _DONE:
+                    yield join(group)
+                    return
+                group.append(item)
+
+            yield join(group)
+    finally:
+        producer.cancel()
+        await asyncio.gather(producer, return_exceptions=True)
@@ -0,0 +1,63 @@
+import typing as _t
+
+SET_OP: _t.Final = "set"
+APPEND_OP: _t.Final = "append"
+DELETE_OP: _t.Final = "del"
+
+patch_op_type: _t.TypeAlias = _t.List[_t.Any]
+
+
+def diff_value(old: _t.Any, new: _t.Any) -> _t.List[patch_op_type]:
+    """
+    Patch operations that turn the JSON value `old` into `new`.
+
+    Operations are `["set", path, value]`, `["append", path, values]` (extend
+    the list at `path`) and `["del", path]`, where `path` is a list of dict
+    keys and list indices. An empty list means both values are equal.
+
+    >>> diff_value({"x": [1, 2]}, {"x": [1, 2, 3], "y": 0})
+    [['append', ['x'], [3]], ['set', ['y'], 0]]
+    """
+    ops: _t.List[patch_op_type] = []
+    _diff(old, new, [], ops)
+    return ops
+
+
+def _diff(old, new, path: _t.List, ops: _t.List[patch_op_type]):
+    if type(old) is dict and type(new) is dict:
+        if old == new:
+            return
+        for key, value in new.items():
+            if key in old:
+                _diff(old[key], value, path + [key], ops)
+            else:
+                ops.append([SET_OP, path + [key], value])
+        for key in old.keys() - new.keys():
+            ops.append([DELETE_OP, path + [key]])
+        return
+
+    if type(old) is list and type(new) is list:
+        size = len(old)
+        if len(new) >= size and new[:size] == old:
+            if len(new) > size:
+                ops.append([APPEND_OP, path, new[size:]])
+            return
+
+        if len(new) == size:
+            start = len(ops)
+            for index, (old_item, new_item) in enumerate(zip(old, new)):
+                _diff(old_item, new_item, path + [index], ops)
+            # When most items were replaced, sending the whole list is smaller.
+            item_ops = ops[start:]
+            if len(item_ops) > size // 2 and all(
+                op[0] == SET_OP and len(op[1]) == len(path) + 1 for op in item_ops
+            ):
+                del ops[start:]
+                ops.append([SET_OP, path, new])
+            return
+
+        ops.append([SET_OP, path, new])
+        return
+
+    if type(old) is not type(new) or old != new:
+        ops.append([SET_OP, path, new])
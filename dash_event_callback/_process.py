@@ -0,0 +1,155 @@
+from ._cancellation import CancelToken, _current_token
+from ._runtime import StreamRuntime, _Sleep
+from concurrent.futures import Future, ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+import typing as _t
+import asyncio
+import pickle
+import queue
+
+# Messages from the worker process: (kind, value)
+_ITEM: _t.Final = "item"
+_SLEEP: _t.Final = "sleep"
+_DONE: _t.Final = "done"
+_FAILED: _t.Final = "failed"
+
+
+def _portable(error: BaseException) -> BaseException:
+    """`error`, or a `RuntimeError` with its message if it can't be sent to the stream."""
+    try:
+        pickle.loads(pickle.dumps(error))
+        return error
+    except Exception:
+        return RuntimeError(f"{type(error).__name__}: {error}")
+
+
+def _send(items, message, stop) -> bool:
+    """Put `message` into `items`, `False` if the stream stopped while the queue was full."""
+    while True:
+        try:
+            items.put(message, timeout=0.5)
+            return True
+        except queue.Full:
+            if stop.is_set():
+                return False
+
+
+def _run_generator(
+    func: _t.Callable,
+    kwargs: _t.Dict[str, _t.Any],
+    items,
+    stop,
+    deadline: float | None,
+):
+    """Run the generator of `func` in a worker process and send its items as plain bytes."""
+    # The stream stops the generator through the shared event.
+    token = CancelToken(deadline, stop)
+    reset = _current_token.set(token)
+    generator = func(**kwargs)
+    try:
+        for item in generator:
+            if isinstance(item, _Sleep):
+                # The stream waits as well, so the wait is not idle time of the stream.
+                if not _send(items, (_SLEEP, item.seconds), stop):
+                    return
+                token.sleep(item.seconds)
+            elif not _send(items, (_ITEM, item if item is None else bytes(item)), stop):
+                return
+            if stop.is_set():
+                return
+        _send(items, (_DONE, None), stop)
+    except Exception as e:
+        _send(items, (_FAILED, _portable(e)), stop)
+    finally:
+        generator.close()
+        _current_token.reset(reset)
+
+
+class ProcessSource:
+    """
+    Async iterator over a sync generator function that runs in the process pool.
+
+    The generator runs in a worker process up to `depth` items ahead of the
+    consumer, its items arrive as encoded bytes. Closing the source, or
+    cancelling the invocation, stops the generator after its current step.
+    Every call to the manager or the pool may block (the manager process is
+    started on first use), they are made from the runtime thread pool.
+    """
+
+    def __init__(
+        self,
+        func: _t.Callable,
+        kwargs: _t.Dict[str, _t.Any],
+        token: CancelToken,
+        depth: int,
+    ):
+        self._func = func
+        self._kwargs = kwargs
+        self._deadline = token.deadline
+        self._depth = depth
+        self._items = None
+        self._stop = None
+        self._executor: ProcessPoolExecutor | None = None
+        self._started: Future | None = None
+        self._worker: asyncio.Future | None = None
+
+    def __aiter__(self):
+        return self
+
+    def _start(self) -> Future:
+        manager = StreamRuntime.manager()
+        self._items = manager.Queue(self._depth)
+        self._stop = manager.Event()
+        self._executor = StreamRuntime.process_executor()
+        return self._executor.submit(
+            _run_generator, self._func, self._kwargs, self._items, self._stop, self._deadline
+        )
+
+    async def __anext__(self):
+        loop = asyncio.get_running_loop()
+        if self._worker is None:
+            if self._started is None:
+                self._started = StreamRuntime.executor().submit(self._start)
+            self._worker = asyncio.wrap_future(await asyncio.wrap_future(self._started))
+            # A crash after the stream ended is not an error of the stream.
+            self._worker.add_done_callback(lambda f: f.cancelled() or f.exception())
+
+        get = loop.run_in_executor(StreamRuntime.executor(), self._items.get)
+        await asyncio.wait({get, self._worker}, return_when=asyncio.FIRST_COMPLETED)
+
+        if not get.done() and self._worker.exception() is not None:
+            # The worker process died, unblock `get`.
+            await loop.run_in_executor(StreamRuntime.executor(), self._unblock)
+            if isinstance(self._worker.exception(), BrokenProcessPool):
+                StreamRuntime.discard_process_executor(self._executor)
+            raise self._worker.exception()
+
+        kind, value = await get
+        if kind == _FAILED:
+            raise value
+        if kind == _DONE:
+            raise StopAsyncIteration
+        if kind == _SLEEP:
+            return _Sleep(value)
+        return value
+
+    def _unblock(self):
+        try:
+            self._items.put_nowait((_DONE, None))
+        except queue.Full:
+            pass
+
+    def _close(self):
+        self._stop.set()
+        # A cancelled `__anext__` may still wait for an item in a thread.
+        self._unblock()
+
+    async def aclose(self):
+        # Nothing to stop if the generator was never submitted.
+        if self._started is None or self._started.cancel():
+            return
+        try:
+            await asyncio.wrap_future(self._started)
+        except Exception:
+            return
+        await asyncio.get_running_loop().run_in_executor(StreamRuntime.executor(), self._close)
@@ -0,0 +1,308 @@
+from ._encoding import ServerSentEvent
+from abc import ABC, abstractmethod
+from collections import Counter, deque
+from dataclasses import dataclass, field
+import typing as _t
+import asyncio
+import time
+import uuid
+
+DONE_FRAME: _t.Final = ServerSentEvent(b"[DONE]").encode()
+
+frames_type: _t.TypeAlias = _t.List[_t.Tuple[int, bytes]]
+
+
+class StreamExpired(Exception):
+    """Raised when a stream can't be resumed, its frames are no longer buffered."""
+
+
+class ReplayBackend(ABC):
+    """
+    Storage of the numbered frames of resumable streams.
+
+    Implement this to share replay buffers between workers, e.g. with a
+    Redis stream per key, so a client can resume on any worker. `wait`
+    polls by default, override it when the store can notify readers.
+    """
+
+    poll_interval: float = 0.5
+
+    @abstractmethod
+    async def open(self, key: str) -> None:
+        """Create the empty buffer of the new stream `key`."""
+
+    @abstractmethod
+    async def append(self, key: str, seq: int, frame: bytes) -> None:
+        """Store `frame` as number `seq` of the stream `key`."""
+
+    @abstractmethod
+    async def finish(self, key: str) -> None:
+        """Mark the stream `key` as complete, no frames follow."""
+
+    @abstractmethod
+    async def read(self, key: str, after: int) -> _t.Tuple[frames_type, bool] | None:
+        """
+        Buffered frames of `key` numbered above `after`, and whether the stream
+        is complete. `None` if the stream is unknown or expired.
+        """
+
+    @abstractmethod
+    async def last_read(self, key: str) -> float | None:
+        """`time.time()` of the last `read` of `key`, from any worker."""
+
+    async def wait(self, key: str, after: int, timeout: float) -> None:
+        """Return once frames after `after` may be available, or after `timeout` seconds."""
+        await asyncio.sleep(min(timeout, self.poll_interval))
+
+
+@dataclass
+class _Buffer:
+    frames: deque
+    finished: bool = False
+    expires: float | None = None
+    last_read: float = field(default_factory=time.time)
+    waiters: _t.List[asyncio.Future] = field(default_factory=list)
+
+    def wake(self):
+        for waiter in self.waiters:
+            waiter.get_loop().call_soon_threadsafe(_resolve, waiter)
+        self.waiters.clear()
+
+
+def _resolve(waiter: asyncio.Future):
+    if not waiter.done():
+        waiter.set_result(None)
+
+
+class MemoryReplayBackend(ReplayBackend):
+    """
+    Replay buffers in the memory of this process.
+
+    Keeps the last `max_frames` frames of every stream, a completed stream is
+    dropped `ttl` seconds after its last frame. Resuming only works on the
+    worker that runs the stream.
+    """
+
+    def __init__(self, max_frames: int = 1000, ttl: float = 300.0):
+        self.max_frames = max_frames
+        self.ttl = ttl
+        self._buffers: _t.Dict[str, _Buffer] = {}
+
+    def _purge(self):
+        now = time.monotonic()
+        for key in [k for k, b in self._buffers.items() if b.expires and b.expires < now]:
+            del self._buffers[key]
+
+    async def open(self, key: str) -> None:
+        self._purge()
+        self._buffers[key] = _Buffer(deque(maxlen=self.max_frames))
+
+    async def append(self, key: str, seq: int, frame: bytes) -> None:
+        buffer = self._buffers[key]
+        buffer.frames.append((seq, frame))
+        buffer.wake()
+
+    async def finish(self, key: str) -> None:
+        buffer = self._buffers[key]
+        buffer.finished = True
+        buffer.expires = time.monotonic() + self.ttl
+        buffer.wake()
+
+    async def read(self, key: str, after: int) -> _t.Tuple[frames_type, bool] | None:
+        buffer = self._buffers.get(key)
+        if buffer is None or (buffer.expires and buffer.expires < time.monotonic()):
+            return None
+        buffer.last_read = time.time()
+        frames = [(seq, frame) for seq, frame in buffer.frames if seq > after]
+        return frames, buffer.finished
+
+    async def last_read(self, key: str) -> float | None:
+        buffer = self._buffers.get(key)
+        return buffer.last_read if buffer else None
+
+    async def wait(self, key: str, after: int, timeout: float) -> None:
+        buffer = self._buffers.get(key)
+        if buffer is None or buffer.finished or (buffer.frames and buffer.frames[-1][0] > after):
+            return
+        waiter = asyncio.get_running_loop().create_future()
+        buffer.waiters.append(waiter)
+        try:
+            await asyncio.wait_for(waiter, timeout)
+        except asyncio.TimeoutError:
+            pass
+
+
+class StreamReplay:
+    """
+    Replay buffers of resumable event callbacks (`event_callback(resumable=True)`).
+
+    Every frame of a resumable stream is numbered and kept in the replay
+    buffer of its invocation. The generator runs independent of the
+    connection: when the connection drops, the client reconnects with the
+    `Last-Event-ID` of the last frame it got and the stream continues from
+    the buffer, without running the generator again. A stream without any
+    reader for `resume_timeout` seconds is cancelled. `retry` is the
+    reconnect delay sent to the client in milliseconds.
+
+    Single-flight callbacks (`event_callback(single_flight=True)`) record
+    the same way, requests with the same inputs join the running stream
+    and follow its buffer from the first frame. Cancelling a request only
+    detaches it, the stream is cancelled once none of its requests follows
+    it anymore.
+
+    >>> StreamReplay.configure(backend=MemoryReplayBackend(max_frames=5000), resume_timeout=60)
+    """
+
+    backend: ReplayBackend = MemoryReplayBackend()
+    resume_timeout: float = 30.0
+    retry: int = 1000
+
+    _readers: Counter = Counter()
+    _tasks: _t.Set[asyncio.Task] = set()
+    _producers: _t.Dict[str, asyncio.Task] = {}
+    _flights: _t.Dict[str, str] = {}
+
+    @classmethod
+    def configure(
+        cls,
+        backend: ReplayBackend | None = None,
+        resume_timeout: float | None = None,
+        retry: int | None = None,
+    ):
+        if backend is not None:
+            cls.backend = backend
+        if resume_timeout is not None:
+            cls.resume_timeout = resume_timeout
+        if retry is not None:
+            cls.retry = retry
+
+    @classmethod
+    def new_stream_id(cls) -> str:
+        return uuid.uuid4().hex
+
+    @classmethod
+    async def start(
+        cls,
+        key: str,
+        stream_id: str,
+        stream: _t.Callable[[_t.Callable[[bytes], _t.Awaitable[None]]], _t.Awaitable[None]],
+        flight: str | None = None,
+    ):
+        """
+        Record `stream` into the buffer of `key` in the background. Until it
+        completes, `join(flight)` returns its `stream_id`.
+        """
+        await cls.backend.open(key)
+        producer = asyncio.create_task(cls.record(key, stream_id, stream))
+        watcher = asyncio.create_task(cls.watch(key, producer))
+        for task in (producer, watcher):
+            cls._tasks.add(task)
+            task.add_done_callback(cls._tasks.discard)
+        cls._producers[key] = producer
+        producer.add_done_callback(lambda _: cls._producers.pop(key, None))
+
+        if flight is not None:
+            cls._flights[flight] = stream_id
+
+            def land(_):
+                if cls._flights.get(flight) == stream_id:
+                    del cls._flights[flight]
+
+            producer.add_done_callback(land)
+
+    @classmethod
+    def detach(cls, key: str):
+        """Cancel the stream `key` if nobody follows it anymore, e.g. after its last request was cancelled."""
+        producer = cls._producers.get(key)
+        if producer is not None and not cls._readers[key]:
+            producer.cancel()
+
+    @classmethod
+    async def join(cls, flight: str, callback_id: str) -> str | None:
+        """The `stream_id` of the running stream of `flight`, if it can be replayed from its first frame."""
+        stream_id = cls._flights.get(flight)
+        if stream_id is None:
+            return None
+        result = await cls.backend.read(stream_key(callback_id, stream_id), 0)
+        if result is None or (result[0] and result[0][0][0] != 1):
+            return None
+        return stream_id
+
+    @classmethod
+    async def record(
+        cls,
+        key: str,
+        stream_id: str,
+        stream: _t.Callable[[_t.Callable[[bytes], _t.Awaitable[None]]], _t.Awaitable[None]],
+    ):
+        """
+        Run `stream(write)` and append everything it writes to the buffer of
+        `key`. A cancelled stream ends without the [DONE] frame.
+        """
+        seq = 0
+
+        async def write(chunk: bytes):
+            nonlocal seq
+            seq += 1
+            # The id follows the chunk as an event of its own, it marks all of it as received.
+            event_id = ServerSentEvent(id=f"{stream_id}.{seq}").encode()
+            await cls.backend.append(key, seq, chunk + event_id)
+
+        try:
+            await stream(write)
+            await write(DONE_FRAME)
+        finally:
+            await cls.backend.finish(key)
+
+    @classmethod
+    async def watch(cls, key: str, producer: asyncio.Task):
+        """Cancel `producer` once nobody has read `key` for `resume_timeout` seconds."""
+        while not producer.done():
+            await asyncio.wait({producer}, timeout=max(cls.resume_timeout / 2, 0.1))
+            if producer.done() or cls._readers[key]:
+                continue
+            last_read = await cls.backend.last_read(key)
+            if last_read is None or time.time() - last_read > cls.resume_timeout:
+                producer.cancel()
+
+    @classmethod
+    async def follow(
+        cls, key: str, write: _t.Callable[[bytes], _t.Awaitable[None]], after: int = 0
+    ):
+        """`write` the frames of `key` numbered above `after` until the stream completes."""
+        cls._readers[key] += 1
+        # The reconnect delay goes with the first frame, so it counts for compression.
+        retry = ServerSentEvent(retry=cls.retry).encode()
+        try:
+            while True:
+                result = await cls.backend.read(key, after)
+                if result is None:
+                    raise StreamExpired("The stream expired, start it again")
+                frames, finished = result
+                if frames and frames[0][0] > after + 1:
+                    raise StreamExpired("Frames of the stream were dropped, start it again")
+
+                for seq, frame in frames:
+                    await write(retry + frame)
+                    retry, after = b"", seq
+                if finished:
+                    return
+                if not frames:
+                    await cls.backend.wait(key, after, cls.resume_timeout)
+        finally:
+            cls._readers[key] -= 1
+            if not cls._readers[key]:
+                del cls._readers[key]
+
+
+def stream_key(callback_id: str, stream_id: str) -> str:
+    return f"{callback_id}:{stream_id}"
+
+
+def parse_event_id(last_event_id: str) -> _t.Tuple[str, int]:
+    """Split a `Last-Event-ID` into the stream id and the frame number."""
+    stream_id, _, seq = last_event_id.rpartition(".")
+    try:
+        return stream_id, int(seq)
+    except ValueError:
+        raise StreamExpired(f"Invalid Last-Event-ID {last_event_id!r}") from None
@@ -0,0 +1,401 @@
+from concurrent.futures import Future, ProcessPoolExecutor, ThreadPoolExecutor
+from multiprocessing.managers import SyncManager
+from dataclasses import dataclass
+import typing as _t
+import asyncio
+import contextvars
+import inspect
+import multiprocessing
+import os
+import queue
+import threading
+
+_DONE = object()
+
+
+@dataclass(frozen=True)
+class _Sleep:
+    seconds: float
+
+
+def stream_sleep(seconds: float) -> _Sleep:
+    """
+    Yield `stream_sleep(seconds)` from an event callback to wait before its
+    next step. With stepped sync generators the wait holds no thread.
+
+    >>> while not job.done:
+    ...     yield stream_props("progress", {"value": job.progress})
+    ...     yield stream_sleep(1)
+    """
+    return _Sleep(seconds)
+
+
+def _process_context() -> multiprocessing.context.BaseContext:
+    methods = multiprocessing.get_all_start_methods()
+    return multiprocessing.get_context("forkserver" if "forkserver" in methods else "spawn")
+
+
+class StreamRuntime:
+    """
+    Shared execution resources of all event callback streams in a process.
+
+    Every stream runs as a task on one background event loop. Async generator
+    callbacks run on that loop directly, sync generator callbacks are driven by
+    a bounded thread pool (`max_sync_workers` concurrent sync streams).
+
+    With `step_workers` sync generators are stepped instead: every `next()`
+    is a separate task of a small pool, so a stream only holds a thread
+    while it computes its next item. Event callbacks with `blocking=True`
+    still get a worker of the `max_sync_workers` pool for their lifetime.
+
+    Event callbacks with `executor="process"` run in a process pool of
+    `max_process_workers` processes (one per CPU by default). The processes
+    are not forked from the server, which already runs the loop and pool
+    threads, they start from a forkserver (or spawn, where there is none).
+    """
+
+    max_sync_workers: int = 64
+    step_workers: int | None = None
+    max_process_workers: int | None = None
+
+    _lock = threading.Lock()
+    _loop: asyncio.AbstractEventLoop | None = None
+    _executor: ThreadPoolExecutor | None = None
+    _step_executor: ThreadPoolExecutor | None = None
+    _process_executor: ProcessPoolExecutor | None = None
+    _manager: SyncManager | None = None
+    _pid: int | None = None
+
+    @classmethod
+    def configure(
+        cls,
+        max_sync_workers: int | None = None,
+        step_workers: int | None = None,
+        max_process_workers: int | None = None,
+    ):
+        with cls._lock:
+            if max_sync_workers is not None:
+                if max_sync_workers < 1:
+                    raise ValueError("max_sync_workers must be at least 1")
+                cls.max_sync_workers = max_sync_workers
+                if cls._executor is not None:
+                    cls._executor.shutdown(wait=False)
+                    cls._executor = None
+            if step_workers is not None:
+                if step_workers < 1:
+                    raise ValueError("step_workers must be at least 1")
+                cls.step_workers = step_workers
+                if cls._step_executor is not None:
+                    cls._step_executor.shutdown(wait=False)
+                    cls._step_executor = None
+            if max_process_workers is not None:
+                if max_process_workers < 1:
+                    raise ValueError("max_process_workers must be at least 1")
+                cls.max_process_workers = max_process_workers
+                if cls._process_executor is not None:
+                    cls._process_executor.shutdown(wait=False)
+                    cls._process_executor = None
+
+    @classmethod
+    def executor(cls) -> ThreadPoolExecutor:
+        cls._check_fork()
+        if cls._executor is None:
+            with cls._lock:
+                if cls._executor is None:
+                    cls._executor = ThreadPoolExecutor(
+                        max_workers=cls.max_sync_workers,
+                        thread_name_prefix="dash-event-callback",
+                    )
+        return cls._executor
+
+    @classmethod
+    def step_executor(cls) -> ThreadPoolExecutor:
+        cls._check_fork()
+        if cls._step_executor is None:
+            with cls._lock:
+                if cls._step_executor is None:
+                    cls._step_executor = ThreadPoolExecutor(
+                        max_workers=cls.step_workers or 1,
+                        thread_name_prefix="dash-event-callback-step",
+                    )
+        return cls._step_executor
+
+    @classmethod
+    def process_executor(cls) -> ProcessPoolExecutor:
+        cls._check_fork()
+        if cls._process_executor is None:
+            with cls._lock:
+                if cls._process_executor is None:
+                    cls._process_executor = ProcessPoolExecutor(
+                        max_workers=cls.max_process_workers,
+                        mp_context=_process_context(),
+                    )
+        return cls._process_executor
+
+    @classmethod
+    def discard_process_executor(cls, executor: ProcessPoolExecutor):
+        """Replace `executor` with a new pool, after one of its processes died."""
+        with cls._lock:
+            if cls._process_executor is executor:
+                cls._process_executor = None
+        executor.shutdown(wait=False)
+
+    @classmethod
+    def manager(cls) -> SyncManager:
+        """Server process for the queues between the process pool and the streams."""
+        cls._check_fork()
+        if cls._manager is None:
+            with cls._lock:
+                if cls._manager is None:
+                    cls._manager = _process_context().Manager()
+        return cls._manager
+
+    @classmethod
+    def loop(cls) -> asyncio.AbstractEventLoop:
+        cls._check_fork()
+        if cls._loop is None:
+            with cls._lock:
+                if cls._loop is None:
+                    loop = asyncio.new_event_loop()
+                    threading.Thread(
+                        target=loop.run_forever,
+                        name="dash-event-callback-loop",
+                        daemon=True,
+                    ).start()
+                    cls._loop = loop
+        return cls._loop
+
+    @classmethod
+    def _check_fork(cls):
+        # Threads do not survive a fork (e.g. gunicorn preload), start fresh ones.
+        if cls._pid != os.getpid():
+            with cls._lock:
+                if cls._pid != os.getpid():
+                    cls._loop = None
+                    cls._executor = None
+                    cls._step_executor = None
+                    cls._process_executor = None
+                    cls._manager = None
+                    cls._pid = os.getpid()
+
+
+class SyncSource:
+    """
+    Async iterator over a sync generator.
+
+    The generator is driven by one worker of the runtime thread pool and may
+    run at most `depth` items ahead of the consumer. `stream_sleep` items are
+    passed on, the consumer waits them out before the generator continues.
+    """
+
+    def __init__(
+        self,
+        generator: _t.Generator,
+        context: contextvars.Context,
+        depth: int = 1,
+    ):
+        self._generator = generator
+        self._context = context
+        self._space = threading.Semaphore(depth)
+        self._closed = False
+        self._sleeping = False
+        self._items: asyncio.Queue | None = None
+
+    def __aiter__(self):
+        return self
+
+    def _produce(self, loop: asyncio.AbstractEventLoop, items: asyncio.Queue):
+        try:
+            while True:
+                self._space.acquire()
+                if self._closed:
+                    self._generator.close()
+                    return
+                item = next(self._generator, _DONE)
+                loop.call_soon_threadsafe(items.put_nowait, item)
+                if item is _DONE:
+                    return
+        except BaseException as e:
+            loop.call_soon_threadsafe(items.put_nowait, e)
+
+    async def __anext__(self):
+        if self._items is None:
+            self._items = asyncio.Queue()
+            StreamRuntime.executor().submit(
+                self._context.run, self._produce, asyncio.get_running_loop(), self._items
+            )
+        elif self._sleeping:
+            # The consumer has slept, the generator may continue.
+            self._sleeping = False
+            self._space.release()
+
+        item = await self._items.get()
+        if isinstance(item, BaseException):
+            raise item
+        if item is _DONE:
+            raise StopAsyncIteration
+        if isinstance(item, _Sleep):
+            self._sleeping = True
+        else:
+            self._space.release()
+        return item
+
+    async def aclose(self):
+        # The worker closes the generator once its current step returns.
+        self._closed = True
+        self._space.release()
+        if self._items is None:
+            self._generator.close()
+
+
+class StepSource:
+    """
+    Async iterator over a sync generator that is stepped on the step pool.
+
+    Every item is computed by a separate `next()` task, between two steps
+    (and while the consumer waits out a `stream_sleep`) the stream holds no
+    thread.
+    """
+
+    def __init__(self, generator: _t.Generator, context: contextvars.Context):
+        self._generator = generator
+        self._context = context
+        self._step: Future | None = None
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self):
+        self._step = StreamRuntime.step_executor().submit(
+            self._context.run, next, self._generator, _DONE
+        )
+        item = await asyncio.wrap_future(self._step)
+        if item is _DONE:
+            raise StopAsyncIteration
+        return item
+
+    async def aclose(self):
+        def close(_=None):
+            self._context.run(self._generator.close)
+
+        # A generator can't be closed while a step is running, the worker
+        # closes it once the step returns.
+        if self._step is not None and not self._step.done():
+            self._step.add_done_callback(close)
+        else:
+            StreamRuntime.step_executor().submit(close)
+
+
+class AsyncSource:
+    """
+    Async iterator over an async generator that runs in its own task.
+
+    The generator may run at most `depth` items ahead of the consumer, so
+    its awaits (e.g. fetching the next partition) overlap with writing the
+    previous items to the client.
+    """
+
+    def __init__(self, generator: _t.AsyncGenerator, depth: int):
+        self._generator = generator
+        self._items: asyncio.Queue = asyncio.Queue(depth)
+        self._task: asyncio.Task | None = None
+
+    def __aiter__(self):
+        return self
+
+    async def _produce(self):
+        try:
+            async for item in self._generator:
+                await self._items.put(item)
+            await self._items.put(_DONE)
+        except Exception as e:
+            await self._items.put(e)
+
+    async def __anext__(self):
+        if self._task is None:
+            self._task = asyncio.create_task(self._produce())
+
+        item = await self._items.get()
+        if isinstance(item, BaseException):
+            raise item
+        if item is _DONE:
+            raise StopAsyncIteration
+        return item
+
+    async def aclose(self):
+        if self._task is not None and not self._task.done():
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+        await self._generator.aclose()
+
+
+def iterate_source(
+    generator: _t.Generator | _t.AsyncGenerator,
+    prefetch: int | None = None,
+    blocking: bool = False,
+) -> _t.AsyncIterator:
+    """
+    Async iterator over the items of an event callback generator.
+
+    Sync generators run on a worker of the runtime pool, one item ahead of
+    the consumer unless `prefetch` is set, or step by step on the step pool
+    if `StreamRuntime.step_workers` is set and they are not `blocking`.
+    Async generators run inline, with `prefetch` they run in their own task
+    up to `prefetch` items ahead.
+    """
+    if inspect.isasyncgen(generator):
+        if prefetch is None:
+            return generator
+        return AsyncSource(generator, prefetch)
+    if StreamRuntime.step_workers and not blocking:
+        return StepSource(generator, contextvars.copy_context())
+    return SyncSource(generator, contextvars.copy_context(), prefetch or 1)
+
+
+def iterate_on_loop(
+    stream: _t.Callable[[_t.Callable[[bytes], _t.Awaitable[None]]], _t.Awaitable[None]],
+    depth: int = 1,
+) -> _t.Iterator[bytes]:
+    """
+    Run `stream(write)` on the runtime loop and yield everything it writes.
+
+    This is the bridge for WSGI servers: the request thread only forwards
+    finished chunks, the stream itself runs on the shared event loop. The
+    task inherits the caller's context variables (e.g. the Flask request).
+    `write` waits while `depth` chunks are not sent yet, so a slow client
+    holds back the stream instead of piling up chunks.
+    """
+    loop = StreamRuntime.loop()
+    chunks: queue.Queue = queue.Queue()
+    space = asyncio.Semaphore(depth)
+
+    async def write(chunk: bytes):
+        await space.acquire()
+        chunks.put(chunk)
+
+    async def run():
+        try:
+            await stream(write)
+        finally:
+            chunks.put(_DONE)
+
+    context = contextvars.copy_context()
+    future = context.run(asyncio.run_coroutine_threadsafe, run(), loop)
+
+    try:
+        while (chunk := chunks.get()) is not _DONE:
+            yield chunk
+            # The server asks for the next chunk once this one is sent.
+            loop.call_soon_threadsafe(space.release)
+        future.result()
+    finally:
+        # The client went away (or the response was closed), stop the stream.
+        future.cancel()
+
+
+def run_on_loop(coroutine: _t.Coroutine) -> _t.Any:
+    """Run `coroutine` on the runtime loop and wait for its result, with the caller's context variables."""
+    context = contextvars.copy_context()
+    return context.run(
+        asyncio.run_coroutine_threadsafe, coroutine, StreamRuntime.loop()
+    ).result()
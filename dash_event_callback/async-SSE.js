@@ -1 +1,555 @@
-"use strict";(self.webpackChunkdash_event_callback=self.webpackChunkdash_event_callback||[]).push([[57],{384:(t,e,s)=>{s.r(e),s.d(e,{default:()=>h});var n=s(295),i=s.n(n),r=function(t,e){if(!(this instanceof r))return new r(t,e);this.url=t,e=e||{},this.headers=e.headers||{},this.payload=void 0!==e.payload?e.payload:"",this.method=e.method||(this.payload?"POST":"GET"),this.withCredentials=!!e.withCredentials,this.debug=!!e.debug,this.FIELD_SEPARATOR=":",this.listeners={},this.xhr=null,this.readyState=r.INITIALIZING,this.progress=0,this.chunk="",this.lastEventId="",this.addEventListener=function(t,e){void 0===this.listeners[t]&&(this.listeners[t]=[]),-1===this.listeners[t].indexOf(e)&&this.listeners[t].push(e)},this.removeEventListener=function(t,e){if(void 0===this.listeners[t])return;const s=[];this.listeners[t].forEach(function(t){t!==e&&s.push(t)}),0===s.length?delete this.listeners[t]:this.listeners[t]=s},this.dispatchEvent=function(t){if(!t)return!0;this.debug&&console.debug(t),t.source=this;const e="on"+t.type;return(!this.hasOwnProperty(e)||(this[e].call(this,t),!t.defaultPrevented))&&(!this.listeners[t.type]||this.listeners[t.type].every(function(e){return e(t),!t.defaultPrevented}))},this._markClosed=function(){this.xhr=null,this.progress=0,this.chunk="",this._setReadyState(r.CLOSED)},this._setReadyState=function(t){const e=new CustomEvent("readystatechange");e.readyState=t,this.readyState=t,this.dispatchEvent(e)},this._onStreamFailure=function(t){const e=new CustomEvent("error");e.responseCode=t.currentTarget.status,e.data=t.currentTarget.response,this.dispatchEvent(e),this._markClosed()},this._onStreamAbort=function(){this.dispatchEvent(new CustomEvent("abort")),this._markClosed()},this._onStreamProgress=function(t){if(!this.xhr)return;if(this.xhr.status<200||this.xhr.status>=300)return void this._onStreamFailure(t);const e=this.xhr.responseText.substring(this.progress);this.progress+=e.length;const s=(this.chunk+e).split(/(\r\n\r\n|\r\r|\n\n)/g),n=s.pop();s.forEach(function(t){t.trim().length>0&&this.dispatchEvent(this._parseEventChunk(t))}.bind(this)),this.chunk=n},this._onStreamLoaded=function(t){this._onStreamProgress(t),this.dispatchEvent(this._parseEventChunk(this.chunk)),this.chunk="",this._markClosed()},this._parseEventChunk=function(t){if(!t||0===t.length)return null;this.debug&&console.debug(t);const e={id:null,retry:null,data:null,event:null};t.split(/\n|\r\n|\r/).forEach(function(t){const s=t.indexOf(this.FIELD_SEPARATOR);let n,i;if(s>0){const e=" "===t[s+1]?2:1;n=t.substring(0,s),i=t.substring(s+e)}else{if(!(s<0))return;n=t,i=""}n in e&&("data"===n&&null!==e[n]?e.data+="\n"+i:e[n]=i)}.bind(this)),null!==e.id&&(this.lastEventId=e.id);const s=new CustomEvent(e.event||"message");return s.id=e.id,s.data=e.data||"",s.lastEventId=this.lastEventId,s},this._onReadyStateChange=function(){if(this.xhr&&this.xhr.readyState===XMLHttpRequest.HEADERS_RECEIVED){const t={},e=this.xhr.getAllResponseHeaders().trim().split("\r\n");for(const s of e){const[e,...n]=s.split(":"),i=n.join(":").trim();t[e.trim().toLowerCase()]=t[e.trim().toLowerCase()]||[],t[e.trim().toLowerCase()].push(i)}const s=new CustomEvent("open");s.responseCode=this.xhr.status,s.headers=t,this.dispatchEvent(s),this._setReadyState(r.OPEN)}},this.stream=function(){if(!this.xhr){this._setReadyState(r.CONNECTING),this.xhr=new XMLHttpRequest,this.xhr.addEventListener("progress",this._onStreamProgress.bind(this)),this.xhr.addEventListener("load",this._onStreamLoaded.bind(this)),this.xhr.addEventListener("readystatechange",this._onReadyStateChange.bind(this)),this.xhr.addEventListener("error",this._onStreamFailure.bind(this)),this.xhr.addEventListener("abort",this._onStreamAbort.bind(this)),this.xhr.open(this.method,this.url);for(let t in this.headers)this.xhr.setRequestHeader(t,this.headers[t]);this.lastEventId.length>0&&this.xhr.setRequestHeader("Last-Event-ID",this.lastEventId),this.xhr.withCredentials=this.withCredentials,this.xhr.send(this.payload)}},this.close=function(){this.readyState!==r.CLOSED&&this.xhr.abort()},(void 0===e.start||e.start)&&this.stream()};r.INITIALIZING=-1,r.CONNECTING=0,r.OPEN=1,r.CLOSED=2,"undefined"!=typeof exports&&(exports.SSE=r);const h=function(t){var e=t.url,s=t.options,h=t.concat,a=void 0===h||h,o=t.setProps,d=t.done,u=t.update_component,l=(0,n.useState)(""),c=l[0],f=l[1],p=(0,n.useState)(d||!1),E=p[0],v=p[1];return(0,n.useEffect)(function(){if(v(!1),f(""),e){var t=new r(e,s);return t.onmessage=function(e){var s;if("[DONE]"===e.data)return v(!0),void t.close();var n=null===(s=window.dash_clientside)||void 0===s?void 0:s.set_props;if(u&&n)try{var i=JSON.parse(e.data);if(Array.isArray(i)){var r=i[0],h=i[1],a=i[2];switch(r){case"[ERROR]":a.handle_error&&window.alert("Error from SSE stream: ".concat(a.error)),a.reset_props&&a.reset_props.forEach(function(t){if(Array.isArray(t)&&2===t.length){var e=t[0],s=t[1];n(e,s)}}),t.close();break;case"[SINGLE]":n(h,a);break;case"[BATCH]":Array.isArray(a)&&a.forEach(function(t){if(Array.isArray(t)&&2===t.length){var e=t[0],s=t[1];n(e,s)}});break;default:console.warn("Unknown stream type:",r)}}}catch(t){console.log("Not a JSON message, ignoring for update_component",e.data)}},t.onerror=function(e){console.log("Unhandled SSE ERROR",e),t.close()},function(){t.close()}}},[e,s,a]),(0,n.useEffect)(function(){o&&o({value:c,done:E})},[c,E,o]),i().createElement(i().Fragment,null)}}}]);
\ No newline at end of file
+"use strict";
+(self.webpackChunkdash_event_callback = self.webpackChunkdash_event_callback || []).push([[57], {
+384: (module, exports, __webpack_require__) => {
+__webpack_require__.r(exports);
+__webpack_require__.d(exports, { default: () => SSE });
+const React = __webpack_require__(295);
+const { useEffect, useRef } = __webpack_require__(295);
+const { SSE: SSEjs } = __webpack_require__(387);
+const { getMultiplexer, newStreamId } = __webpack_require__(385);
+const { parseFrame } = __webpack_require__(386);
+const MAX_RECONNECTS = 5;
+// Return a copy of `target` with `op` applied at `path`, untouched branches are shared.
+const applyAt = (target, path, op)=>{
+  const [kind, , value] = op;
+  if (path.length === 0) {
+    if (kind === 'append') {
+      return [
+        ...Array.isArray(target) ? target : [],
+        ...value
+      ];
+    }
+    return value;
+  }
+  const [key, ...rest] = path;
+  const copy = Array.isArray(target) ? [
+    ...target
+  ] : {
+    ...target ?? {}
+  };
+  if (rest.length === 0 && kind === 'del') {
+    if (Array.isArray(copy)) {
+      copy.splice(key, 1);
+    } else {
+      delete copy[key];
+    }
+    return copy;
+  }
+  copy[key] = applyAt(copy[key], rest, op);
+  return copy;
+};
+const applyPatch = (target, ops)=>ops.reduce((value, op)=>applyAt(value, op[1], op), target);
+const componentKey = (componentId)=>typeof componentId === 'string' ? componentId : JSON.stringify(componentId, Object.keys(componentId).sort());
+const propKey = (componentId, prop)=>`${componentKey(componentId)}.${prop}`;
+// Props whose updates add to the current value, they are never merged.
+const ACCUMULATING_PROPS = new Set([
+  'rowTransaction',
+  'sendNotifications',
+  'extendData',
+  'prependData'
+]);
+/**
+ * Component updates waiting for the next animation frame (or for `maxRate`
+ * flushes per second). Updates of the same component prop are merged, so a
+ * fast stream costs one Dash render per frame instead of one per message.
+ */ class UpdateQueue {
+  maxRate;
+  isCurrent;
+  batches;
+  lastFlush;
+  timer;
+  frame;
+  // `isCurrent` tells whether the updates still belong to the stream the component shows.
+  constructor(maxRate, isCurrent = ()=>true){
+    this.maxRate = maxRate;
+    this.isCurrent = isCurrent;
+    this.batches = [
+      new Map()
+    ];
+    this.lastFlush = -Infinity;
+  }
+  push(componentId, props) {
+    const key = componentKey(componentId);
+    let batch = this.batches[this.batches.length - 1];
+    const pending = batch.get(key);
+    if (pending && Object.keys(props).some((prop)=>ACCUMULATING_PROPS.has(prop) && prop in pending.props)) {
+      // Both updates have to be applied, the second one in a later set_props.
+      batch = new Map();
+      this.batches.push(batch);
+    }
+    const entry = batch.get(key);
+    if (entry) {
+      Object.assign(entry.props, props);
+    } else {
+      batch.set(key, {
+        id: componentId,
+        props: {
+          ...props
+        }
+      });
+    }
+    this.schedule();
+  }
+  schedule() {
+    if (this.timer !== undefined || this.frame !== undefined) {
+      return;
+    }
+    const wait = this.maxRate ? this.lastFlush + 1000 / this.maxRate - performance.now() : 0;
+    if (wait > 0) {
+      this.timer = setTimeout(()=>{
+        this.timer = undefined;
+        this.frame = requestAnimationFrame(()=>this.flush());
+      }, wait);
+    } else {
+      this.frame = requestAnimationFrame(()=>this.flush());
+    }
+  }
+  cancel() {
+    clearTimeout(this.timer);
+    if (this.frame !== undefined) {
+      cancelAnimationFrame(this.frame);
+    }
+    this.timer = this.frame = undefined;
+  }
+  // Drop the queued updates, e.g. of a stream that was replaced or cancelled.
+  discard() {
+    this.cancel();
+    this.batches = [
+      new Map()
+    ];
+  }
+  flush() {
+    this.cancel();
+    this.lastFlush = performance.now();
+    const batches = this.batches;
+    this.batches = [
+      new Map()
+    ];
+    const dashSetProps = window.dash_clientside?.set_props;
+    if (!dashSetProps || !this.isCurrent()) {
+      return;
+    }
+    batches.forEach((batch)=>batch.forEach(({ id, props })=>dashSetProps(id, props)));
+  }
+}
+// sse.js doesn't expose the `retry` field of an event, read it from the raw event chunk.
+const readRetry = (source)=>{
+  const parse = source._parseEventChunk;
+  source._parseEventChunk = function(chunk) {
+    const event = parse.call(this, chunk);
+    const retry = /^retry:\s?(\d+)\s*$/m.exec(chunk ?? '');
+    if (event && retry) {
+      event.retry = Number(retry[1]);
+    }
+    return event;
+  };
+};
+// Identifies a stream: a new invocation (or url) opens a new connection, any other prop change doesn't.
+const streamIdentity = (url, options)=>{
+  if (!url) {
+    return undefined;
+  }
+  return `${url}|${options?.invocation ?? JSON.stringify(options ?? {})}`;
+};
+const SSE = (props)=>{
+  // The connection reads the current props when it needs them, they are not effect dependencies.
+  const latest = useRef(props);
+  latest.current = props;
+  const identity = streamIdentity(props.url, props.options);
+  useEffect(()=>{
+    const { url, options, update_component, max_flush_rate, worker_threshold } = latest.current;
+    if (!url) {
+      return;
+    }
+    // Only a component that reported the end of a stream has to be told about the next one.
+    if (latest.current.done) {
+      latest.current.setProps?.({
+        done: false
+      });
+    }
+    // Last value of every prop received as [PATCH] on this connection.
+    const shadow = new Map();
+    // Resumable streams number their frames, a dropped connection continues after the last one.
+    let lastEventId;
+    let retryDelay = 1000;
+    let retries = 0;
+    let closed = false;
+    let reconnectTimer;
+    let sse;
+    // Set when the stream runs over the tab's shared connection.
+    const multiplex = options?.multiplex;
+    let stopMultiplexed;
+    // The url is unset (e.g. by a cancel callback) before the effect is cleaned up.
+    const updates = new UpdateQueue(max_flush_rate, ()=>streamIdentity(latest.current.url, latest.current.options) === identity);
+    let backlog = Promise.resolve();
+    let backlogSize = 0;
+    // `cancel` stops a multiplexed stream on the server, a dedicated connection stops it by closing.
+    const close = (cancel = false)=>{
+      if (closed) {
+        return;
+      }
+      closed = true;
+      clearTimeout(reconnectTimer);
+      if (stopMultiplexed) {
+        stopMultiplexed(cancel);
+      } else {
+        sse?.close();
+      }
+    };
+    const reconnect = (current)=>{
+      if (current !== sse || closed || reconnectTimer) {
+        return;
+      }
+      if (!lastEventId || retries >= MAX_RECONNECTS) {
+        close();
+        return;
+      }
+      retries += 1;
+      reconnectTimer = setTimeout(()=>{
+        reconnectTimer = undefined;
+        connect();
+      }, retryDelay * retries);
+    };
+    const connect = ()=>{
+      const headers = lastEventId ? {
+        ...options?.headers,
+        'Last-Event-ID': lastEventId
+      } : options?.headers;
+      const current = new SSEjs(url, {
+        ...options,
+        headers
+      });
+      readRetry(current);
+      sse = current;
+      current.onerror = (e)=>{
+        console.log('SSE connection error', e);
+        reconnect(current);
+      };
+      current.addEventListener('readystatechange', (e)=>{
+        // 2 = CLOSED, the response ended without [DONE] or an [ERROR]
+        if (e.readyState === 2) {
+          reconnect(current);
+        }
+      });
+      current.onmessage = (e)=>onMessage(e);
+    };
+    const onMessage = (e)=>{
+      const event = e;
+      if (event.id) {
+        lastEventId = event.id;
+        retries = 0;
+      }
+      if (event.retry) {
+        retryDelay = event.retry;
+      }
+      // sse.js delivers comments (the server's heartbeats) and the events that only
+      // set the id or the reconnect delay as messages without data.
+      if (!e.data) {
+        return;
+      }
+      // If update_component is set, parse the frame to queue its component updates
+      const parsed = e.data !== '[DONE]' && update_component && window.dash_clientside?.set_props ? parseFrame(e.data, worker_threshold) : undefined;
+      if (!backlogSize && !(parsed instanceof Promise)) {
+        try {
+          handle(e.data, parsed);
+        } catch (err) {
+          console.log('Could not apply SSE message', err);
+        }
+        return;
+      }
+      // Frames parsed in the worker finish later, the frames after them wait.
+      backlogSize += 1;
+      backlog = backlog.then(()=>parsed).then((msg)=>handle(e.data, msg)).catch((err)=>console.log('Could not apply SSE message', err)).finally(()=>{
+        backlogSize -= 1;
+      });
+    };
+    const handle = (data, msg)=>{
+      if (closed) {
+        return;
+      }
+      // Handle end of stream, the last updates are applied right away.
+      if (data === '[DONE]') {
+        updates.flush();
+        latest.current.setProps?.({
+          done: true
+        });
+        close();
+        return;
+      }
+      if (!Array.isArray(msg)) {
+        return;
+      }
+      const [stream_type, componentId, props] = msg;
+      switch(stream_type){
+        case '[ERROR]':
+          if (props.handle_error) {
+            window.alert(`Error from SSE stream: ${props.error}`);
+          }
+          if (props.reset_props) {
+            props.reset_props.forEach((item)=>{
+              if (Array.isArray(item) && item.length === 2) {
+                const [compId, compProps] = item;
+                updates.push(compId, compProps);
+              }
+            });
+          }
+          updates.flush();
+          close();
+          break;
+        case '[SINGLE]':
+          updates.push(componentId, props);
+          break;
+        case '[BATCH]':
+          // For batch, we expect props to be a list of list of [componentId, props]
+          if (Array.isArray(props)) {
+            props.forEach((item)=>{
+              if (Array.isArray(item) && item.length === 2) {
+                const [compId, compProps] = item;
+                updates.push(compId, compProps);
+              }
+            });
+          }
+          break;
+        case '[PATCH]':
+          // For patch, props is a list of [componentId, {prop: operations}]
+          if (Array.isArray(props)) {
+            props.forEach((item)=>{
+              if (Array.isArray(item) && item.length === 2) {
+                const [compId, compOps] = item;
+                const patched = {};
+                Object.entries(compOps).forEach(([prop, ops])=>{
+                  const key = propKey(compId, prop);
+                  patched[prop] = applyPatch(shadow.get(key), ops);
+                  shadow.set(key, patched[prop]);
+                });
+                updates.push(compId, patched);
+              }
+            });
+          }
+          break;
+        default:
+          console.warn('Unknown stream type:', stream_type);
+      }
+    };
+    if (multiplex) {
+      const multiplexer = getMultiplexer(multiplex);
+      const streamId = newStreamId();
+      stopMultiplexed = (cancel)=>multiplexer.stop(streamId, cancel);
+      multiplexer.start(url, options, streamId, onMessage).catch((err)=>{
+        console.log('SSE connection error', err);
+        close();
+      });
+    } else {
+      connect();
+    }
+    // Close on unmount or for the next stream, its queued updates are stale by then,
+    // e.g. after a cancel callback already applied its `reset_props`.
+    return ()=>{
+      updates.discard();
+      close(true);
+    };
+  }, [
+    identity
+  ]);
+  return /*#__PURE__*/ React.createElement(React.Fragment, null);
+};
+},
+385: (module, exports, __webpack_require__) => {
+__webpack_require__.r(exports);
+__webpack_require__.d(exports, { newStreamId: () => newStreamId, getMultiplexer: () => getMultiplexer });
+const { SSE: SSEjs } = __webpack_require__(387);
+const TAB_HEADER = 'X-Dash-Multiplex-Tab';
+const STREAM_HEADER = 'X-Dash-Multiplex-Stream';
+const RECONNECT_DELAY = 1000;
+// The tab id is all it takes to read a tab's frames, it has to be unguessable.
+// getRandomValues works on plain http as well, unlike crypto.randomUUID.
+const newStreamId = ()=>Array.from(crypto.getRandomValues(new Uint8Array(16)), (byte)=>byte.toString(16).padStart(2, '0')).join('');
+/**
+ * One event stream per tab, shared by all SSE components of the page.
+ * Streams are started with a POST that returns at once, their events
+ * arrive on the shared stream with the stream id as event type.
+ */ class Multiplexer {
+  endpoint;
+  tab;
+  sse;
+  handlers;
+  constructor(endpoint){
+    this.endpoint = endpoint;
+    this.tab = newStreamId();
+    this.handlers = new Map();
+  }
+  connect() {
+    if (this.sse) {
+      return;
+    }
+    const sse = new SSEjs(`${this.endpoint}?tab=${this.tab}`, {
+      method: 'GET'
+    });
+    this.handlers.forEach((handler, streamId)=>sse.addEventListener(streamId, handler));
+    const reopen = ()=>{
+      if (this.sse !== sse) {
+        return;
+      }
+      this.sse = undefined;
+      sse.close();
+      if (this.handlers.size) {
+        setTimeout(()=>this.connect(), RECONNECT_DELAY);
+      }
+    };
+    sse.onerror = reopen;
+    sse.addEventListener('readystatechange', (e)=>{
+      // 2 = CLOSED
+      if (e.readyState === 2) {
+        reopen();
+      }
+    });
+    this.sse = sse;
+  }
+  async start(url, options, streamId, handler) {
+    this.handlers.set(streamId, handler);
+    this.connect();
+    this.sse?.addEventListener(streamId, handler);
+    const response = await fetch(url, {
+      method: options?.method ?? 'POST',
+      headers: {
+        ...options?.headers,
+        [TAB_HEADER]: this.tab,
+        [STREAM_HEADER]: streamId
+      },
+      body: options?.payload,
+      credentials: options?.withCredentials ? 'include' : 'same-origin'
+    });
+    if (!response.ok) {
+      throw new Error(`Could not start stream: ${response.status}`);
+    }
+  }
+  stop(streamId, cancel) {
+    const handler = this.handlers.get(streamId);
+    if (!handler) {
+      return;
+    }
+    this.handlers.delete(streamId);
+    this.sse?.removeEventListener(streamId, handler);
+    if (cancel) {
+      fetch(`${this.endpoint}/cancel`, {
+        method: 'POST',
+        headers: {
+          'Content-Type': 'application/json'
+        },
+        body: JSON.stringify({
+          tab: this.tab,
+          stream: streamId
+        })
+      }).catch((err)=>console.log('Could not cancel stream', err));
+    }
+  }
+}
+const multiplexers = new Map();
+const getMultiplexer = (endpoint)=>{
+  let multiplexer = multiplexers.get(endpoint);
+  if (!multiplexer) {
+    multiplexer = new Multiplexer(endpoint);
+    multiplexers.set(endpoint, multiplexer);
+  }
+  return multiplexer;
+};
+},
+386: (module, exports, __webpack_require__) => {
+__webpack_require__.r(exports);
+__webpack_require__.d(exports, { parseFrame: () => parseFrame });
+// Parses one frame per message, the results are matched to their request by id.
+const WORKER_SOURCE = `
+self.onmessage = (e) => {
+  let result;
+  try {
+    result = { id: e.data.id, msg: JSON.parse(e.data.text) };
+  } catch (err) {
+    result = { id: e.data.id, error: String(err) };
+  }
+  self.postMessage(result);
+};
+`;
+/**
+ * A Web Worker that parses large frames off the main thread, shared by all
+ * SSE components of the page. Falls back to `JSON.parse` if workers are not
+ * available (e.g. blocked by a Content Security Policy).
+ */ class JsonWorker {
+  worker;
+  nextId = 0;
+  pending = new Map();
+  constructor(){
+    try {
+      const url = URL.createObjectURL(new Blob([
+        WORKER_SOURCE
+      ], {
+        type: 'text/javascript'
+      }));
+      this.worker = new Worker(url);
+      this.worker.onmessage = (e)=>this.settle(e.data.id, e.data.msg, e.data.error);
+      this.worker.onerror = ()=>this.fail();
+    } catch (err) {
+      console.log('Could not start the JSON worker, parsing on the main thread', err);
+    }
+  }
+  parse(text) {
+    if (!this.worker) {
+      return Promise.resolve(parseNow(text));
+    }
+    const id = this.nextId++;
+    return new Promise((resolve)=>{
+      this.pending.set(id, {
+        resolve,
+        text
+      });
+      this.worker.postMessage({
+        id,
+        text
+      });
+    });
+  }
+  settle(id, msg, error) {
+    const pending = this.pending.get(id);
+    if (!pending) {
+      return;
+    }
+    this.pending.delete(id);
+    if (error) {
+      console.log('Not a JSON message, ignoring for update_component', pending.text);
+    }
+    pending.resolve(msg);
+  }
+  fail() {
+    // Parse what is left here and stop using the worker.
+    this.worker?.terminate();
+    this.worker = undefined;
+    this.pending.forEach(({ resolve, text })=>resolve(parseNow(text)));
+    this.pending.clear();
+  }
+}
+const parseNow = (text)=>{
+  try {
+    return JSON.parse(text);
+  } catch (err) {
+    console.log('Not a JSON message, ignoring for update_component', text);
+    return undefined;
+  }
+};
+let jsonWorker;
+/**
+ * Parse a frame, in the worker if it has at least `threshold` characters.
+ * Frames that can't be parsed result in `undefined`.
+ */ const parseFrame = (text, threshold)=>{
+  if (threshold === undefined || threshold === null || text.length < threshold) {
+    return parseNow(text);
+  }
+  jsonWorker = jsonWorker ?? new JsonWorker();
+  return jsonWorker.parse(text);
+};
+},
+387: (module, exports, __webpack_require__) => {
+__webpack_require__.r(exports);
+__webpack_require__.d(exports, { SSE: () => r });
+// sse.js 2.x, as bundled by the shipped async-SSE.js
+var r=function(t,e){if(!(this instanceof r))return new r(t,e);this.url=t,e=e||{},this.headers=e.headers||{},this.payload=void 0!==e.payload?e.payload:"",this.method=e.method||(this.payload?"POST":"GET"),this.withCredentials=!!e.withCredentials,this.debug=!!e.debug,this.FIELD_SEPARATOR=":",this.listeners={},this.xhr=null,this.readyState=r.INITIALIZING,this.progress=0,this.chunk="",this.lastEventId="",this.addEventListener=function(t,e){void 0===this.listeners[t]&&(this.listeners[t]=[]),-1===this.listeners[t].indexOf(e)&&this.listeners[t].push(e)},this.removeEventListener=function(t,e){if(void 0===this.listeners[t])return;const s=[];this.listeners[t].forEach(function(t){t!==e&&s.push(t)}),0===s.length?delete this.listeners[t]:this.listeners[t]=s},this.dispatchEvent=function(t){if(!t)return!0;this.debug&&console.debug(t),t.source=this;const e="on"+t.type;return(!this.hasOwnProperty(e)||(this[e].call(this,t),!t.defaultPrevented))&&(!this.listeners[t.type]||this.listeners[t.type].every(function(e){return e(t),!t.defaultPrevented}))},this._markClosed=function(){this.xhr=null,this.progress=0,this.chunk="",this._setReadyState(r.CLOSED)},this._setReadyState=function(t){const e=new CustomEvent("readystatechange");e.readyState=t,this.readyState=t,this.dispatchEvent(e)},this._onStreamFailure=function(t){const e=new CustomEvent("error");e.responseCode=t.currentTarget.status,e.data=t.currentTarget.response,this.dispatchEvent(e),this._markClosed()},this._onStreamAbort=function(){this.dispatchEvent(new CustomEvent("abort")),this._markClosed()},this._onStreamProgress=function(t){if(!this.xhr)return;if(this.xhr.status<200||this.xhr.status>=300)return void this._onStreamFailure(t);const e=this.xhr.responseText.substring(this.progress);this.progress+=e.length;const s=(this.chunk+e).split(/(\r\n\r\n|\r\r|\n\n)/g),n=s.pop();s.forEach(function(t){t.trim().length>0&&this.dispatchEvent(this._parseEventChunk(t))}.bind(this)),this.chunk=n},this._onStreamLoaded=function(t){this._onStreamProgress(t),this.dispatchEvent(this._parseEventChunk(this.chunk)),this.chunk="",this._markClosed()},this._parseEventChunk=function(t){if(!t||0===t.length)return null;this.debug&&console.debug(t);const e={id:null,retry:null,data:null,event:null};t.split(/\n|\r\n|\r/).forEach(function(t){const s=t.indexOf(this.FIELD_SEPARATOR);let n,i;if(s>0){const e=" "===t[s+1]?2:1;n=t.substring(0,s),i=t.substring(s+e)}else{if(!(s<0))return;n=t,i=""}n in e&&("data"===n&&null!==e[n]?e.data+="\n"+i:e[n]=i)}.bind(this)),null!==e.id&&(this.lastEventId=e.id);const s=new CustomEvent(e.event||"message");return s.id=e.id,s.data=e.data||"",s.lastEventId=this.lastEventId,s},this._onReadyStateChange=function(){if(this.xhr&&this.xhr.readyState===XMLHttpRequest.HEADERS_RECEIVED){const t={},e=this.xhr.getAllResponseHeaders().trim().split("\r\n");for(const s of e){const[e,...n]=s.split(":"),i=n.join(":").trim();t[e.trim().toLowerCase()]=t[e.trim().toLowerCase()]||[],t[e.trim().toLowerCase()].push(i)}const s=new CustomEvent("open");s.responseCode=this.xhr.status,s.headers=t,this.dispatchEvent(s),this._setReadyState(r.OPEN)}},this.stream=function(){if(!this.xhr){this._setReadyState(r.CONNECTING),this.xhr=new XMLHttpRequest,this.xhr.addEventListener("progress",this._onStreamProgress.bind(this)),this.xhr.addEventListener("load",this._onStreamLoaded.bind(this)),this.xhr.addEventListener("readystatechange",this._onReadyStateChange.bind(this)),this.xhr.addEventListener("error",this._onStreamFailure.bind(this)),this.xhr.addEventListener("abort",this._onStreamAbort.bind(this)),this.xhr.open(this.method,this.url);for(let t in this.headers)this.xhr.setRequestHeader(t,this.headers[t]);this.lastEventId.length>0&&this.xhr.setRequestHeader("Last-Event-ID",this.lastEventId),this.xhr.withCredentials=this.withCredentials,this.xhr.send(this.payload)}},this.close=function(){this.readyState!==r.CLOSED&&this.xhr.abort()},(void 0===e.start||e.start)&&this.stream()};r.INITIALIZING=-1,r.CONNECTING=0,r.OPEN=1,r.CLOSED=2;
+}
+}]);
@@ -1,10 +1,25 @@
+import typing as _t
+import datetime
+import decimal
 import json
+import sys
+
+_JSON_SCALARS: _t.Final = (str, int, float, bool, type(None))
+_SCALAR_TYPES: _t.Final = frozenset(_JSON_SCALARS)
+
+# Converter per concrete type, resolved once by `_resolve_converter`.
+_CONVERTERS: _t.Dict[type, _t.Callable[[_t.Any], _t.Any]] = {}
+
 
 def recursive_to_plotly_json(component):
     """
     Recursively convert a component to a JSON-serializable structure.
     Handles Plotly components, numpy arrays, pandas objects, dates/times, and other special types.
 
+    The conversion is dispatched on the concrete type of every value, the
+    converter of a type is resolved once and cached. Plain JSON containers
+    are returned as they are, without being copied.
+
     Parameters:
     -----------
     component: Any
@@ -14,94 +29,116 @@ def recursive_to_plotly_json(component):
     --------
     A JSON-serializable representation of the component
     """
-    # Base case: simple types don't need conversion
-    if component is None or isinstance(component, (str, int, float, bool)):
+    try:
+        converter = _CONVERTERS[type(component)]
+    except KeyError:
+        converter = _CONVERTERS[type(component)] = _resolve_converter(type(component))
+    return converter(component)
+
+
+def _identity(component):
+    return component
+
+
+def _convert_dict(component: dict):
+    for value in component.values():
+        if type(value) not in _SCALAR_TYPES:
+            break
+    else:
         return component
+    return {key: recursive_to_plotly_json(value) for key, value in component.items()}
 
-    # Try to handle numpy arrays first
-    try:
-        import numpy as np
-
-        if isinstance(component, np.ndarray):
-            return component.tolist()
-        elif np.isscalar(component) and not isinstance(
-            component, (bool, int, float, complex)
-        ):
-            return component.item()
-    except (ImportError, AttributeError):
-        pass
-
-    # Handle pandas objects
-    try:
-        import pandas as pd
-
-        if isinstance(component, (pd.Series, pd.DataFrame)):
-            return component.to_dict()
-        elif isinstance(component, pd.Timestamp):
-            return component.isoformat()
-        elif component is pd.NaT:
-            return None
-    except (ImportError, AttributeError):
-        pass
-
-    # Handle datetime objects
-    try:
-        import datetime
 
-        if isinstance(component, (datetime.date, datetime.datetime)):
-            return component.isoformat()
-    except (ImportError, AttributeError):
-        pass
+def _convert_list(component: list):
+    for value in component:
+        if type(value) not in _SCALAR_TYPES:
+            break
+    else:
+        return component
+    return list(map(recursive_to_plotly_json, component))
+
 
-    # Handle decimal
+def _convert_sequence(component):
+    return _convert_list(list(component))
+
+
+def _to_string(component):
     try:
-        import decimal
+        return str(component)
+    except Exception:
+        return None
+
+
+def _convert_array(component):
+    kind = component.dtype.kind
+    if kind == "M":
+        # ISO strings like plotly, `tolist` gives datetimes (or ints for ns).
+        return sys.modules["numpy"].datetime_as_string(component).tolist()
+    if kind == "O":
+        return recursive_to_plotly_json(component.tolist())
+    return component.tolist()
+
+
+def _resolve_converter(tp: type) -> _t.Callable[[_t.Any], _t.Any]:
+    """Find the converter of `tp`, following the precedence of the original checks."""
+    if issubclass(tp, _JSON_SCALARS):
+        return _identity
+
+    # Objects of these libraries can only exist if the library is imported.
+    np = sys.modules.get("numpy")
+    if np is not None:
+        if issubclass(tp, np.ndarray):
+            return _convert_array
+        if issubclass(tp, np.generic):
+            return lambda component: component.item()
 
-        if isinstance(component, decimal.Decimal):
-            return float(component)
-    except (ImportError, AttributeError):
-        pass
+    pd = sys.modules.get("pandas")
+    if pd is not None:
+        if issubclass(tp, (pd.Series, pd.DataFrame)):
+            return lambda component: recursive_to_plotly_json(component.to_dict())
+        if tp is type(pd.NaT):
+            return lambda component: None
+
+    if issubclass(tp, (datetime.date, datetime.datetime)):
+        return lambda component: component.isoformat()
+
+    if issubclass(tp, decimal.Decimal):
+        return float
 
     # Convert component to plotly json if it has the method
-    if hasattr(component, "to_plotly_json"):
-        component = component.to_plotly_json()
+    if hasattr(tp, "to_plotly_json"):
+        return lambda component: recursive_to_plotly_json(component.to_plotly_json())
+
+    if issubclass(tp, dict):
+        container = _convert_dict
+    elif issubclass(tp, list):
+        container = _convert_list
+    elif issubclass(tp, tuple):
+        container = _convert_sequence
+    else:
+        # As a last resort, try string representation
+        container = _to_string
 
     # Also try other common serialization methods
-    if hasattr(component, "tolist"):
-        try:
-            return component.tolist()
-        except Exception:
-            pass
-
-    if hasattr(component, "to_dict"):
-        try:
-            return component.to_dict()
-        except Exception:
-            pass
-
-    # Make sure component is a dictionary before checking for "props"
-    if isinstance(component, dict):
-        # Process props
-        for key, value in list(component.items()):
-            if isinstance(value, list):
-                # Process lists of items
-                component[key] = [recursive_to_plotly_json(item) for item in value]
-            else:
-                # Process single items
-                component[key] = recursive_to_plotly_json(value)
-
-    # Handle list-type components
-    elif isinstance(component, list):
-        component = [recursive_to_plotly_json(item) for item in component]
-
-    # As a last resort, try string representation
-    else:
-        try:
-            return str(component)
-        except Exception:
-            return None
+    methods = [getattr(tp, name) for name in ("tolist", "to_dict") if hasattr(tp, name)]
+    if not methods:
+        return container
 
-    return component
+    def convert(component):
+        for method in methods:
+            try:
+                return method(component)
+            except Exception:
+                pass
+        return container(component)
+
+    return convert
+
+
+for _tp in _JSON_SCALARS:
+    _CONVERTERS[_tp] = _identity
+_CONVERTERS[dict] = _convert_dict
+_CONVERTERS[list] = _convert_list
 
 
 def get_callback_id(callback_id: str):
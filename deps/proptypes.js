@@ -10,4 +10,6 @@ pk.SSE.propTypes = {id:pt.string,
  concat:pt.bool,
  value:pt.string,
  done:pt.bool,
- update_component:pt.bool};
+ update_component:pt.bool,
+ max_flush_rate:pt.number,
+ worker_threshold:pt.number};
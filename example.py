@@ -1,4 +1,4 @@
-from dash_event_callback import stream_props, event_callback
+from dash_event_callback import stream_props, stream_dataframe, event_callback, Pacing
 
 from dash_iconify import DashIconify
 from plotly.express import data
@@ -19,9 +19,9 @@ def get_data(chunk_size):
         time.sleep(2)
         end = len(df) - total_rows + chunk_size
         total_rows -= chunk_size
-        update_data = df[:end].to_dict("records")
-        df.drop(df.index[:end], inplace=True)
-        yield update_data, df.columns
+        update_data = df[:end]
+        df = df.drop(df.index[:end])
+        yield update_data
 
 
 class NotificationComponent(dmc.Box):
@@ -141,7 +141,8 @@ class CiCdComponent(dmc.Box):
         reset_props={
             ids.button: {"disabled": False, "children": "Start CI/CD Pipeline"},
             ids.reset_button: {"display": "none"},
-        }
+        },
+        pacing=Pacing.coalesce(50, merge=True),
     )
     def run_cicd(n_clicks):
 
@@ -284,14 +285,13 @@ class TestComponentStream(dmc.Stack):
 
         progress = 0
         chunck_size = 500
-        for data_chunk, colnames in get_data(chunck_size):
-            if progress == 0:
-                columnDefs = [{"field": col} for col in colnames]
-                update = {"rowData": data_chunk, "columnDefs": columnDefs}
-            else:
-                update = {"rowTransaction": {"add": data_chunk}}
-
-            yield stream_props(TestComponentStream.ids.table, update)
+        for data_chunk in get_data(chunck_size):
+            yield from stream_dataframe(
+                TestComponentStream.ids.table,
+                data_chunk,
+                chunk_rows=chunck_size,
+                append=progress > 0,
+            )
 
             if len(data_chunk) == chunck_size:
                 yield NotificationComponent.send_notification(
@@ -12,6 +12,8 @@ Keyword arguments:
 - `id` (String; optional): Unique ID to identify this component in Dash callbacks.
 - `concat` (Bool; optional): A boolean indicating if the stream values should be concatenated.
 - `done` (Bool; optional): A boolean indicating if the (current) stream has ended.
+- `max_flush_rate` (Real; optional): Maximum number of times per second the streamed updates are applied to
+the components. By default they are applied once per animation frame.
 - `options` (optional): Options passed to the SSE constructor.. options has the following type: lists containing elements 'headers', 'payload', 'method', 'withCredentials', 'start', 'debug'.
 Those elements have the following types:
   - `headers` (Dict with Strings as keys and values of type String; optional): - headers
@@ -23,9 +25,11 @@ Those elements have the following types:
 - `update_component` (Bool; optional): A boolean indicating if the strea, should update components.
 - `url` (String; optional): URL of the endpoint.
 - `value` (String; optional): The data value. Either the latest, or the concatenated depending on the `concat` property.
+- `worker_threshold` (Real; optional): Frames of at least this many characters are parsed in a Web Worker
+instead of the main thread. Off by default.
 """
 function sse(; kwargs...)
-        available_props = Symbol[:id, :concat, :done, :options, :update_component, :url, :value]
+        available_props = Symbol[:id, :concat, :done, :max_flush_rate, :options, :update_component, :url, :value, :worker_threshold]
         wild_props = Symbol[]
         return Component("sse", "SSE", "dash_event_callback", available_props, wild_props; kwargs...)
 end
@@ -29,6 +29,16 @@ export type Props = DashComponentProps & {
    * A boolean indicating if the strea, should update components.
    */
   update_component?: boolean;
+  /**
+   * Maximum number of times per second the streamed updates are applied to
+   * the components. By default they are applied once per animation frame.
+   */
+  max_flush_rate?: number;
+  /**
+   * Frames of at least this many characters are parsed in a Web Worker
+   * instead of the main thread. Off by default.
+   */
+  worker_threshold?: number;
 };
 
 /**
@@ -1,6 +1,8 @@
-import React, { useEffect, useState } from 'react';
+import React, { useEffect, useRef } from 'react';
 import { SSE as SSEjs, SSEvent } from 'sse.js';
 import { Props as BaseProps } from '../components/SSE'; // reuse the interface
+import { getMultiplexer, newStreamId } from './multiplex';
+import { parseFrame } from './parser';
 
 declare global {
   interface Window {
@@ -14,102 +16,357 @@ interface Props extends BaseProps {
   update_component?: any;
 }
 
-const SSE = ({
-  url,
-  options,
-  concat = true,
-  setProps,
-  done,
-  update_component,
-}: Props) => {
-  const [data, setData] = useState<string>('');
-  const [doneData, setDoneData] = useState<boolean>(done || false);
+const MAX_RECONNECTS = 5;
+
+type PatchOp = [op: 'set' | 'append' | 'del', path: (string | number)[], value?: any];
+
+// Return a copy of `target` with `op` applied at `path`, untouched branches are shared.
+const applyAt = (target: any, path: (string | number)[], op: PatchOp): any => {
+  const [kind, , value] = op;
+  if (path.length === 0) {
+    if (kind === 'append') {
+      return [...(Array.isArray(target) ? target : []), ...value];
+    }
+    return value;
+  }
+
+  const [key, ...rest] = path;
+  const copy = Array.isArray(target) ? [...target] : { ...(target ?? {}) };
+  if (rest.length === 0 && kind === 'del') {
+    if (Array.isArray(copy)) {
+      copy.splice(key as number, 1);
+    } else {
+      delete copy[key];
+    }
+    return copy;
+  }
+  copy[key] = applyAt(copy[key], rest, op);
+  return copy;
+};
+
+const applyPatch = (target: any, ops: PatchOp[]): any =>
+  ops.reduce((value, op) => applyAt(value, op[1], op), target);
+
+const componentKey = (componentId: any): string =>
+  typeof componentId === 'string'
+    ? componentId
+    : JSON.stringify(componentId, Object.keys(componentId).sort());
+
+const propKey = (componentId: any, prop: string): string => `${componentKey(componentId)}.${prop}`;
+
+// Props whose updates add to the current value, they are never merged.
+const ACCUMULATING_PROPS = new Set(['rowTransaction', 'sendNotifications', 'extendData', 'prependData']);
+
+type Batch = Map<string, { id: any; props: Record<string, any> }>;
+
+/**
+ * Component updates waiting for the next animation frame (or for `maxRate`
+ * flushes per second). Updates of the same component prop are merged, so a
+ * fast stream costs one Dash render per frame instead of one per message.
+ */
+class UpdateQueue {
+  private batches: Batch[] = [new Map()];
+  private lastFlush = -Infinity;
+  private timer?: ReturnType<typeof setTimeout>;
+  private frame?: number;
+
+  // `isCurrent` tells whether the updates still belong to the stream the component shows.
+  constructor(private maxRate?: number, private isCurrent: () => boolean = () => true) {}
+
+  push(componentId: any, props: Record<string, any>) {
+    const key = componentKey(componentId);
+    let batch = this.batches[this.batches.length - 1];
+    const pending = batch.get(key);
+    if (pending && Object.keys(props).some((prop) => ACCUMULATING_PROPS.has(prop) && prop in pending.props)) {
+      // Both updates have to be applied, the second one in a later set_props.
+      batch = new Map();
+      this.batches.push(batch);
+    }
+    const entry = batch.get(key);
+    if (entry) {
+      Object.assign(entry.props, props);
+    } else {
+      batch.set(key, { id: componentId, props: { ...props } });
+    }
+    this.schedule();
+  }
+
+  private schedule() {
+    if (this.timer !== undefined || this.frame !== undefined) {
+      return;
+    }
+    const wait = this.maxRate ? this.lastFlush + 1000 / this.maxRate - performance.now() : 0;
+    if (wait > 0) {
+      this.timer = setTimeout(() => {
+        this.timer = undefined;
+        this.frame = requestAnimationFrame(() => this.flush());
+      }, wait);
+    } else {
+      this.frame = requestAnimationFrame(() => this.flush());
+    }
+  }
+
+  private cancel() {
+    clearTimeout(this.timer);
+    if (this.frame !== undefined) {
+      cancelAnimationFrame(this.frame);
+    }
+    this.timer = this.frame = undefined;
+  }
+
+  // Drop the queued updates, e.g. of a stream that was replaced or cancelled.
+  discard() {
+    this.cancel();
+    this.batches = [new Map()];
+  }
+
+  flush() {
+    this.cancel();
+    this.lastFlush = performance.now();
+
+    const batches = this.batches;
+    this.batches = [new Map()];
+    const dashSetProps = window.dash_clientside?.set_props;
+    if (!dashSetProps || !this.isCurrent()) {
+      return;
+    }
+    batches.forEach((batch) => batch.forEach(({ id, props }) => dashSetProps(id, props)));
+  }
+}
+
+// sse.js doesn't expose the `retry` field of an event, read it from the raw event chunk.
+const readRetry = (source: SSEjs) => {
+  const parse = (source as any)._parseEventChunk;
+  (source as any)._parseEventChunk = function (chunk: string) {
+    const event = parse.call(this, chunk);
+    const retry = /^retry:\s?(\d+)\s*$/m.exec(chunk ?? '');
+    if (event && retry) {
+      event.retry = Number(retry[1]);
+    }
+    return event;
+  };
+};
+
+// Identifies a stream: a new invocation (or url) opens a new connection, any other prop change doesn't.
+const streamIdentity = (url?: string, options?: any): string | undefined => {
+  if (!url) {
+    return undefined;
+  }
+  return `${url}|${options?.invocation ?? JSON.stringify(options ?? {})}`;
+};
+
+const SSE = (props: Props) => {
+  // The connection reads the current props when it needs them, they are not effect dependencies.
+  const latest = useRef(props);
+  latest.current = props;
+  const identity = streamIdentity(props.url, props.options);
 
   useEffect(() => {
-    // Reset on URL change.
-    setDoneData(false);
-    setData('');
+    const { url, options, update_component, max_flush_rate, worker_threshold } = latest.current;
     if (!url) {
       return;
     }
-    // Instantiate EventSource.
-    const sse = new SSEjs(url, options);
-    sse.onmessage = (e: SSEvent) => {
-      // Handle end of stream.
-      if (e.data === '[DONE]') {
-        setDoneData(true);
-        sse.close();
+    // Only a component that reported the end of a stream has to be told about the next one.
+    if (latest.current.done) {
+      latest.current.setProps?.({ done: false });
+    }
+    // Last value of every prop received as [PATCH] on this connection.
+    const shadow = new Map<string, any>();
+    // Resumable streams number their frames, a dropped connection continues after the last one.
+    let lastEventId: string | undefined;
+    let retryDelay = 1000;
+    let retries = 0;
+    let closed = false;
+    let reconnectTimer: ReturnType<typeof setTimeout> | undefined;
+    let sse: SSEjs | undefined;
+    // Set when the stream runs over the tab's shared connection.
+    const multiplex: string | undefined = (options as any)?.multiplex;
+    let stopMultiplexed: ((cancel: boolean) => void) | undefined;
+    // The url is unset (e.g. by a cancel callback) before the effect is cleaned up.
+    const updates = new UpdateQueue(
+      max_flush_rate,
+      () => streamIdentity(latest.current.url, latest.current.options) === identity
+    );
+    let backlog: Promise<void> = Promise.resolve();
+    let backlogSize = 0;
+
+    // `cancel` stops a multiplexed stream on the server, a dedicated connection stops it by closing.
+    const close = (cancel = false) => {
+      if (closed) {
         return;
       }
-      // If update_component is set, try to parse and update Dash component
-      const dashSetProps = window.dash_clientside?.set_props;
-      if (update_component && dashSetProps) {
+      closed = true;
+      clearTimeout(reconnectTimer);
+      if (stopMultiplexed) {
+        stopMultiplexed(cancel);
+      } else {
+        sse?.close();
+      }
+    };
+
+    const reconnect = (current: SSEjs) => {
+      if (current !== sse || closed || reconnectTimer) {
+        return;
+      }
+      if (!lastEventId || retries >= MAX_RECONNECTS) {
+        close();
+        return;
+      }
+      retries += 1;
+      reconnectTimer = setTimeout(() => {
+        reconnectTimer = undefined;
+        connect();
+      }, retryDelay * retries);
+    };
+
+    const connect = () => {
+      const headers = lastEventId
+        ? { ...options?.headers, 'Last-Event-ID': lastEventId }
+        : options?.headers;
+      const current = new SSEjs(url, { ...options, headers });
+      readRetry(current);
+      sse = current;
+      current.onerror = (e: Event) => {
+        console.log('SSE connection error', e);
+        reconnect(current);
+      };
+      current.addEventListener('readystatechange', (e: any) => {
+        // 2 = CLOSED, the response ended without [DONE] or an [ERROR]
+        if (e.readyState === 2) {
+          reconnect(current);
+        }
+      });
+      current.onmessage = (e: SSEvent) => onMessage(e);
+    };
+
+    const onMessage = (e: SSEvent) => {
+      const event = e as SSEvent & { id?: string; retry?: number };
+      if (event.id) {
+        lastEventId = event.id;
+        retries = 0;
+      }
+      if (event.retry) {
+        retryDelay = event.retry;
+      }
+      // sse.js delivers comments (the server's heartbeats) and the events that only
+      // set the id or the reconnect delay as messages without data.
+      if (!e.data) {
+        return;
+      }
+      // If update_component is set, parse the frame to queue its component updates
+      const parsed =
+        e.data !== '[DONE]' && update_component && window.dash_clientside?.set_props
+          ? parseFrame(e.data, worker_threshold)
+          : undefined;
+      if (!backlogSize && !(parsed instanceof Promise)) {
         try {
-          const msg = JSON.parse(e.data);
-          if (Array.isArray(msg)) {
-            const [stream_type, componentId, props] = msg
-
-            switch (stream_type) {
-              case '[ERROR]':
-                if (props.handle_error) {
-                  window.alert(`Error from SSE stream: ${props.error}`);
-                }
-
-                if (props.reset_props) {
-                  props.reset_props.forEach((item: any) => {
-                    if (Array.isArray(item) && item.length === 2) {
-                      const [compId, compProps] = item;
-                      dashSetProps(compId, compProps);
-                    }
-                  });
-                }
-                sse.close()
-                break;
-
-              case '[SINGLE]':
-                dashSetProps(componentId, props);
-                break;
-
-              case '[BATCH]':
-                // For batch, we expect props to be a list of list of [componentId, props]
-                if (Array.isArray(props)) {
-                  props.forEach((item: any) => {
-                    if (Array.isArray(item) && item.length === 2) {
-                      const [compId, compProps] = item;
-                      dashSetProps(compId, compProps);
-                    }
-                  });
-                }
-                break;
-
-              default:
-                console.warn('Unknown stream type:', stream_type);
-            }
-          }
+          handle(e.data, parsed);
         } catch (err) {
-          // Not a JSON message, ignore
-          console.log("Not a JSON message, ignoring for update_component", e.data)
+          console.log('Could not apply SSE message', err);
         }
+        return;
       }
+      // Frames parsed in the worker finish later, the frames after them wait.
+      backlogSize += 1;
+      backlog = backlog
+        .then(() => parsed)
+        .then((msg) => handle(e.data, msg))
+        .catch((err) => console.log('Could not apply SSE message', err))
+        .finally(() => {
+          backlogSize -= 1;
+        });
     };
-    sse.onerror = (e: Event) => {
-      console.log('Unhandled SSE ERROR', e);
-      sse.close();
-    };
-    // Close on unmount.
-    return () => {
-      sse.close();
-    };
-  }, [url, options, concat]);
 
-  useEffect(() => {
-    if (setProps) {
-      setProps({
-        value: data,
-        done: doneData,
+    const handle = (data: string, msg: any) => {
+      if (closed) {
+        return;
+      }
+      // Handle end of stream, the last updates are applied right away.
+      if (data === '[DONE]') {
+        updates.flush();
+        latest.current.setProps?.({ done: true });
+        close();
+        return;
+      }
+      if (!Array.isArray(msg)) {
+        return;
+      }
+      const [stream_type, componentId, props] = msg;
+
+      switch (stream_type) {
+        case '[ERROR]':
+          if (props.handle_error) {
+            window.alert(`Error from SSE stream: ${props.error}`);
+          }
+
+          if (props.reset_props) {
+            props.reset_props.forEach((item: any) => {
+              if (Array.isArray(item) && item.length === 2) {
+                const [compId, compProps] = item;
+                updates.push(compId, compProps);
+              }
+            });
+          }
+          updates.flush();
+          close();
+          break;
+
+        case '[SINGLE]':
+          updates.push(componentId, props);
+          break;
+
+        case '[BATCH]':
+          // For batch, we expect props to be a list of list of [componentId, props]
+          if (Array.isArray(props)) {
+            props.forEach((item: any) => {
+              if (Array.isArray(item) && item.length === 2) {
+                const [compId, compProps] = item;
+                updates.push(compId, compProps);
+              }
+            });
+          }
+          break;
+
+        case '[PATCH]':
+          // For patch, props is a list of [componentId, {prop: operations}]
+          if (Array.isArray(props)) {
+            props.forEach((item: any) => {
+              if (Array.isArray(item) && item.length === 2) {
+                const [compId, compOps] = item;
+                const patched: Record<string, any> = {};
+                Object.entries(compOps).forEach(([prop, ops]) => {
+                  const key = propKey(compId, prop);
+                  patched[prop] = applyPatch(shadow.get(key), ops as PatchOp[]);
+                  shadow.set(key, patched[prop]);
+                });
+                updates.push(compId, patched);
+              }
+            });
+          }
+          break;
+
+        default:
+          console.warn('Unknown stream type:', stream_type);
+      }
+    };
+    if (multiplex) {
+      const multiplexer = getMultiplexer(multiplex);
+      const streamId = newStreamId();
+      stopMultiplexed = (cancel) => multiplexer.stop(streamId, cancel);
+      multiplexer.start(url, options, streamId, onMessage).catch((err) => {
+        console.log('SSE connection error', err);
+        close();
       });
+    } else {
+      connect();
     }
-  }, [data, doneData, setProps]);
+    // Close on unmount or for the next stream, its queued updates are stale by then,
+    // e.g. after a cancel callback already applied its `reset_props`.
+    return () => {
+      updates.discard();
+      close(true);
+    };
+  }, [identity]);
 
   return <></>;
 };
@@ -0,0 +1,95 @@
+import { SSE as SSEjs, SSEvent } from 'sse.js';
+
+const TAB_HEADER = 'X-Dash-Multiplex-Tab';
+const STREAM_HEADER = 'X-Dash-Multiplex-Stream';
+const RECONNECT_DELAY = 1000;
+
+type Handler = (e: SSEvent) => void;
+
+// The tab id is all it takes to read a tab's frames, it has to be unguessable.
+// getRandomValues works on plain http as well, unlike crypto.randomUUID.
+export const newStreamId = (): string =>
+  Array.from(crypto.getRandomValues(new Uint8Array(16)), (byte) => byte.toString(16).padStart(2, '0')).join('');
+
+/**
+ * One event stream per tab, shared by all SSE components of the page.
+ * Streams are started with a POST that returns at once, their events
+ * arrive on the shared stream with the stream id as event type.
+ */
+class Multiplexer {
+  private tab = newStreamId();
+  private sse?: SSEjs;
+  private handlers = new Map<string, Handler>();
+
+  constructor(private endpoint: string) {}
+
+  private connect() {
+    if (this.sse) {
+      return;
+    }
+    const sse = new SSEjs(`${this.endpoint}?tab=${this.tab}`, { method: 'GET' });
+    this.handlers.forEach((handler, streamId) => sse.addEventListener(streamId, handler));
+
+    const reopen = () => {
+      if (this.sse !== sse) {
+        return;
+      }
+      this.sse = undefined;
+      sse.close();
+      if (this.handlers.size) {
+        setTimeout(() => this.connect(), RECONNECT_DELAY);
+      }
+    };
+    sse.onerror = reopen;
+    sse.addEventListener('readystatechange', (e: any) => {
+      // 2 = CLOSED
+      if (e.readyState === 2) {
+        reopen();
+      }
+    });
+    this.sse = sse;
+  }
+
+  async start(url: string, options: any, streamId: string, handler: Handler) {
+    this.handlers.set(streamId, handler);
+    this.connect();
+    this.sse?.addEventListener(streamId, handler);
+
+    const response = await fetch(url, {
+      method: options?.method ?? 'POST',
+      headers: { ...options?.headers, [TAB_HEADER]: this.tab, [STREAM_HEADER]: streamId },
+      body: options?.payload,
+      credentials: options?.withCredentials ? 'include' : 'same-origin',
+    });
+    if (!response.ok) {
+      throw new Error(`Could not start stream: ${response.status}`);
+    }
+  }
+
+  stop(streamId: string, cancel: boolean) {
+    const handler = this.handlers.get(streamId);
+    if (!handler) {
+      return;
+    }
+    this.handlers.delete(streamId);
+    this.sse?.removeEventListener(streamId, handler);
+    if (cancel) {
+      fetch(`${this.endpoint}/cancel`, {
+        method: 'POST',
+        headers: { 'Content-Type': 'application/json' },
+        body: JSON.stringify({ tab: this.tab, stream: streamId }),
+      }).catch((err) => console.log('Could not cancel stream', err));
+    }
+  }
+}
+
+const multiplexers = new Map<string, Multiplexer>();
+
+export const getMultiplexer = (endpoint: string): Multiplexer => {
+  let multiplexer = multiplexers.get(endpoint);
+  if (!multiplexer) {
+    multiplexer = new Multiplexer(endpoint);
+    multiplexers.set(endpoint, multiplexer);
+  }
+  return multiplexer;
+};
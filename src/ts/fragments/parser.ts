@@ -0,0 +1,90 @@
+// Parses one frame per message, the results are matched to their request by id.
+const WORKER_SOURCE = `
+self.onmessage = (e) => {
+  let result;
+  try {
+    result = { id: e.data.id, msg: JSON.parse(e.data.text) };
+  } catch (err) {
+    result = { id: e.data.id, error: String(err) };
+  }
+  self.postMessage(result);
+};
+`;
+
+type Pending = { resolve: (msg: any) => void; text: string };
+
+/**
+ * A Web Worker that parses large frames off the main thread, shared by all
+ * SSE components of the page. Falls back to `JSON.parse` if workers are not
+ * available (e.g. blocked by a Content Security Policy).
+ */
+class JsonWorker {
+  private worker?: Worker;
+  private nextId = 0;
+  private pending = new Map<number, Pending>();
+
+  constructor() {
+    try {
+      const url = URL.createObjectURL(new Blob([WORKER_SOURCE], { type: 'text/javascript' }));
+      this.worker = new Worker(url);
+      this.worker.onmessage = (e: MessageEvent) => this.settle(e.data.id, e.data.msg, e.data.error);
+      this.worker.onerror = () => this.fail();
+    } catch (err) {
+      console.log('Could not start the JSON worker, parsing on the main thread', err);
+    }
+  }
+
+  parse(text: string): Promise<any> {
+    if (!this.worker) {
+      return Promise.resolve(parseNow(text));
+    }
+    const id = this.nextId++;
+    return new Promise((resolve) => {
+      this.pending.set(id, { resolve, text });
+      this.worker!.postMessage({ id, text });
+    });
+  }
+
+  private settle(id: number, msg: any, error?: string) {
+    const pending = this.pending.get(id);
+    if (!pending) {
+      return;
+    }
+    this.pending.delete(id);
+    if (error) {
+      console.log('Not a JSON message, ignoring for update_component', pending.text);
+    }
+    pending.resolve(msg);
+  }
+
+  private fail() {
+    // Parse what is left here and stop using the worker.
+    this.worker?.terminate();
+    this.worker = undefined;
+    this.pending.forEach(({ resolve, text }) => resolve(parseNow(text)));
+    this.pending.clear();
+  }
+}
+
+const parseNow = (text: string): any => {
+  try {
+    return JSON.parse(text);
+  } catch (err) {
+    console.log('Not a JSON message, ignoring for update_component', text);
+    return undefined;
+  }
+};
+
+let jsonWorker: JsonWorker | undefined;
+
+/**
+ * Parse a frame, in the worker if it has at least `threshold` characters.
+ * Frames that can't be parsed result in `undefined`.
+ */
+export const parseFrame = (text: string, threshold?: number): any | Promise<any> => {
+  if (threshold === undefined || threshold === null || text.length < threshold) {
+    return parseNow(text);
+  }
+  jsonWorker = jsonWorker ?? new JsonWorker();
+  return jsonWorker.parse(text);
+};
@@ -0,0 +1,173 @@
+import json
+import threading
+import typing as _t
+import uuid
+
+import dash
+import pytest
+from dash import Input, html
+
+from dash_event_callback import (
+    FrameEncoder,
+    StreamCompression,
+    StreamHeartbeat,
+    StreamLimiter,
+    StreamReplay,
+    StreamRuntime,
+    event_callback,
+)
+from dash_event_callback._event_callback import (
+    SSE_CALLBACK_ENDPOINT,
+    SSE_CANCEL_ENDPOINT,
+    SSECallbackComponent,
+    generate_deterministic_id,
+)
+
+
+def register(func: _t.Callable, **kwargs) -> str:
+    """Register `func` as an event callback with its own input, return its callback id."""
+    dependency = Input(f"{func.__name__}-{uuid.uuid4().hex}", "n_clicks")
+    event_callback(dependency, **kwargs)(func)
+    return generate_deterministic_id(func, (dependency,))
+
+
+def parse_events(body: bytes) -> _t.List[_t.Dict[str, _t.Any]]:
+    """The events of an SSE body as dicts of their fields, `data` decoded from JSON."""
+    events = []
+    for chunk in body.decode().split("\n\n"):
+        fields = {}
+        for line in chunk.splitlines():
+            if line.startswith(":"):
+                continue
+            name, _, value = line.partition(": ")
+            fields[name] = value
+        if "data" in fields:
+            data = fields["data"]
+            fields["data"] = data if data == "[DONE]" else json.loads(data)
+            events.append(fields)
+    return events
+
+
+def last_event_id(body: bytes) -> str | None:
+    """The id of the last event in `body` that has one."""
+    ids = [line[len("id: "):] for line in body.decode().splitlines() if line.startswith("id: ")]
+    return ids[-1] if ids else None
+
+
+def decode(chunk: bytes) -> _t.List[_t.Any]:
+    """The decoded `data: ` frames of an encoded chunk."""
+    return [FrameEncoder.loads(frame[len(b"data: "):]) for frame in chunk.split(b"\n\n") if frame]
+
+
+def apply_ops(value: _t.Any, ops: _t.List[_t.List[_t.Any]]) -> _t.Any:
+    """`value` with the patch operations applied the way the SSE component applies them."""
+
+    def apply_at(target, path, op):
+        kind = op[0]
+        if not path:
+            if kind == "append":
+                return (target if isinstance(target, list) else []) + op[2]
+            return op[2]
+        key, rest = path[0], path[1:]
+        copy = list(target) if isinstance(target, list) else dict(target or {})
+        if not rest and kind == "del":
+            del copy[key]
+        else:
+            copy[key] = apply_at(copy[key] if isinstance(copy, list) else copy.get(key), rest, op)
+        return copy
+
+    for op in ops:
+        value = apply_at(value, op[1], op)
+    return value
+
+
+def props(data: _t.List[_t.Any]) -> _t.List[_t.Tuple[_t.Any, _t.Dict]]:
+    """The props of the [SINGLE] and [BATCH] frames in `data`, in order."""
+    updates = []
+    for frame in data:
+        if frame == "[DONE]":
+            continue
+        token, component_id, payload = frame
+        if token == "[SINGLE]":
+            updates.append((component_id, payload))
+        elif token == "[BATCH]":
+            updates.extend(tuple(update) for update in payload)
+    return updates
+
+
+class Streams:
+    """Requests against the event callback endpoints of a test client."""
+
+    def __init__(self, client):
+        self.client = client
+
+    def open(self, callback_id: str, invocation: str | None = None, headers=None, **inputs):
+        content = {"sse_callback_id": json.dumps(SSECallbackComponent.ids.sse(callback_id)), **inputs}
+        if invocation is not None:
+            content["sse_invocation_id"] = invocation
+        return self.client.post(
+            SSE_CALLBACK_ENDPOINT,
+            json={"content": content},
+            headers={"Accept": "text/event-stream", **(headers or {})},
+            buffered=False,
+        )
+
+    def events(self, callback_id: str, **kwargs) -> _t.List[_t.Dict[str, _t.Any]]:
+        return parse_events(self.open(callback_id, **kwargs).get_data())
+
+    def data(self, callback_id: str, **kwargs) -> _t.List[_t.Any]:
+        return [event["data"] for event in self.events(callback_id, **kwargs)]
+
+    def cancel(self, invocation: str) -> bool:
+        return self.client.post(SSE_CANCEL_ENDPOINT, json={"invocation": invocation}).json["cancelled"]
+
+    def in_background(self, callback_id: str, **kwargs) -> "_t.Callable[[], list]":
+        """Read a stream in a thread, the returned function joins it and returns its data."""
+        result = {}
+
+        def read():
+            result["data"] = self.data(callback_id, **kwargs)
+
+        thread = threading.Thread(target=read)
+        thread.start()
+
+        def join():
+            thread.join(10)
+            return result["data"]
+
+        return join
+
+
+@pytest.fixture(scope="session")
+def app():
+    app = dash.Dash(__name__)
+    app.layout = html.Div()
+    return app
+
+
+@pytest.fixture
+def streams(app):
+    return Streams(app.server.test_client())
+
+
+@pytest.fixture(autouse=True)
+def reset_configuration():
+    limiter = {
+        name: getattr(StreamLimiter, name)
+        for name in ("max_streams", "max_streams_per_callback", "max_queued", "max_wait")
+    }
+    compression = {name: getattr(StreamCompression, name) for name in ("enabled", "min_size", "level")}
+    encoder = FrameEncoder.backend
+    heartbeat = StreamHeartbeat.interval
+    replay = {name: getattr(StreamReplay, name) for name in ("backend", "resume_timeout", "retry")}
+    step_workers = StreamRuntime.step_workers
+    yield
+    for name, value in limiter.items():
+        setattr(StreamLimiter, name, value)
+    for name, value in compression.items():
+        setattr(StreamCompression, name, value)
+    FrameEncoder.configure(encoder)
+    StreamHeartbeat.interval = heartbeat
+    for name, value in replay.items():
+        setattr(StreamReplay, name, value)
+    StreamRuntime.step_workers = step_workers
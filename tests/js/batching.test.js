@@ -0,0 +1,48 @@
+const test = require('node:test');
+const assert = require('node:assert');
+const { render, reset, sleep, frame, calls, xhrs } = require('./harness');
+
+test('updates of a frame are merged into one set_props per component', async () => {
+  reset();
+  render({ url: '/stream', options: { invocation: 'a' }, update_component: true });
+  const xhr = xhrs[xhrs.length - 1];
+  for (let i = 0; i < 5; i++) {
+    xhr.feed(frame(['[SINGLE]', 'out', { children: i, title: 'latest' }]));
+  }
+  xhr.feed(frame(['[SINGLE]', 'grid', { rowTransaction: { add: [1] } }]));
+  xhr.feed(frame(['[SINGLE]', 'grid', { rowTransaction: { add: [2] } }]));
+  assert.deepStrictEqual(calls, []);
+  await sleep(50);
+
+  // Accumulating props are never merged, the second update is applied after the first.
+  assert.deepStrictEqual(calls, [
+    ['out', { children: 4, title: 'latest' }],
+    ['grid', { rowTransaction: { add: [1] } }],
+    ['grid', { rowTransaction: { add: [2] } }],
+  ]);
+});
+
+test('max_flush_rate limits how often updates are applied', async () => {
+  reset();
+  render({ url: '/stream', options: { invocation: 'b' }, update_component: true, max_flush_rate: 2 });
+  const xhr = xhrs[xhrs.length - 1];
+  xhr.feed(frame(['[SINGLE]', 'out', { children: 0 }]));
+  await sleep(50);
+  xhr.feed(frame(['[SINGLE]', 'out', { children: 1 }]));
+  xhr.feed(frame(['[SINGLE]', 'out', { children: 2 }]));
+  // The next flush is due 500ms after the first one.
+  await sleep(200);
+  assert.deepStrictEqual(calls, [['out', { children: 0 }]]);
+
+  await sleep(600);
+  assert.deepStrictEqual(calls, [['out', { children: 0 }], ['out', { children: 2 }]]);
+});
+
+test('[DONE] applies the queued updates right away', () => {
+  reset();
+  render({ url: '/stream', options: { invocation: 'c' }, update_component: true, max_flush_rate: 1 });
+  const xhr = xhrs[xhrs.length - 1];
+  xhr.feed(frame(['[SINGLE]', 'out', { children: 'last' }]));
+  xhr.feed('data: [DONE]\n\n');
+  assert.deepStrictEqual(calls, [['out', { children: 'last' }]]);
+});
@@ -0,0 +1,143 @@
+// Stand-ins for the browser, React and the webpack runtime, to run the
+// shipped async-SSE chunk in node: `node --test tests/js`.
+const fs = require('fs');
+const path = require('path');
+
+const BUNDLE = path.resolve(__dirname, '../../dash_event_callback/async-SSE.js');
+
+// set_props calls of the component, as [componentId, props]
+const calls = [];
+// console.log/warn calls of the component
+const logs = [];
+// Every XMLHttpRequest the component opened, the last one is the current connection.
+const xhrs = [];
+// Props the component set on itself
+const own = [];
+
+global.self = global;
+global.window = global;
+global.requestAnimationFrame = (cb) => setTimeout(() => cb(performance.now()), 16);
+global.cancelAnimationFrame = (id) => clearTimeout(id);
+global.alert = (message) => logs.push(['alert', message]);
+global.dash_clientside = {
+  set_props: (id, props) => calls.push([id, JSON.parse(JSON.stringify(props))]),
+};
+console.log = (...args) => logs.push(['log', ...args]);
+console.warn = (...args) => logs.push(['warn', ...args]);
+
+class FakeXHR {
+  constructor() {
+    this.listeners = {};
+    this.status = 200;
+    this.responseText = '';
+    this.readyState = 0;
+    this.headers = {};
+    xhrs.push(this);
+  }
+  addEventListener(type, listener) {
+    (this.listeners[type] = this.listeners[type] || []).push(listener);
+  }
+  open(method, url) {
+    this.method = method;
+    this.url = url;
+  }
+  setRequestHeader(key, value) {
+    this.headers[key] = value;
+  }
+  send(payload) {
+    this.payload = payload;
+    this.readyState = 2;
+    this.fire('readystatechange');
+  }
+  getAllResponseHeaders() {
+    return 'content-type: text/event-stream';
+  }
+  abort() {
+    this.aborted = true;
+    this.fire('abort');
+  }
+  fire(type) {
+    (this.listeners[type] || []).forEach((listener) => listener({ currentTarget: this }));
+  }
+  // Receive `text` as the next part of the response body.
+  feed(text) {
+    this.responseText += text;
+    this.fire('progress');
+  }
+  end() {
+    this.readyState = 4;
+    this.fire('load');
+  }
+}
+FakeXHR.HEADERS_RECEIVED = 2;
+global.XMLHttpRequest = FakeXHR;
+
+// A single component instance: refs persist, the effect reruns when its dependencies change.
+const refs = [];
+let refIndex = 0;
+let effect = { deps: undefined, cleanup: undefined };
+const React = {
+  createElement: () => null,
+  Fragment: 'fragment',
+  useRef: (value) => {
+    const index = refIndex++;
+    if (!(index in refs)) {
+      refs[index] = { current: value };
+    }
+    return refs[index];
+  },
+  useEffect: (fn, deps) => {
+    if (effect.deps && deps.every((dep, i) => dep === effect.deps[i])) {
+      return;
+    }
+    if (effect.cleanup) {
+      effect.cleanup();
+    }
+    effect = { deps, cleanup: fn() };
+  },
+};
+
+// Load the chunk like the main bundle does, modules it doesn't contain are React.
+self.webpackChunkdash_event_callback = [];
+eval(fs.readFileSync(BUNDLE, 'utf8'));
+const modules = {};
+self.webpackChunkdash_event_callback.forEach(([, chunkModules]) => Object.assign(modules, chunkModules));
+const cache = {};
+const require_ = (id) => {
+  if (!(id in modules)) {
+    return React;
+  }
+  if (!cache[id]) {
+    cache[id] = { exports: {} };
+    modules[id](cache[id], cache[id].exports, require_);
+  }
+  return cache[id].exports;
+};
+require_.r = (exports) => Object.defineProperty(exports, '__esModule', { value: true });
+require_.d = (exports, definitions) =>
+  Object.keys(definitions).forEach((key) =>
+    Object.defineProperty(exports, key, { enumerable: true, get: definitions[key] })
+  );
+require_.n = (module) => () => module;
+const entry = Object.keys(modules).find((id) => String(modules[id]).includes('update_component'));
+const SSE = require_(entry).default;
+
+const render = (props) => {
+  refIndex = 0;
+  SSE({ ...props, setProps: (update) => own.push(update) });
+};
+const unmount = () => {
+  if (effect.cleanup) {
+    effect.cleanup();
+  }
+  effect = { deps: undefined, cleanup: undefined };
+};
+const sleep = (ms) => new Promise((resolve) => setTimeout(resolve, ms));
+// An SSE frame of `msg`, `fields` are added before its data line.
+const frame = (msg, fields = '') => `${fields}data: ${JSON.stringify(msg)}\n\n`;
+const reset = () => {
+  unmount();
+  calls.length = logs.length = own.length = 0;
+};
+
+module.exports = { render, unmount, reset, sleep, frame, calls, logs, xhrs, own, refs };
@@ -0,0 +1,16 @@
+const test = require('node:test');
+const assert = require('node:assert');
+const { render, reset, sleep, frame, calls, logs, xhrs } = require('./harness');
+
+test('heartbeats update nothing and log nothing', async () => {
+  reset();
+  render({ url: '/stream', options: { invocation: 'a' }, update_component: true });
+  const xhr = xhrs[xhrs.length - 1];
+  xhr.feed(': ping\n\n');
+  xhr.feed(frame(['[SINGLE]', 'out', { children: 1 }]));
+  xhr.feed(': ping\n\n: ping\n\n');
+  await sleep(50);
+
+  assert.deepStrictEqual(calls, [['out', { children: 1 }]]);
+  assert.deepStrictEqual(logs, []);
+});
@@ -0,0 +1,47 @@
+const test = require('node:test');
+const assert = require('node:assert');
+const { render, reset, sleep, frame, calls, xhrs, own, refs } = require('./harness');
+
+const base = { url: '/stream', options: { invocation: 'a' }, update_component: true };
+
+test('prop changes other than the stream keep the connection', () => {
+  reset();
+  render(base);
+  const count = xhrs.length;
+  render({ ...base, done: false, value: 'x', options: { invocation: 'a' } });
+  assert.strictEqual(xhrs.length, count);
+  assert.ok(!xhrs[count - 1].aborted);
+});
+
+test('a new invocation replaces the stream and drops its queued updates', async () => {
+  reset();
+  render(base);
+  const first = xhrs[xhrs.length - 1];
+  first.feed(frame(['[SINGLE]', 'btn', { disabled: true }]));
+  render({ ...base, options: { invocation: 'b' } });
+
+  assert.ok(first.aborted);
+  assert.notStrictEqual(xhrs[xhrs.length - 1], first);
+  await sleep(50);
+  assert.deepStrictEqual(calls, []);
+});
+
+test('updates are dropped once the url is unset, before the effect cleanup', async () => {
+  reset();
+  render(base);
+  xhrs[xhrs.length - 1].feed(frame(['[SINGLE]', 'btn', { disabled: true }]));
+  refs[0].current = { ...refs[0].current, url: null };
+  await sleep(50);
+  assert.deepStrictEqual(calls, []);
+});
+
+test('only a component that reported [DONE] is told about the next stream', () => {
+  reset();
+  render({ ...base, options: { invocation: 'c' } });
+  assert.deepStrictEqual(own, []);
+  xhrs[xhrs.length - 1].feed('data: [DONE]\n\n');
+  assert.deepStrictEqual(own, [{ done: true }]);
+
+  render({ ...base, options: { invocation: 'd' }, done: true });
+  assert.deepStrictEqual(own, [{ done: true }, { done: false }]);
+});
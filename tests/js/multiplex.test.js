@@ -0,0 +1,27 @@
+const test = require('node:test');
+const assert = require('node:assert');
+const { render, reset, sleep, frame, calls, xhrs } = require('./harness');
+
+test('multiplexed streams arrive tagged on the tab stream', async () => {
+  reset();
+  const posts = [];
+  global.fetch = async (url, init) => {
+    posts.push([url, init]);
+    return { ok: true };
+  };
+  render({ url: '/stream', options: { invocation: 'a', multiplex: '/mux', payload: '{}' }, update_component: true });
+  const mux = xhrs[xhrs.length - 1];
+  await sleep(0);
+
+  // The tab and stream ids come from crypto.getRandomValues.
+  const tab = new URL(mux.url, 'http://localhost').searchParams.get('tab');
+  const { 'X-Dash-Multiplex-Tab': tabHeader, 'X-Dash-Multiplex-Stream': stream } = posts[0][1].headers;
+  assert.match(tab, /^[0-9a-f]{32}$/);
+  assert.match(stream, /^[0-9a-f]{32}$/);
+  assert.strictEqual(tabHeader, tab);
+
+  mux.feed(`event: other\n` + frame(['[SINGLE]', 'other', { v: 0 }]));
+  mux.feed(`event: ${stream}\n` + frame(['[SINGLE]', 'out', { v: 1 }]));
+  mux.feed(`event: ${stream}\ndata: [DONE]\n\n`);
+  assert.deepStrictEqual(calls, [['out', { v: 1 }]]);
+});
@@ -0,0 +1,24 @@
+const test = require('node:test');
+const assert = require('node:assert');
+const { render, reset, frame, calls, own, xhrs } = require('./harness');
+
+test('[PATCH] frames rebuild the value of the prop', () => {
+  reset();
+  render({ url: '/stream', options: { invocation: 'a' }, update_component: true });
+  const xhr = xhrs[xhrs.length - 1];
+  xhr.feed(frame(['[PATCH]', null, [['store', { data: [['set', [], { rows: [1, 2], meta: { v: 1 } }]] }]]]));
+  xhr.feed(frame(['[PATCH]', null, [['store', { data: [['append', ['rows'], [3]], ['del', ['meta']]] }]]]));
+  xhr.feed(frame(['[PATCH]', null, [['store', { data: [['set', ['rows', 0], 0]] }]]]));
+  xhr.feed('data: [DONE]\n\n');
+
+  assert.deepStrictEqual(calls, [['store', { data: { rows: [0, 2, 3] } }]]);
+  assert.deepStrictEqual(own, [{ done: true }]);
+});
+
+test('every connection starts from an empty value', () => {
+  reset();
+  render({ url: '/stream', options: { invocation: 'b' }, update_component: true });
+  xhrs[xhrs.length - 1].feed(frame(['[PATCH]', null, [['store', { data: [['append', [], [1]]] }]]]));
+  xhrs[xhrs.length - 1].feed('data: [DONE]\n\n');
+  assert.deepStrictEqual(calls, [['store', { data: [1] }]]);
+});
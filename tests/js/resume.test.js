@@ -0,0 +1,35 @@
+const test = require('node:test');
+const assert = require('node:assert');
+const { render, reset, sleep, frame, calls, logs, xhrs } = require('./harness');
+
+test('a dropped resumable stream reconnects after its last event id', async () => {
+  reset();
+  render({ url: '/stream', options: { invocation: 'a' }, update_component: true });
+  const xhr = xhrs[xhrs.length - 1];
+  xhr.feed('retry: 100\n\n' + frame(['[SINGLE]', 'out', { children: 1 }]) + 'id: s.1\n\n');
+  xhr.feed(frame(['[SINGLE]', 'out', { children: 2 }]) + 'id: s.2\n\n');
+  const opened = xhrs.length;
+  xhr.end();
+
+  await sleep(50);
+  assert.strictEqual(xhrs.length, opened);
+  await sleep(100);
+  assert.strictEqual(xhrs.length, opened + 1);
+  assert.strictEqual(xhrs[opened].headers['Last-Event-ID'], 's.2');
+
+  xhrs[opened].feed(frame(['[SINGLE]', 'out', { children: 3 }]) + 'id: s.3\n\ndata: [DONE]\n\n');
+  await sleep(50);
+  assert.deepStrictEqual(calls[calls.length - 1], ['out', { children: 3 }]);
+  assert.deepStrictEqual(logs, []);
+});
+
+test('a stream without event ids is not reconnected', async () => {
+  reset();
+  render({ url: '/stream', options: { invocation: 'b' }, update_component: true });
+  const xhr = xhrs[xhrs.length - 1];
+  xhr.feed(frame(['[SINGLE]', 'out', { children: 1 }]));
+  const opened = xhrs.length;
+  xhr.end();
+  await sleep(1100);
+  assert.strictEqual(xhrs.length, opened);
+});
@@ -0,0 +1,34 @@
+const test = require('node:test');
+const assert = require('node:assert');
+const { render, reset, sleep, frame, calls, xhrs } = require('./harness');
+
+// Answers every message after `delay` ms, like a busy worker thread.
+const parsed = [];
+global.Worker = class {
+  constructor(url) {
+    this.url = url;
+  }
+  postMessage({ id, text }) {
+    parsed.push(text.length);
+    setTimeout(() => this.onmessage({ data: { id, msg: JSON.parse(text) } }), 30);
+  }
+  terminate() {}
+};
+
+test('large frames are parsed in the worker, in order with the small ones', async () => {
+  reset();
+  render({ url: '/stream', options: { invocation: 'a' }, update_component: true, worker_threshold: 100 });
+  const xhr = xhrs[xhrs.length - 1];
+  const large = Array.from({ length: 50 }, (_, i) => i);
+  xhr.feed(frame(['[SINGLE]', 'grid', { rowTransaction: { add: large } }]));
+  xhr.feed(frame(['[SINGLE]', 'grid', { rowTransaction: { add: [50] } }]));
+  xhr.feed('data: [DONE]\n\n');
+  await sleep(100);
+
+  assert.strictEqual(parsed.length, 1);
+  assert.ok(parsed[0] >= 100);
+  assert.deepStrictEqual(calls, [
+    ['grid', { rowTransaction: { add: large } }],
+    ['grid', { rowTransaction: { add: [50] } }],
+  ]);
+});
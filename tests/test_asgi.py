@@ -0,0 +1,165 @@
+import asyncio
+import json
+
+from dash_event_callback import make_asgi_app, stream_props
+from dash_event_callback._event_callback import (
+    SSE_CALLBACK_ENDPOINT,
+    SSE_CANCEL_ENDPOINT,
+    SSECallbackComponent,
+)
+
+from conftest import parse_events, props, register
+
+
+async def fallback(scope, receive, send):
+    await send({"type": "http.response.start", "status": 204, "headers": []})
+    await send({"type": "http.response.body", "body": b""})
+
+
+async def request(app, method, path, body=None, headers=(), disconnect_after=None):
+    """Send one request to the ASGI `app`, return its status, headers and body."""
+    sent = False
+    disconnect = asyncio.Event()
+    response = {"status": None, "headers": {}, "body": b""}
+
+    async def receive():
+        nonlocal sent
+        if not sent:
+            sent = True
+            return {"type": "http.request", "body": json.dumps(body).encode() if body is not None else b""}
+        await disconnect.wait()
+        return {"type": "http.disconnect"}
+
+    async def send(message):
+        if message["type"] == "http.response.start":
+            response["status"] = message["status"]
+            response["headers"] = {key.decode(): value.decode() for key, value in message["headers"]}
+        else:
+            response["body"] += message.get("body", b"")
+            if disconnect_after and response["body"].count(b"\n\n") >= disconnect_after:
+                disconnect.set()
+
+    scope = {
+        "type": "http",
+        "method": method,
+        "path": path,
+        "query_string": b"",
+        "headers": [(key.encode(), value.encode()) for key, value in headers],
+    }
+    await app(scope, receive, send)
+    disconnect.set()
+    return response
+
+
+def stream_request(callback_id, **inputs):
+    content = {"sse_callback_id": json.dumps(SSECallbackComponent.ids.sse(callback_id)), **inputs}
+    return {"content": content}
+
+
+def test_streams_on_the_servers_loop():
+    loops = []
+
+    async def counter(n_clicks):
+        loops.append(asyncio.get_running_loop())
+        for i in range(3):
+            yield stream_props("out", {"children": i})
+
+    app = make_asgi_app(fallback)
+    body = stream_request(register(counter), n_clicks=1)
+
+    async def run():
+        response = await request(
+            app, "POST", SSE_CALLBACK_ENDPOINT, body, [("accept", "text/event-stream")]
+        )
+        return response, asyncio.get_running_loop()
+
+    response, loop = asyncio.run(run())
+    assert response["status"] == 200
+    assert response["headers"]["content-type"] == "text/event-stream"
+    assert loops == [loop]
+    data = [event["data"] for event in parse_events(response["body"])]
+    assert props(data) == [("out", {"children": i}) for i in range(3)]
+
+
+def test_sync_generators():
+    def counter(n_clicks):
+        for i in range(n_clicks):
+            yield stream_props("out", {"children": i})
+
+    app = make_asgi_app(fallback)
+    response = asyncio.run(
+        request(
+            app,
+            "POST",
+            SSE_CALLBACK_ENDPOINT,
+            stream_request(register(counter), n_clicks=2),
+            [("accept", "text/event-stream")],
+        )
+    )
+    data = [event["data"] for event in parse_events(response["body"])]
+    assert props(data) == [("out", {"children": 0}), ("out", {"children": 1})]
+
+
+def test_other_requests_go_to_the_fallback():
+    app = make_asgi_app(fallback)
+    assert asyncio.run(request(app, "GET", "/"))["status"] == 204
+    assert asyncio.run(request(app, "GET", SSE_CALLBACK_ENDPOINT))["status"] == 204
+
+
+def test_routes_pathname_prefix():
+    async def counter(n_clicks):
+        yield stream_props("out", {"children": 0})
+
+    app = make_asgi_app(fallback, routes_pathname_prefix="/app/")
+    body = stream_request(register(counter), n_clicks=1)
+    headers = [("accept", "text/event-stream")]
+    assert asyncio.run(request(app, "POST", SSE_CALLBACK_ENDPOINT, body, headers))["status"] == 204
+    response = asyncio.run(request(app, "POST", "/app" + SSE_CALLBACK_ENDPOINT, body, headers))
+    assert response["status"] == 200
+
+
+def test_rejects_requests_not_accepting_event_streams():
+    async def counter(n_clicks):
+        yield stream_props("out", {"children": 0})
+
+    app = make_asgi_app(fallback)
+    body = stream_request(register(counter), n_clicks=1)
+    headers = [("accept", "application/json")]
+    assert asyncio.run(request(app, "POST", SSE_CALLBACK_ENDPOINT, body, headers))["status"] == 400
+
+
+def test_disconnect_stops_the_generator():
+    closed = []
+
+    async def endless(n_clicks):
+        try:
+            while True:
+                yield stream_props("out", {"children": "tick"})
+                await asyncio.sleep(0.01)
+        finally:
+            closed.append(True)
+
+    app = make_asgi_app(fallback)
+    response = asyncio.run(
+        asyncio.wait_for(
+            request(
+                app,
+                "POST",
+                SSE_CALLBACK_ENDPOINT,
+                stream_request(register(endless), n_clicks=1),
+                [("accept", "text/event-stream")],
+                disconnect_after=3,
+            ),
+            5,
+        )
+    )
+    assert len(parse_events(response["body"])) >= 3
+    assert closed == [True]
+
+
+def test_cancel_endpoint():
+    app = make_asgi_app(fallback)
+    response = asyncio.run(request(app, "POST", SSE_CANCEL_ENDPOINT, {"invocation": "unknown"}))
+    assert response["status"] == 200
+    assert json.loads(response["body"]) == {"cancelled": False}
+    assert asyncio.run(request(app, "POST", SSE_CANCEL_ENDPOINT, {}))["status"] == 400
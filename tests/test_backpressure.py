@@ -0,0 +1,89 @@
+import asyncio
+import time
+
+import pytest
+
+from dash_event_callback import Backpressure, stream_props
+from dash_event_callback._backpressure import backpressured
+from dash_event_callback._event_callback import _is_droppable, collapse_frames
+
+from conftest import decode, props, register
+
+
+def test_backpressure_validation():
+    with pytest.raises(ValueError):
+        Backpressure("newest")
+    with pytest.raises(ValueError):
+        Backpressure.latest(0)
+
+
+def test_droppable_frames():
+    assert _is_droppable(stream_props("a", {"value": 1}))
+    assert not _is_droppable(stream_props("grid", {"rowTransaction": {"add": []}}))
+    assert not _is_droppable(b"data: other\n\n")
+
+
+def send(backpressure, frames, delay=0.02, pause=0.0):
+    """Write `frames` every `pause` seconds to a client that takes `delay` per write."""
+    received = []
+
+    async def slow_write(chunk: bytes):
+        await asyncio.sleep(delay)
+        received.extend(decode(bytes(chunk)))
+
+    async def run():
+        async with backpressured(slow_write, backpressure, collapse_frames, _is_droppable) as write:
+            for frame in frames:
+                await write(frame)
+                await asyncio.sleep(pause)
+
+    asyncio.run(run())
+    return received
+
+
+def test_block_sends_everything_in_order():
+    frames = [stream_props("out", {"value": i}) for i in range(10)]
+    assert props(send(Backpressure.block(4), frames)) == [("out", {"value": i}) for i in range(10)]
+
+
+def test_drop_oldest_keeps_the_newest_and_accumulating_updates():
+    # The buffer may be full of updates that can't be dropped, the newest one is kept anyway.
+    frames = []
+    for i in range(20):
+        frames.append(stream_props("out", {"value": i}))
+        if i % 5 == 0:
+            frames.append(stream_props("grid", {"rowTransaction": {"add": [i]}}))
+
+    received = props(send(Backpressure.drop_oldest(3), frames))
+    values = [update["value"] for component_id, update in received if component_id == "out"]
+    assert len(values) < 20
+    assert values == sorted(values) and values[-1] == 19
+    added = [update["rowTransaction"]["add"][0] for component_id, update in received if component_id == "grid"]
+    assert added == [0, 5, 10, 15]
+
+
+def test_latest_collapses_to_the_latest_value():
+    frames = [stream_props([("a", {"value": i}), ("b", {"value": -i})]) for i in range(20)]
+
+    received = props(send(Backpressure.latest(2), frames))
+    assert len(received) < 40
+    latest = dict(received)
+    assert latest == {"a": {"value": 19}, "b": {"value": -19}}
+
+
+def test_fast_clients_get_every_frame():
+    frames = [stream_props("out", {"value": i}) for i in range(10)]
+    received = send(Backpressure.latest(2), frames, delay=0, pause=0.01)
+    assert props(received) == [("out", {"value": i}) for i in range(10)]
+
+
+def test_backpressured_stream_sends_the_last_update(streams):
+    async def ticker(n_clicks):
+        for i in range(5):
+            yield stream_props("out", {"children": i})
+            await asyncio.sleep(0.02)
+
+    started = time.monotonic()
+    data = streams.data(register(ticker, backpressure=Backpressure.latest(4)), n_clicks=1)
+    assert props(data)[-1] == ("out", {"children": 4})
+    assert time.monotonic() - started < 1
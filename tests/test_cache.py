@@ -0,0 +1,129 @@
+import asyncio
+import os
+import time
+
+import pytest
+
+from dash_event_callback import DiskStreamCache, MemoryStreamCache, Pacing, stream_props
+
+from conftest import props, register
+
+
+@pytest.fixture(params=["memory", "disk"])
+def make_cache(request, tmp_path):
+    def make(**kwargs):
+        if request.param == "memory":
+            return MemoryStreamCache(**kwargs)
+        return DiskStreamCache(tmp_path, **kwargs)
+
+    return make
+
+
+def test_cache_round_trip(make_cache):
+    cache = make_cache()
+
+    async def run():
+        assert await cache.get("k") is None
+        await cache.set("k", [b"data: 1\n\n", b"", b"data: 2\n\n"])
+        assert await cache.get("k") == [b"data: 1\n\n", b"", b"data: 2\n\n"]
+        await cache.clear()
+        assert await cache.get("k") is None
+
+    asyncio.run(run())
+
+
+def test_cache_entries_expire(make_cache):
+    cache = make_cache(ttl=0.05)
+
+    async def run():
+        await cache.set("k", [b"frame"])
+        assert await cache.get("k") == [b"frame"]
+        await asyncio.sleep(0.1)
+        assert await cache.get("k") is None
+
+    asyncio.run(run())
+
+
+def test_cache_skips_streams_larger_than_the_cache(make_cache):
+    cache = make_cache(max_bytes=4)
+
+    async def run():
+        await cache.set("k", [b"12345"])
+        assert await cache.get("k") is None
+
+    asyncio.run(run())
+
+
+def test_memory_cache_evicts_the_least_recently_used():
+    cache = MemoryStreamCache(max_bytes=10)
+
+    async def run():
+        await cache.set("a", [b"aaaa"])
+        await cache.set("b", [b"bbbb"])
+        await cache.get("a")
+        await cache.set("c", [b"cccc"])
+        assert await cache.get("b") is None
+        assert await cache.get("a") == [b"aaaa"]
+        assert await cache.get("c") == [b"cccc"]
+
+    asyncio.run(run())
+
+
+def test_disk_cache_evicts_the_oldest_files(tmp_path):
+    cache = DiskStreamCache(tmp_path, max_bytes=60)
+
+    async def run():
+        await cache.set("a", [b"a" * 20])
+        path = cache._path("a")
+        os.utime(path, (time.time() - 60, time.time() - 60))
+        await cache.set("b", [b"b" * 20])
+        assert await cache.get("a") is None
+        assert await cache.get("b") == [b"b" * 20]
+
+    asyncio.run(run())
+
+
+def test_cached_streams_are_replayed_without_the_generator(streams):
+    runs = []
+
+    async def report(n_clicks):
+        runs.append(n_clicks)
+        for i in range(3):
+            yield stream_props("out", {"children": i})
+
+    callback_id = register(report, cache=MemoryStreamCache(paced=False))
+    first = streams.data(callback_id, n_clicks=1)
+    assert streams.data(callback_id, n_clicks=1) == first
+    assert props(first) == [("out", {"children": i}) for i in range(3)]
+    assert runs == [1]
+
+    streams.data(callback_id, n_clicks=2)
+    assert runs == [1, 2]
+
+
+def test_cached_streams_keep_their_pacing(streams):
+    async def report(n_clicks):
+        for i in range(3):
+            yield stream_props("out", {"children": i})
+            await asyncio.sleep(0.1)
+
+    callback_id = register(report, cache=MemoryStreamCache(), pacing=Pacing(interval=0.1, merge=False))
+    streams.data(callback_id, n_clicks=1)
+    started = time.monotonic()
+    replayed = streams.data(callback_id, n_clicks=1)
+    assert time.monotonic() - started >= 0.15
+    assert props(replayed) == [("out", {"children": i}) for i in range(3)]
+
+
+def test_failed_streams_are_not_cached(streams):
+    runs = []
+
+    async def failing(n_clicks):
+        runs.append(n_clicks)
+        yield stream_props("out", {"children": "partial"})
+        raise ValueError("boom")
+
+    callback_id = register(failing, cache=MemoryStreamCache())
+    for _ in range(2):
+        assert streams.data(callback_id, n_clicks=1)[-1][0] == "[ERROR]"
+    assert runs == [1, 1]
@@ -0,0 +1,116 @@
+import asyncio
+import threading
+import time
+import uuid
+
+import pytest
+
+from dash_event_callback import CancelToken, StreamCancelled, cancel_token, stream_props
+
+from conftest import props, register
+
+
+def test_cancel_token():
+    token = CancelToken()
+    assert not token.sleep(0.01)
+    token.cancel()
+    assert token.cancelled
+    assert token.sleep(10)
+    with pytest.raises(StreamCancelled):
+        token.raise_if_cancelled()
+
+
+def test_cancel_token_deadline():
+    token = CancelToken(deadline=time.monotonic() + 0.05)
+    assert 0 < token.remaining() <= 0.05
+    started = time.monotonic()
+    assert token.sleep(10)
+    assert time.monotonic() - started < 1
+    assert token.expired and token.remaining() == 0
+
+
+def test_cancel_stops_the_generator(streams):
+    closed = threading.Event()
+
+    async def endless(n_clicks):
+        try:
+            while True:
+                yield stream_props("out", {"children": "tick"})
+                await asyncio.sleep(0.05)
+        finally:
+            closed.set()
+
+    invocation = uuid.uuid4().hex
+    join = streams.in_background(register(endless), invocation=invocation, n_clicks=1)
+    time.sleep(0.2)
+    assert streams.cancel(invocation)
+    data = join()
+
+    assert closed.wait(2)
+    assert 0 < len(props(data)) < 10
+    assert not streams.cancel(invocation)
+
+
+def test_cancel_wakes_a_sync_generator_waiting_on_its_token(streams):
+    closed = threading.Event()
+
+    def slow(n_clicks):
+        token = cancel_token()
+        try:
+            yield stream_props("out", {"children": "started"})
+            token.sleep(30)
+            token.raise_if_cancelled()
+            yield stream_props("out", {"children": "never"})
+        finally:
+            closed.set()
+
+    invocation = uuid.uuid4().hex
+    join = streams.in_background(register(slow), invocation=invocation, n_clicks=1)
+    time.sleep(0.2)
+    started = time.monotonic()
+    assert streams.cancel(invocation)
+
+    assert closed.wait(2)
+    assert time.monotonic() - started < 1
+    assert props(join()) == [("out", {"children": "started"})]
+
+
+def test_single_flight_cancel_only_detaches(streams):
+    async def shared(n_clicks):
+        for i in range(5):
+            yield stream_props("out", {"children": i})
+            await asyncio.sleep(0.1)
+
+    callback_id = register(shared, single_flight=True)
+    invocation = uuid.uuid4().hex
+    first = streams.in_background(callback_id, invocation=invocation, n_clicks=1)
+    time.sleep(0.1)
+    second = streams.in_background(callback_id, n_clicks=1)
+    time.sleep(0.1)
+    assert streams.cancel(invocation)
+
+    assert "[DONE]" not in first()
+    data = second()
+    assert props(data) == [("out", {"children": i}) for i in range(5)]
+    assert data[-1] == "[DONE]"
+
+
+def test_single_flight_cancel_of_the_last_follower_stops_the_stream(streams):
+    closed = threading.Event()
+
+    async def shared(n_clicks):
+        try:
+            while True:
+                yield stream_props("out", {"children": "tick"})
+                await asyncio.sleep(0.05)
+        finally:
+            closed.set()
+
+    callback_id = register(shared, single_flight=True)
+    invocation = uuid.uuid4().hex
+    join = streams.in_background(callback_id, invocation=invocation, n_clicks=1)
+    time.sleep(0.2)
+    assert streams.cancel(invocation)
+
+    assert "[DONE]" not in join()
+    assert closed.wait(2)
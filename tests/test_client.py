@@ -0,0 +1,13 @@
+import shutil
+import subprocess
+from pathlib import Path
+
+import pytest
+
+
+@pytest.mark.skipif(shutil.which("node") is None, reason="node is not installed")
+def test_client():
+    """The tests of the shipped SSE component in tests/js, run with node."""
+    tests = sorted(str(path) for path in (Path(__file__).parent / "js").glob("*.test.js"))
+    result = subprocess.run(["node", "--test", *tests], capture_output=True, text=True)
+    assert result.returncode == 0, result.stdout + result.stderr
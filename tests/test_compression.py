@@ -0,0 +1,94 @@
+import gzip
+import zlib
+
+import pytest
+
+from dash_event_callback import StreamCompression, stream_props
+from dash_event_callback._compression import GzipFrames, _accepts_gzip
+
+from conftest import parse_events, props, register
+
+
+@pytest.mark.parametrize(
+    "accept_encoding, accepted",
+    [
+        ("gzip", True),
+        ("deflate, gzip;q=0.5", True),
+        ("br, *", True),
+        ("gzip;q=0", False),
+        ("gzip;q=x", False),
+        ("br", False),
+        ("", False),
+        (None, False),
+    ],
+)
+def test_accepts_gzip(accept_encoding, accepted):
+    assert _accepts_gzip(accept_encoding) is accepted
+
+
+def test_every_frame_decodes_on_its_own():
+    frames = GzipFrames(6)
+    decoder = zlib.decompressobj(16 + zlib.MAX_WBITS)
+    chunks = [b"data: " + str(i).encode() * 500 + b"\n\n" for i in range(3)]
+    body = b""
+    for chunk in chunks:
+        compressed = frames.compress(chunk)
+        assert decoder.decompress(compressed) == chunk
+        body += compressed
+    assert gzip.decompress(body + frames.finish()) == b"".join(chunks)
+
+
+def test_negotiate():
+    StreamCompression.configure(min_size=100)
+    assert StreamCompression.negotiate("gzip", b"x" * 100)
+    assert StreamCompression.negotiate("gzip", b"x" * 99) is None
+    assert StreamCompression.negotiate("br", b"x" * 100) is None
+    assert StreamCompression.negotiate("gzip", b": ping\n\n")
+    StreamCompression.configure(enabled=False)
+    assert StreamCompression.negotiate("gzip", b"x" * 100) is None
+
+
+def test_invalid_level():
+    with pytest.raises(ValueError):
+        StreamCompression.configure(level=10)
+
+
+def big_stream(n_clicks):
+    for i in range(3):
+        yield stream_props("out", {"children": "x" * 2000, "i": i})
+
+
+def test_large_streams_are_compressed(streams):
+    StreamCompression.configure(min_size=1024)
+    response = streams.open(register(big_stream), headers={"Accept-Encoding": "gzip"}, n_clicks=1)
+    body = response.get_data()
+
+    assert response.headers["Content-Encoding"] == "gzip"
+    assert response.headers["Vary"] == "Accept-Encoding"
+    assert len(body) < 1000
+    data = [event["data"] for event in parse_events(gzip.decompress(body))]
+    assert [update["i"] for _, update in props(data)] == [0, 1, 2]
+
+
+def test_small_streams_are_not_compressed(streams):
+    StreamCompression.configure(min_size=1024)
+
+    def small(n_clicks):
+        yield stream_props("out", {"children": "x"})
+
+    response = streams.open(register(small), headers={"Accept-Encoding": "gzip"}, n_clicks=1)
+    assert "Content-Encoding" not in response.headers
+    assert props([event["data"] for event in parse_events(response.get_data())]) == [("out", {"children": "x"})]
+
+
+def test_streams_are_not_compressed_without_gzip(streams):
+    StreamCompression.configure(min_size=1024)
+    response = streams.open(register(big_stream), headers={"Accept-Encoding": "br"}, n_clicks=1)
+    assert "Content-Encoding" not in response.headers
+    assert len(parse_events(response.get_data())) == 3
+
+
+def test_compression_is_off_by_default(streams):
+    response = streams.open(register(big_stream), headers={"Accept-Encoding": "gzip"}, n_clicks=1)
+    assert "Content-Encoding" not in response.headers
+    assert "Vary" not in response.headers
@@ -0,0 +1,146 @@
+import json
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from dash_event_callback import GridDiff, stream_dataframe
+
+
+def props(frames):
+    """The props of the [SINGLE] frames of a grid."""
+    return [json.loads(frame[len(b"data: "):])[2] for frame in frames]
+
+
+def table(**columns):
+    return pd.DataFrame({"id": [1, 2, 3, 4], "price": [1.0, 2.0, 3.0, 4.0], **columns})
+
+
+def test_stream_dataframe_in_chunks():
+    [first, second] = props(stream_dataframe("grid", table(), chunk_rows=3))
+    assert first["columnDefs"] == [{"field": "id"}, {"field": "price"}]
+    assert [row["id"] for row in first["rowData"]] == [1, 2, 3]
+    assert second == {"rowTransaction": {"add": [{"id": 4, "price": 4.0}]}}
+
+
+def test_stream_dataframe_matches_records():
+    df = table(
+        when=pd.to_datetime(["2024-01-01", "2024-01-02", None, "2024-01-04"]),
+        note=["a", None, "c", np.nan],
+    )
+    first, second = props(stream_dataframe("grid", df, chunk_rows=2))
+    rows = first["rowData"] + second["rowTransaction"]["add"]
+    assert [row["id"] for row in rows] == [1, 2, 3, 4]
+    assert rows[0]["when"] == "2024-01-01T00:00:00.000"
+    assert rows[2]["when"] is None
+    assert [row["note"] for row in rows] == ["a", None, "c", None]
+
+
+def test_stream_dataframe_of_partitions():
+    partitions = [table().iloc[:2], table().iloc[2:]]
+    [first, second] = props(stream_dataframe("grid", iter(partitions)))
+    assert [row["id"] for row in first["rowData"]] == [1, 2]
+    assert [row["id"] for row in second["rowTransaction"]["add"]] == [3, 4]
+
+
+def test_stream_dataframe_appends():
+    [update] = props(stream_dataframe("grid", table(), append=True))
+    assert list(update) == ["rowTransaction"]
+    assert len(update["rowTransaction"]["add"]) == 4
+
+
+def test_stream_dataframe_with_column_defs():
+    column_defs = [{"field": "price", "headerName": "Price"}]
+    [update] = props(stream_dataframe("grid", table(), column_defs=column_defs))
+    assert update["columnDefs"] == column_defs
+
+
+def test_stream_dataframe_of_nothing_clears_the_grid():
+    assert props(stream_dataframe("grid", [])) == [{"columnDefs": [], "rowData": []}]
+    [update] = props(stream_dataframe("grid", table().iloc[:0]))
+    assert update == {"columnDefs": [{"field": "id"}, {"field": "price"}], "rowData": []}
+
+
+def test_stream_dataframe_with_pattern_matching_id():
+    frame = next(stream_dataframe({"type": "grid", "index": 1}, table()))
+    assert json.loads(frame[len(b"data: "):])[1] == {"type": "grid", "index": 1}
+
+
+def test_chunk_rows_must_be_positive():
+    with pytest.raises(ValueError):
+        list(stream_dataframe("grid", table(), chunk_rows=0))
+
+
+def test_grid_diff_sends_the_first_snapshot_whole():
+    [first] = props(GridDiff("grid").update(table()))
+    assert first["columnDefs"] == [{"field": "id"}, {"field": "price"}]
+    assert len(first["rowData"]) == 4
+
+
+def test_grid_diff_without_changes_sends_nothing():
+    grid = GridDiff("grid")
+    list(grid.update(table()))
+    assert list(grid.update(table())) == []
+
+
+def test_grid_diff_sends_changed_rows():
+    grid = GridDiff("grid")
+    df = table()
+    list(grid.update(df))
+
+    df.loc[df["id"] == 2, "price"] = 20.0
+    df = pd.concat([df[df["id"] != 4], pd.DataFrame({"id": [5], "price": [5.0]})])
+    [update] = props(grid.update(df))
+    assert update == {
+        "rowTransaction": {
+            "add": [{"id": 5, "price": 5.0}],
+            "update": [{"id": 2, "price": 20.0}],
+            "remove": [{"id": 4}],
+        }
+    }
+
+
+def test_grid_diff_keeps_its_own_snapshot():
+    grid = GridDiff("grid")
+    df = table()
+    list(grid.update(df))
+    df.loc[0, "price"] = 10.0
+    [update] = props(grid.update(df))
+    assert update == {"rowTransaction": {"update": [{"id": 1, "price": 10.0}]}}
+
+
+def test_grid_diff_treats_missing_values_as_equal():
+    grid = GridDiff("grid")
+    list(grid.update(table(note=[None, "a", None, "b"])))
+    assert list(grid.update(table(note=[None, "a", None, "b"]))) == []
+
+
+def test_grid_diff_replaces_rows_when_everything_changed():
+    grid = GridDiff("grid")
+    list(grid.update(table()))
+    [update] = props(grid.update(table().assign(price=0.0)))
+    assert list(update) == ["rowData"]
+
+
+def test_grid_diff_resends_column_defs_for_new_columns():
+    grid = GridDiff("grid")
+    list(grid.update(table()))
+    [update] = props(grid.update(table(volume=[1, 2, 3, 4])))
+    assert update["columnDefs"][-1] == {"field": "volume"}
+
+
+def test_grid_diff_rejects_duplicate_row_ids():
+    with pytest.raises(ValueError):
+        list(GridDiff("grid").update(pd.DataFrame({"id": [1, 1], "price": [1, 2]})))
+
+
+def test_grid_diff_keys_rows_by_row_id_and_resets():
+    grid = GridDiff("grid", row_id="sku")
+    df = pd.DataFrame({"sku": ["a", "b"], "qty": [1, 2]})
+    list(grid.update(df))
+    [update] = props(grid.update(df.assign(qty=[1, 3])))
+    assert update == {"rowTransaction": {"update": [{"sku": "b", "qty": 3}]}}
+
+    grid.reset()
+    [whole] = props(grid.update(df))
+    assert set(whole) == {"columnDefs", "rowData"}
@@ -0,0 +1,100 @@
+import pytest
+
+from dash_event_callback import stream_props
+from dash_event_callback._event_callback import _PatchFrame, _PropsDiffer, merge_frames
+from dash_event_callback._patch import diff_value
+
+from conftest import apply_ops, decode, register
+
+
+@pytest.mark.parametrize(
+    "old, new",
+    [
+        ({"x": [1, 2]}, {"x": [1, 2, 3], "y": 0}),
+        ({"x": [1, 2], "z": 1}, {"x": [2, 1]}),
+        ([{"a": 1}, {"a": 2}], [{"a": 1}, {"a": 3}]),
+        ([1, 2, 3, 4], [5, 6, 7, 8]),
+        ({"a": {"b": {"c": 1}}}, {"a": {"b": {"c": 2, "d": [1]}}}),
+        ([1, 2, 3], [1]),
+        ([1, 2], [1, 2, 3]),
+        ({"a": 1}, {"a": 1.0}),
+        (1, "1"),
+        (None, {"a": [1]}),
+    ],
+)
+def test_diff_value_round_trip(old, new):
+    patched = apply_ops(old, diff_value(old, new))
+    assert patched == new
+    assert type(patched) is type(new)
+
+
+def test_diff_value_of_equal_values_is_empty():
+    assert diff_value({"a": [1, {"b": 2}]}, {"a": [1, {"b": 2}]}) == []
+
+
+def test_diff_value_appends_to_lists():
+    assert diff_value({"x": [1, 2]}, {"x": [1, 2, 3]}) == [["append", ["x"], [3]]]
+
+
+def test_diff_value_replaces_mostly_changed_lists():
+    assert diff_value([1, 2, 3, 4], [5, 6, 7, 4]) == [["set", [], [5, 6, 7, 4]]]
+
+
+def test_differ_sends_only_changes():
+    differ = _PropsDiffer()
+    first = differ(stream_props("fig", {"figure": {"data": [{"y": [1, 2]}]}}))
+    second = differ(stream_props("fig", {"figure": {"data": [{"y": [1, 2, 3]}]}}))
+    unchanged = differ(stream_props("fig", {"figure": {"data": [{"y": [1, 2, 3]}]}}))
+
+    assert type(first) is _PatchFrame
+    assert decode(second) == [["[PATCH]", None, [["fig", {"figure": [["append", ["data", 0, "y"], [3]]]}]]]]
+    assert unchanged == b""
+
+
+def test_differ_keeps_components_apart():
+    differ = _PropsDiffer()
+    differ(stream_props([("a", {"v": 1}), ("b", {"v": 1})]))
+    [[_, _, updates]] = decode(differ(stream_props([("a", {"v": 1}), ("b", {"v": 2})])))
+    assert updates == [["b", {"v": [["set", [], 2]]}]]
+
+
+def test_differ_uses_the_props_at_yield_time():
+    differ = _PropsDiffer()
+    state = {"v": 0}
+    frames = []
+    for i in range(3):
+        state["v"] = i
+        frames.append(differ(stream_props("k", {"data": state})))
+        state["v"] = -1
+
+    value = None
+    for frame in frames:
+        [[_, _, [[_, ops]]]] = decode(frame)
+        value = apply_ops(value, ops["data"])
+    assert value == {"v": 2}
+
+
+def test_merge_chains_patches():
+    differ = _PropsDiffer()
+    frames = [differ(stream_props("k", {"data": [i]})) for i in range(3)]
+    [[token, _, [[_, ops]]]] = decode(merge_frames(frames))
+    assert token == "[PATCH]"
+    assert apply_ops(None, ops["data"]) == [2]
+
+
+def test_diff_stream(streams):
+    async def state(n_clicks):
+        value = {"rows": []}
+        for i in range(5):
+            value["rows"].append(i)
+            yield stream_props("store", {"data": value})
+        value["rows"] = None
+
+    data = streams.data(register(state, diff=True), n_clicks=1)
+    value = None
+    for token, _, updates in data:
+        assert token == "[PATCH]"
+        for _, ops in updates:
+            value = apply_ops(value, ops["data"])
+    assert value == {"rows": [0, 1, 2, 3, 4]}
+    assert len(data[-1][2][0][1]["data"]) == 1
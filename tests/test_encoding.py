@@ -0,0 +1,76 @@
+import datetime
+import decimal
+import json
+
+import numpy as np
+import pandas as pd
+import pytest
+from dash import html
+
+from dash_event_callback import FrameEncoder, stream_props
+
+from conftest import props, register
+
+BACKENDS = ["json", "orjson", "msgspec"]
+
+PAYLOAD = {
+    "component": html.Div("x", id="d"),
+    "array": np.arange(3),
+    "matrix": np.ones((2, 2)),
+    "scalar": np.float64(0.5),
+    "series": pd.Series([1, 2], index=["a", "b"]),
+    "timestamp": pd.Timestamp("2024-01-01"),
+    "date": datetime.date(2024, 1, 2),
+    "decimal": decimal.Decimal("1.5"),
+    "nested": [{"a": None, "b": [True, "s"]}],
+}
+
+EXPECTED = {
+    "component": {"props": {"children": "x", "id": "d"}, "type": "Div", "namespace": "dash_html_components"},
+    "array": [0, 1, 2],
+    "matrix": [[1.0, 1.0], [1.0, 1.0]],
+    "scalar": 0.5,
+    "series": {"a": 1, "b": 2},
+    "timestamp": "2024-01-01T00:00:00",
+    "date": "2024-01-02",
+    "decimal": 1.5,
+    "nested": [{"a": None, "b": [True, "s"]}],
+}
+
+
+@pytest.mark.parametrize("backend", BACKENDS)
+def test_backends_encode_the_same(backend):
+    FrameEncoder.configure(backend)
+    assert FrameEncoder.backend == backend
+    assert json.loads(FrameEncoder.dumps(PAYLOAD)) == EXPECTED
+    assert FrameEncoder.loads(FrameEncoder.dumps(EXPECTED)) == EXPECTED
+
+
+@pytest.mark.parametrize("backend", BACKENDS)
+def test_frames(backend):
+    FrameEncoder.configure(backend)
+    frame = FrameEncoder.frame(["[SINGLE]", "a", {"v": np.int32(1)}])
+    assert frame.startswith(b"data: ") and frame.endswith(b"\n\n")
+    assert json.loads(frame[len(b"data: "):]) == ["[SINGLE]", "a", {"v": 1}]
+
+
+def test_auto_picks_an_installed_backend():
+    FrameEncoder.configure("auto")
+    assert FrameEncoder.backend == "orjson"
+
+
+def test_unknown_backend():
+    with pytest.raises(ValueError, match="Unknown encoder backend"):
+        FrameEncoder.configure("pickle")
+
+
+@pytest.mark.parametrize("backend", BACKENDS)
+def test_streams_with_the_backend(streams, backend):
+    FrameEncoder.configure(backend)
+
+    def values(n_clicks):
+        yield stream_props("out", {"data": np.arange(2), "when": pd.Timestamp("2024-01-01")})
+
+    assert props(streams.data(register(values), n_clicks=1)) == [
+        ("out", {"data": [0, 1], "when": "2024-01-01T00:00:00"})
+    ]
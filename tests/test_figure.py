@@ -0,0 +1,84 @@
+import numpy as np
+import pytest
+
+from dash_event_callback import stream_extend
+from dash_event_callback._figure import _lttb, _minmax
+
+from conftest import decode
+
+
+def extend_data(frame: bytes):
+    [[token, graph_id, props]] = decode(frame)
+    assert token == "[SINGLE]"
+    return props["extendData"]
+
+
+def test_stream_extend():
+    assert extend_data(stream_extend("live", {1: {"x": [1, 2], "y": [3, 4]}}, max_points=100)) == [
+        {"x": [[1, 2]], "y": [[3, 4]]},
+        [1],
+        100,
+    ]
+    assert extend_data(stream_extend("live", [{"y": [1]}, {"y": [2]}])) == [{"y": [[1], [2]]}, [0, 1]]
+
+
+def test_stream_extend_validation():
+    with pytest.raises(ValueError, match="same data keys"):
+        stream_extend("live", [{"x": [1], "y": [1]}, {"y": [2]}])
+    with pytest.raises(ValueError, match="downsample"):
+        stream_extend("live", [{"y": [1]}], max_points=10, downsample="mean")
+    with pytest.raises(ValueError, match="at least 3"):
+        stream_extend("live", [{"y": [1]}], downsample="lttb")
+
+
+def test_lttb_keeps_the_shape():
+    x = np.arange(1000, dtype="float64")
+    y = np.zeros(1000)
+    y[417] = 10.0
+    keep = _lttb(x, y, 50)
+
+    assert len(keep) == 50
+    assert keep[0] == 0 and keep[-1] == 999
+    assert np.all(np.diff(keep) > 0)
+    assert 417 in keep
+
+
+def test_minmax_keeps_the_extremes_of_every_bucket():
+    rng = np.random.default_rng(0)
+    y = rng.normal(size=1000)
+    keep = _minmax(y, 100)
+
+    assert len(keep) <= 100
+    assert np.all(np.diff(keep) > 0)
+    for bucket in np.array_split(np.arange(1000), 50):
+        assert bucket[np.argmin(y[bucket])] in keep
+        assert bucket[np.argmax(y[bucket])] in keep
+
+
+@pytest.mark.parametrize("method", ["lttb", "minmax"])
+def test_downsampling_keeps_the_same_points_of_every_key(method):
+    x = np.arange("2026-01-01", "2026-01-05", dtype="datetime64[h]")
+    y = np.sin(np.arange(len(x)) / 5)
+    text = [f"point {i}" for i in range(len(x))]
+    data, indices, max_points = extend_data(
+        stream_extend(
+            "live",
+            {0: {"x": x, "y": y, "text": text, "name": "sensor"}},
+            max_points=1000,
+            downsample=method,
+            frame_points=20,
+        )
+    )
+
+    assert (indices, max_points) == ([0], 1000)
+    [kept] = data["text"]
+    assert len(kept) <= 20
+    positions = [int(point.split()[1]) for point in kept]
+    assert data["y"] == [[pytest.approx(y[i]) for i in positions]]
+    assert len(data["x"][0]) == len(kept)
+    assert data["name"] == ["sensor"]
+
+
+def test_short_traces_are_sent_whole():
+    data, _, _ = extend_data(stream_extend("live", [{"y": [1, 2, 3]}], max_points=10, downsample="lttb"))
+    assert data == {"y": [[1, 2, 3]]}
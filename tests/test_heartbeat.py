@@ -0,0 +1,117 @@
+import asyncio
+import threading
+import time
+
+import pytest
+
+from dash_event_callback import StreamHeartbeat, stream_props
+from dash_event_callback._heartbeat import HEARTBEAT_FRAME, with_heartbeat
+
+from conftest import parse_events, props, register
+
+
+def run_stream(stream, write):
+    asyncio.run(with_heartbeat(stream)(write))
+
+
+def test_heartbeats_while_the_stream_is_quiet():
+    StreamHeartbeat.configure(interval=0.05)
+    written = []
+
+    async def stream(write):
+        await write(b"data: 1\n\n")
+        await asyncio.sleep(0.18)
+        await write(b"data: 2\n\n")
+
+    async def write(chunk):
+        written.append(chunk)
+
+    run_stream(stream, write)
+    assert written[0] == b"data: 1\n\n" and written[-1] == b"data: 2\n\n"
+    assert 2 <= written.count(HEARTBEAT_FRAME) <= 3
+
+
+def test_no_heartbeats_for_a_busy_stream():
+    StreamHeartbeat.configure(interval=0.05)
+    written = []
+
+    async def stream(write):
+        for i in range(10):
+            await write(b"data: x\n\n")
+            await asyncio.sleep(0.01)
+
+    async def write(chunk):
+        written.append(chunk)
+
+    run_stream(stream, write)
+    assert HEARTBEAT_FRAME not in written
+
+
+def test_a_failed_heartbeat_cancels_the_stream():
+    StreamHeartbeat.configure(interval=0.05)
+    cancelled = []
+
+    async def stream(write):
+        try:
+            await asyncio.sleep(5)
+        except asyncio.CancelledError:
+            cancelled.append(True)
+            raise
+
+    async def write(chunk):
+        raise ConnectionResetError("client went away")
+
+    with pytest.raises(ConnectionResetError):
+        run_stream(stream, write)
+    assert cancelled == [True]
+
+
+def test_heartbeats_can_be_disabled():
+    StreamHeartbeat.configure(interval=None)
+    written = []
+
+    async def stream(write):
+        await asyncio.sleep(0.1)
+
+    async def write(chunk):
+        written.append(chunk)
+
+    run_stream(stream, write)
+    assert written == []
+
+
+def test_invalid_interval():
+    with pytest.raises(ValueError):
+        StreamHeartbeat.configure(interval=0)
+
+
+def test_heartbeats_of_a_slow_stream(streams):
+    StreamHeartbeat.configure(interval=0.05)
+
+    async def slow(n_clicks):
+        await asyncio.sleep(0.2)
+        yield stream_props("out", {"children": "late"})
+
+    response = streams.open(register(slow), n_clicks=1)
+    body = response.get_data()
+    assert body.startswith(HEARTBEAT_FRAME)
+    data = [event["data"] for event in parse_events(body)]
+    assert props(data) == [("out", {"children": "late"})]
+
+
+def test_closing_the_response_stops_the_generator(streams):
+    StreamHeartbeat.configure(interval=0.05)
+    closed = threading.Event()
+
+    def endless(n_clicks):
+        try:
+            while True:
+                yield stream_props("out", {"children": "tick"})
+                time.sleep(0.02)
+        finally:
+            closed.set()
+
+    response = streams.open(register(endless), n_clicks=1)
+    next(response.iter_encoded())
+    response.close()
+    assert closed.wait(2)
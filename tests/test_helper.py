@@ -0,0 +1,86 @@
+import copy
+import datetime
+import decimal
+import importlib
+import pathlib
+import sys
+
+import numpy as np
+import pandas as pd
+import plotly.graph_objects as go
+import pytest
+from dash import dcc, html
+
+from dash_event_callback.helper import recursive_to_plotly_json
+
+sys.path.insert(0, str(pathlib.Path(__file__).parents[1] / "benchmarks"))
+legacy = importlib.import_module("recursive_to_plotly_json").legacy_recursive_to_plotly_json
+
+
+class Point:
+    def __init__(self, x, y):
+        self.x, self.y = x, y
+
+    def to_dict(self):
+        return {"x": self.x, "y": self.y}
+
+
+class Opaque:
+    def __str__(self):
+        return "opaque"
+
+
+CASES = {
+    "scalars": [1, 2.5, "a", True, None],
+    "records": [{"a": 1, "b": "x"}, {"a": 2, "b": None}],
+    "nested": {"a": {"b": [1, {"c": [2, 3]}]}},
+    "numpy array": np.arange(6).reshape(2, 3),
+    "numpy scalars": {"i": np.int64(3), "f": np.float32(0.5), "b": np.bool_(True)},
+    "pandas values": [pd.Timestamp("2024-01-01 12:00"), pd.NaT],
+    "dates": [datetime.date(2024, 1, 2), datetime.datetime(2024, 1, 2, 3, 4)],
+    "decimal": decimal.Decimal("1.25"),
+    "to_dict": Point(1, 2),
+    "other objects": [Opaque()],
+    "components": html.Div([html.Span("a", id="s"), dcc.Input(value=3)], style={"color": "red"}),
+    "figure": go.Figure(go.Scatter(x=[1, 2], y=[3, 4])),
+    "figure in component": dcc.Graph(figure=go.Figure(go.Bar(x=["a"], y=[1]))),
+}
+
+
+@pytest.mark.parametrize("value", CASES.values(), ids=CASES.keys())
+def test_same_result_as_the_previous_implementation(value):
+    assert recursive_to_plotly_json(copy.deepcopy(value)) == legacy(copy.deepcopy(value))
+
+
+def test_does_not_change_its_input():
+    value = {"a": [np.int64(1)], "b": {"when": pd.Timestamp("2024-01-01")}}
+    before = copy.deepcopy(value)
+    recursive_to_plotly_json(value)
+    assert value == before
+
+
+def test_returns_plain_containers_without_copying():
+    value = {"a": 1, "b": "x"}
+    assert recursive_to_plotly_json(value) is value
+    records = [1, "a", None]
+    assert recursive_to_plotly_json(records) is records
+
+
+def test_tuples_become_lists():
+    assert recursive_to_plotly_json({"a": (1, np.int64(2))}) == {"a": [1, 2]}
+
+
+def test_datetime_arrays_become_iso_strings():
+    value = np.array(["2024-01-01T00:00"], dtype="datetime64[m]")
+    assert recursive_to_plotly_json(value) == ["2024-01-01T00:00"]
+
+
+def test_subclasses_use_the_converter_of_their_base():
+    class Flag(int):
+        pass
+
+    class Attrs(dict):
+        pass
+
+    assert recursive_to_plotly_json(Flag(1)) == 1
+    assert recursive_to_plotly_json(Attrs(a=np.int64(1))) == {"a": 1}
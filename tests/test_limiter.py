@@ -0,0 +1,73 @@
+import asyncio
+import time
+
+import pytest
+
+from dash_event_callback import StreamLimiter, stream_props
+from dash_event_callback._limiter import StreamLimitExceeded
+
+from conftest import props, register
+
+
+def test_configure_keeps_omitted_limits():
+    StreamLimiter.configure(max_streams=8, max_streams_per_callback=2)
+    StreamLimiter.configure(max_wait=1)
+    assert StreamLimiter.max_streams == 8
+    assert StreamLimiter.max_streams_per_callback == 2
+    assert StreamLimiter.max_wait == 1
+
+
+def test_waiting_streams_are_admitted_in_order():
+    StreamLimiter.configure(max_streams=1)
+    order = []
+
+    async def stream(name, hold):
+        async with StreamLimiter.slot("limited"):
+            order.append(name)
+            await asyncio.sleep(hold)
+
+    async def run():
+        first = asyncio.create_task(stream("first", 0.05))
+        await asyncio.sleep(0)
+        second = asyncio.create_task(stream("second", 0))
+        await asyncio.sleep(0)
+        third = asyncio.create_task(stream("third", 0))
+        await asyncio.sleep(0.01)
+        stats = StreamLimiter.stats()
+        await asyncio.gather(first, second, third)
+        return stats
+
+    stats = asyncio.run(run())
+    assert order == ["first", "second", "third"]
+    assert (stats["active"], stats["queued"]) == (1, 2)
+    assert StreamLimiter.stats()["active"] == 0
+
+
+def test_full_queue_rejects_at_once():
+    StreamLimiter.configure(max_streams=1, max_queued=0)
+
+    async def run():
+        async with StreamLimiter.slot("limited"):
+            with pytest.raises(StreamLimitExceeded):
+                async with StreamLimiter.slot("limited"):
+                    pass
+
+    asyncio.run(run())
+
+
+def test_limiter_rejects_streams_over_the_limit(streams):
+    StreamLimiter.configure(max_wait=0.1)
+
+    async def slow(n_clicks):
+        yield stream_props("out", {"children": "first"})
+        await asyncio.sleep(0.5)
+
+    callback_id = register(slow, max_concurrent=1)
+    first = streams.in_background(callback_id, n_clicks=1)
+    time.sleep(0.1)
+    [error] = streams.data(callback_id, n_clicks=2)
+
+    assert error[0] == "[ERROR]"
+    assert "not admitted" in error[2]["error"]
+    assert props(first()) == [("out", {"children": "first"})]
+    assert props(streams.data(callback_id, n_clicks=3)) == [("out", {"children": "first"})]
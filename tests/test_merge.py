@@ -0,0 +1,72 @@
+from dash_event_callback import Pacing, stream_props
+from dash_event_callback._event_callback import _PropsFrame, collapse_frames, merge_frames
+
+from conftest import decode, props, register
+
+
+def test_merge_collapses_repeated_props():
+    frames = [
+        stream_props("a", {"value": 1}),
+        stream_props([("a", {"value": 2}), ("b", {"children": "x"})]),
+        stream_props("a", {"style": {}}),
+    ]
+    assert decode(merge_frames(frames)) == [
+        ["[BATCH]", None, [["a", {"value": 2, "style": {}}], ["b", {"children": "x"}]]],
+    ]
+
+
+def test_merge_keeps_accumulating_props_apart():
+    frames = [
+        stream_props("grid", {"rowTransaction": {"add": [1]}}),
+        stream_props("grid", {"rowTransaction": {"add": [2]}}),
+    ]
+    assert decode(merge_frames(frames)) == [
+        ["[BATCH]", None, [["grid", {"rowTransaction": {"add": [1]}}]]],
+        ["[BATCH]", None, [["grid", {"rowTransaction": {"add": [2]}}]]],
+    ]
+
+
+def test_merge_passes_other_frames_through_in_order():
+    other = b"data: other\n\n"
+    chunks = collapse_frames([stream_props("a", {"v": 1}), other, stream_props("a", {"v": 2})])
+    assert chunks[1] == other
+    assert [type(chunk) for chunk in chunks] == [_PropsFrame, bytes, _PropsFrame]
+
+
+def test_merge_of_a_single_frame_keeps_it():
+    frame = stream_props("a", {"v": 1})
+    assert merge_frames([frame]) == frame
+
+
+def test_merge_uses_the_props_at_yield_time():
+    batch = [1, 2]
+    first = stream_props("grid", {"rowTransaction": {"add": batch}})
+    batch.clear()
+    state = {"v": 1}
+    second = stream_props("kpi", {"data": state})
+    state["v"] = -1
+
+    assert decode(merge_frames([first, second])) == [
+        ["[BATCH]", None, [["grid", {"rowTransaction": {"add": [1, 2]}}], ["kpi", {"data": {"v": 1}}]]],
+    ]
+
+
+def test_merged_pacing_keeps_reused_objects(streams):
+    async def grid(n_clicks):
+        batch = []
+        for i in range(6):
+            batch.append(i)
+            if len(batch) == 2:
+                yield stream_props("grid", {"rowTransaction": {"add": batch}})
+                batch.clear()
+            yield stream_props("kpi", {"children": i})
+
+    data = streams.data(register(grid, pacing=Pacing.coalesce(100, merge=True)), n_clicks=1)
+    added = [
+        row
+        for component_id, update in props(data)
+        if component_id == "grid"
+        for row in update["rowTransaction"]["add"]
+    ]
+    assert added == list(range(6))
+    assert props(data)[-1] == ("kpi", {"children": 5})
@@ -0,0 +1,121 @@
+import asyncio
+import queue
+import threading
+import uuid
+
+from dash_event_callback import stream_props
+from dash_event_callback._multiplex import (
+    MULTIPLEX_CANCEL_ENDPOINT,
+    MULTIPLEX_ENDPOINT,
+    MULTIPLEX_STREAM_HEADER,
+    MULTIPLEX_TAB_HEADER,
+    tag_events,
+)
+
+from conftest import parse_events, register
+
+
+class Tab:
+    """A browser tab: one multiplexed connection, streams started with POSTs."""
+
+    def __init__(self, streams):
+        self.streams = streams
+        self.id = uuid.uuid4().hex
+
+    def connect(self):
+        """Open the tab's connection in a thread of its own, like a server would."""
+        received: queue.Queue = queue.Queue()
+
+        def run():
+            response = self.streams.client.get(f"{MULTIPLEX_ENDPOINT}?tab={self.id}", buffered=False)
+            for chunk in response.iter_encoded():
+                received.put(chunk)
+            received.put(None)
+
+        threading.Thread(target=run, daemon=True).start()
+        chunks = iter(lambda: received.get(timeout=5), None)
+        assert next(chunks) == b": connected\n\n"
+        return chunks
+
+    def start(self, callback_id, **inputs) -> str:
+        stream_id = uuid.uuid4().hex
+        response = self.streams.open(
+            callback_id,
+            headers={MULTIPLEX_TAB_HEADER: self.id, MULTIPLEX_STREAM_HEADER: stream_id},
+            **inputs,
+        )
+        assert response.status_code == 202
+        return stream_id
+
+    def cancel(self, stream_id) -> bool:
+        response = self.streams.client.post(
+            MULTIPLEX_CANCEL_ENDPOINT, json={"tab": self.id, "stream": stream_id}
+        )
+        return response.json["cancelled"]
+
+
+def read(chunks, streams_done):
+    """The data of `chunks` by stream, until `streams_done` streams sent [DONE]."""
+    body = b""
+    while True:
+        body += next(chunks)
+        events = {}
+        for event in parse_events(body):
+            events.setdefault(event["event"], []).append(event["data"])
+        if sum(data[-1] == "[DONE]" for data in events.values()) >= streams_done:
+            return events
+
+
+def test_tag_events():
+    assert tag_events(b"data: 1\n\ndata: 2\n\n", "s") == b"event: s\ndata: 1\n\nevent: s\ndata: 2\n\n"
+
+
+def counter(n_clicks):
+    for i in range(3):
+        yield stream_props("out", {"children": [n_clicks, i]})
+
+
+def test_streams_share_the_tab_connection(streams):
+    tab = Tab(streams)
+    chunks = tab.connect()
+    callback_id = register(counter, multiplex=True)
+    first = tab.start(callback_id, n_clicks=1)
+    second = tab.start(callback_id, n_clicks=2)
+
+    events = read(chunks, 2)
+    for stream_id, n_clicks in ((first, 1), (second, 2)):
+        data = events[stream_id]
+        assert [frame[2] for frame in data[:-1]] == [{"children": [n_clicks, i]} for i in range(3)]
+        assert data[-1] == "[DONE]"
+
+
+def test_cancel_stops_a_multiplexed_stream(streams):
+    closed = threading.Event()
+
+    async def endless(n_clicks):
+        try:
+            while True:
+                yield stream_props("out", {"children": "tick"})
+                await asyncio.sleep(0.02)
+        finally:
+            closed.set()
+
+    tab = Tab(streams)
+    chunks = tab.connect()
+    stream_id = tab.start(register(endless, multiplex=True), n_clicks=1)
+    next(chunks)
+    assert tab.cancel(stream_id)
+    assert closed.wait(2)
+    assert not Tab(streams).cancel(stream_id)
+
+
+def test_a_new_connection_replaces_the_earlier_one(streams):
+    tab = Tab(streams)
+    stale = tab.connect()
+    current = tab.connect()
+    # The earlier connection is closed, it gets none of the frames.
+    assert list(stale) == []
+
+    stream_id = tab.start(register(counter, multiplex=True), n_clicks=1)
+    data = read(current, 1)[stream_id]
+    assert [frame[2] for frame in data[:-1]] == [{"children": [1, i]} for i in range(3)]
@@ -0,0 +1,91 @@
+import asyncio
+import time
+
+import pytest
+
+from dash_event_callback import Pacing, stream_props
+from dash_event_callback._pacing import paced
+
+from conftest import props, register
+
+
+async def produce(n, delay=0.0):
+    for i in range(n):
+        yield str(i).encode()
+        if delay:
+            await asyncio.sleep(delay)
+
+
+def collect(pacing, frames, join=b"|".join):
+    async def run():
+        chunks, times = [], []
+        start = time.monotonic()
+        async for chunk in paced(frames, pacing, join):
+            chunks.append(chunk)
+            times.append(time.monotonic() - start)
+        return chunks, times
+
+    return asyncio.run(run())
+
+
+def test_default_pacing_writes_at_once():
+    chunks, times = collect(Pacing(), produce(5))
+    assert chunks == [b"0", b"1", b"2", b"3", b"4"]
+    assert times[-1] < 0.05
+
+
+def test_fixed_pacing_spaces_writes():
+    chunks, times = collect(Pacing.fixed(0.05), produce(4))
+    assert chunks == [b"0", b"1", b"2", b"3"]
+    assert times[-1] >= 0.14
+
+
+def test_max_rate_allows_a_burst():
+    _, times = collect(Pacing.max_rate(10, burst=3), produce(4))
+    assert times[2] < 0.05
+    assert times[3] >= 0.09
+
+
+def test_coalesce_joins_frames_of_a_window():
+    chunks, _ = collect(Pacing.coalesce(100), produce(5))
+    assert chunks == [b"0|1|2|3|4"]
+
+
+def test_coalesce_does_not_hold_frames_of_a_slow_generator():
+    chunks, _ = collect(Pacing.coalesce(10), produce(3, delay=0.05))
+    assert chunks == [b"0", b"1", b"2"]
+
+
+def test_coalesce_raises_the_errors_of_the_generator():
+    async def failing():
+        yield b"0"
+        raise RuntimeError("boom")
+
+    with pytest.raises(RuntimeError, match="boom"):
+        collect(Pacing.coalesce(10), failing())
+
+
+@pytest.mark.parametrize(
+    "make",
+    [
+        lambda: Pacing.fixed(-1),
+        lambda: Pacing.max_rate(0),
+        lambda: Pacing.max_rate(10, burst=0),
+        lambda: Pacing.coalesce(-5),
+    ],
+)
+def test_invalid_pacing(make):
+    with pytest.raises(ValueError):
+        make()
+
+
+def test_paced_stream(streams):
+    def counter(n_clicks):
+        for i in range(4):
+            yield stream_props("out", {"children": i})
+
+    callback_id = register(counter, pacing=Pacing.fixed(0.05))
+    start = time.monotonic()
+    data = streams.data(callback_id, n_clicks=1)
+    assert time.monotonic() - start >= 0.14
+    assert props(data) == [("out", {"children": i}) for i in range(4)]
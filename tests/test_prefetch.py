@@ -0,0 +1,105 @@
+import asyncio
+import contextvars
+import time
+
+import pytest
+
+from dash_event_callback import stream_props
+from dash_event_callback._runtime import AsyncSource, SyncSource, iterate_source
+
+from conftest import apply_ops, props, register
+
+
+def test_prefetch_must_be_positive():
+    def counter(n_clicks):
+        yield stream_props("out", {"children": 0})
+
+    with pytest.raises(ValueError, match="prefetch"):
+        register(counter, prefetch=0)
+
+
+def test_sync_source_runs_at_most_depth_items_ahead():
+    produced = []
+
+    def numbers():
+        for i in range(10):
+            produced.append(i)
+            yield i
+
+    async def run():
+        source = SyncSource(numbers(), contextvars.copy_context(), depth=3)
+        assert await anext(source) == 0
+        await asyncio.sleep(0.1)
+        assert len(produced) == 4
+        assert [item async for item in source] == list(range(1, 10))
+        await source.aclose()
+
+    asyncio.run(run())
+
+
+def test_async_source_runs_ahead_of_the_consumer():
+    produced = []
+
+    async def numbers():
+        for i in range(10):
+            produced.append(i)
+            yield i
+
+    async def run():
+        source = AsyncSource(numbers(), 3)
+        assert await anext(source) == 0
+        await asyncio.sleep(0.05)
+        # `depth` items wait in the queue, one more waits for room.
+        assert len(produced) == 5
+        assert [item async for item in source] == list(range(1, 10))
+        await source.aclose()
+
+    asyncio.run(run())
+
+
+def test_prefetch_overlaps_fetching_with_writing():
+    async def partitions():
+        for i in range(5):
+            # Fetching the next partition
+            await asyncio.sleep(0.05)
+            yield i
+
+    async def consume(prefetch):
+        source = iterate_source(partitions(), prefetch)
+        started = time.monotonic()
+        async for _ in source:
+            # Writing to a slow client
+            await asyncio.sleep(0.05)
+        if prefetch:
+            await source.aclose()
+        return time.monotonic() - started
+
+    # Without prefetch an async generator only runs once the previous item is written.
+    assert asyncio.run(consume(4)) < 0.8 * asyncio.run(consume(None))
+
+
+def test_diff_with_prefetch_sends_the_yielded_values(streams):
+    async def state(n_clicks):
+        value = {"rows": []}
+        for i in range(5):
+            value["rows"].append(i)
+            yield stream_props("store", {"data": value})
+        value["rows"] = None
+
+    data = streams.data(register(state, diff=True, prefetch=4), n_clicks=1)
+    value = None
+    for frame in data:
+        token, _, payload = frame
+        assert token == "[PATCH]"
+        for component_id, ops in payload:
+            value = apply_ops(value, ops["data"])
+    assert value == {"rows": [0, 1, 2, 3, 4]}
+
+
+def test_sync_generator_with_prefetch(streams):
+    def counter(n_clicks):
+        for i in range(5):
+            yield stream_props("out", {"children": i})
+
+    data = streams.data(register(counter, prefetch=3), n_clicks=1)
+    assert props(data) == [("out", {"children": i}) for i in range(5)]
@@ -0,0 +1,95 @@
+import asyncio
+import os
+import threading
+import time
+import uuid
+
+import pytest
+
+from dash_event_callback import StreamRuntime, cancel_token, stream_props, stream_sleep
+
+from conftest import props, register
+
+# Event callbacks of the process pool have to be module level functions.
+
+
+def squares(n_clicks):
+    for i in range(3):
+        yield stream_props("out", {"children": [i * i, os.getpid()]})
+
+
+def failing(n_clicks):
+    yield stream_props("out", {"children": "partial"})
+    raise ValueError("boom")
+
+
+def endless(n_clicks):
+    token = cancel_token()
+    while not token.sleep(0.02):
+        yield stream_props("out", {"children": "tick"})
+
+
+def sleeping(n_clicks):
+    for i in range(2):
+        yield stream_props("out", {"children": i})
+        yield stream_sleep(0.3)
+
+
+def test_starting_a_process_stream_does_not_block_the_loop(streams):
+    # Runs first: the manager process is started by the first process stream.
+    loop = StreamRuntime.loop()
+    done = threading.Event()
+
+    async def ticker():
+        longest, last = 0.0, time.monotonic()
+        while not done.is_set():
+            await asyncio.sleep(0.01)
+            now = time.monotonic()
+            longest, last = max(longest, now - last), now
+        return longest
+
+    ticks = asyncio.run_coroutine_threadsafe(ticker(), loop)
+    data = streams.data(register(squares, executor="process"), n_clicks=1)
+    done.set()
+
+    assert [update["children"][0] for _, update in props(data)] == [0, 1, 4]
+    assert ticks.result(5) < 0.1
+
+
+def test_generator_runs_in_another_process(streams):
+    data = streams.data(register(squares, executor="process"), n_clicks=1)
+    assert {update["children"][1] for _, update in props(data)} != {os.getpid()}
+
+
+def test_errors_end_the_stream(streams):
+    data = streams.data(register(failing, executor="process"), n_clicks=1)
+    assert props(data) == [("out", {"children": "partial"})]
+    assert data[-1][0] == "[ERROR]"
+    assert "boom" in data[-1][2]["error"]
+
+
+def test_cancel_stops_the_generator(streams):
+    invocation = uuid.uuid4().hex
+    join = streams.in_background(register(endless, executor="process"), invocation=invocation, n_clicks=1)
+    time.sleep(1)
+    started = time.monotonic()
+    assert streams.cancel(invocation)
+    assert props(join())
+    assert time.monotonic() - started < 2
+
+
+def test_stream_sleep_is_not_idle_time(streams):
+    data = streams.data(register(sleeping, executor="process", idle_timeout=0.2), n_clicks=1)
+    assert props(data) == [("out", {"children": 0}), ("out", {"children": 1})]
+
+
+def test_process_executor_validation():
+    async def agen(n_clicks):
+        yield stream_props("out", {})
+
+    with pytest.raises(ValueError):
+        register(agen, executor="process")
+    with pytest.raises(ValueError):
+        register(squares, executor="process", diff=True)
+    with pytest.raises(ValueError):
+        register(squares, executor="pool")
@@ -0,0 +1,115 @@
+import asyncio
+import threading
+import time
+import uuid
+
+from dash_event_callback import MemoryReplayBackend, StreamReplay, stream_props
+from dash_event_callback._encoding import ServerSentEvent
+
+from conftest import last_event_id, parse_events, props, register
+
+
+def test_server_sent_events():
+    assert ServerSentEvent(b'["x"]').encode() == b'data: ["x"]\n\n'
+    assert ServerSentEvent(id="s.1").encode() == b"id: s.1\n\n"
+    assert ServerSentEvent(retry=500).encode() == b"retry: 500\n\n"
+    assert ServerSentEvent(b"1", event="e", id="s.2", retry=10).encode() == (
+        b"event: e\nid: s.2\nretry: 10\ndata: 1\n\n"
+    )
+
+
+def counter(n_clicks):
+    for i in range(6):
+        yield stream_props("out", {"children": i})
+        time.sleep(0.05)
+
+
+def read_until(response, n_events):
+    """Read `response` until `n_events` data events arrived, then drop the connection."""
+    chunks = response.iter_encoded()
+    body = b""
+    while len(parse_events(body)) < n_events:
+        body += next(chunks)
+    response.close()
+    return body
+
+
+def test_resume_continues_after_the_last_event_id(streams):
+    callback_id = register(counter, resumable=True)
+    first = read_until(streams.open(callback_id, n_clicks=1), 2)
+    assert first.startswith(b"retry: 1000\n\n")
+
+    resumed = streams.open(callback_id, headers={"Last-Event-ID": last_event_id(first)}, n_clicks=1)
+    data = [event["data"] for event in parse_events(first + resumed.get_data())]
+    assert props(data) == [("out", {"children": i}) for i in range(6)]
+    assert data[-1] == "[DONE]"
+
+
+def test_every_chunk_is_numbered(streams):
+    StreamReplay.configure(retry=250)
+    body = streams.open(register(counter, resumable=True), n_clicks=1).get_data()
+    stream_id, _, _ = last_event_id(body).rpartition(".")
+    ids = [line for line in body.decode().splitlines() if line.startswith("id: ")]
+    assert ids == [f"id: {stream_id}.{seq}" for seq in range(1, 8)]
+    assert body.startswith(b"retry: 250\n\n")
+
+
+def test_resume_of_a_completed_stream_replays_the_rest(streams):
+    callback_id = register(counter, resumable=True)
+    body = streams.open(callback_id, n_clicks=1).get_data()
+    stream_id, _, _ = last_event_id(body).rpartition(".")
+
+    resumed = streams.data(callback_id, headers={"Last-Event-ID": f"{stream_id}.4"}, n_clicks=1)
+    assert props(resumed) == [("out", {"children": 4}), ("out", {"children": 5})]
+    assert resumed[-1] == "[DONE]"
+
+
+def test_resume_of_an_unknown_stream_errors(streams):
+    callback_id = register(counter, resumable=True)
+    for last_event_id_ in (f"{uuid.uuid4().hex}.1", "not-an-id"):
+        [error] = streams.data(callback_id, headers={"Last-Event-ID": last_event_id_}, n_clicks=1)
+        assert error[0] == "[ERROR]"
+        assert error[2]["handle_error"]
+
+
+def test_resume_after_dropped_frames_errors(streams):
+    StreamReplay.configure(backend=MemoryReplayBackend(max_frames=2))
+    callback_id = register(counter, resumable=True)
+    body = streams.open(callback_id, n_clicks=1).get_data()
+    stream_id, _, _ = last_event_id(body).rpartition(".")
+
+    [error] = streams.data(callback_id, headers={"Last-Event-ID": f"{stream_id}.1"}, n_clicks=1)
+    assert "dropped" in error[2]["error"]
+
+
+def test_abandoned_streams_are_cancelled(streams):
+    StreamReplay.configure(resume_timeout=0.2)
+    closed = threading.Event()
+
+    async def endless(n_clicks):
+        try:
+            while True:
+                yield stream_props("out", {"children": "tick"})
+                await asyncio.sleep(0.02)
+        finally:
+            closed.set()
+
+    read_until(streams.open(register(endless, resumable=True), n_clicks=1), 1)
+    assert not closed.wait(0.1)
+    assert closed.wait(2)
+
+
+def test_memory_backend():
+    backend = MemoryReplayBackend(max_frames=2, ttl=0)
+
+    async def run():
+        await backend.open("k")
+        for seq in (1, 2, 3):
+            await backend.append("k", seq, b"%d" % seq)
+        assert await backend.read("k", 1) == ([(2, b"2"), (3, b"3")], False)
+        await backend.finish("k")
+        await asyncio.sleep(0.01)
+        assert await backend.read("k", 0) is None
+        assert await backend.read("unknown", 0) is None
+
+    asyncio.run(run())
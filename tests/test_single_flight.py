@@ -0,0 +1,66 @@
+import asyncio
+import time
+
+from dash_event_callback import stream_props
+from dash_event_callback._event_callback import generate_flight_key
+
+from conftest import props, register
+
+
+def test_flight_key_ignores_the_order_of_inputs():
+    assert generate_flight_key("cb", {"a": 1, "b": [1, 2]}) == generate_flight_key("cb", {"b": [1, 2], "a": 1})
+    assert generate_flight_key("cb", {"a": 1}) != generate_flight_key("cb", {"a": 2})
+    assert generate_flight_key("cb", {"a": 1}) != generate_flight_key("other", {"a": 1})
+
+
+def test_single_flight_runs_the_generator_once(streams):
+    runs = []
+
+    async def shared(n_clicks):
+        runs.append(n_clicks)
+        for i in range(4):
+            yield stream_props("out", {"children": i})
+            await asyncio.sleep(0.1)
+
+    callback_id = register(shared, single_flight=True)
+    first = streams.in_background(callback_id, n_clicks=1)
+    time.sleep(0.15)
+    # Joins late and still gets the frames produced so far.
+    second = streams.in_background(callback_id, n_clicks=1)
+
+    expected = [("out", {"children": i}) for i in range(4)]
+    for join in (first, second):
+        data = join()
+        assert props(data) == expected
+        assert data[-1] == "[DONE]"
+    assert runs == [1]
+
+
+def test_single_flight_runs_other_inputs_apart(streams):
+    runs = []
+
+    async def shared(n_clicks):
+        runs.append(n_clicks)
+        for i in range(2):
+            yield stream_props("out", {"children": n_clicks})
+            await asyncio.sleep(0.1)
+
+    callback_id = register(shared, single_flight=True)
+    first = streams.in_background(callback_id, n_clicks=1)
+    second = streams.in_background(callback_id, n_clicks=2)
+
+    assert props(first()) == [("out", {"children": 1})] * 2
+    assert props(second()) == [("out", {"children": 2})] * 2
+    assert sorted(runs) == [1, 2]
+
+
+def test_single_flight_starts_over_after_the_stream_ended(streams):
+    runs = []
+
+    async def shared(n_clicks):
+        runs.append(n_clicks)
+        yield stream_props("out", {"children": len(runs)})
+
+    callback_id = register(shared, single_flight=True)
+    assert props(streams.data(callback_id, n_clicks=1)) == [("out", {"children": 1})]
+    assert props(streams.data(callback_id, n_clicks=1)) == [("out", {"children": 2})]
@@ -0,0 +1,97 @@
+import asyncio
+import contextvars
+import threading
+import time
+
+import pytest
+
+from dash_event_callback import StreamRuntime, stream_props, stream_sleep
+from dash_event_callback._runtime import StepSource, SyncSource, iterate_source
+
+from conftest import props, register
+
+
+@pytest.fixture
+def stepped():
+    StreamRuntime.configure(step_workers=2)
+
+
+def test_step_workers_must_be_positive():
+    with pytest.raises(ValueError):
+        StreamRuntime.configure(step_workers=0)
+
+
+def test_sync_generators_are_stepped_unless_blocking(stepped):
+    def numbers():
+        yield 1
+
+    assert isinstance(iterate_source(numbers()), StepSource)
+    assert isinstance(iterate_source(numbers(), blocking=True), SyncSource)
+
+
+def test_many_sleeping_streams_share_few_threads(streams, stepped):
+    threads = set()
+
+    def poll(n_clicks):
+        for i in range(3):
+            threads.add(threading.current_thread().name)
+            yield stream_props("out", {"children": i})
+            yield stream_sleep(0.2)
+
+    callback_id = register(poll)
+    started = time.monotonic()
+    joins = [streams.in_background(callback_id, n_clicks=n) for n in range(10)]
+    for join in joins:
+        assert props(join()) == [("out", {"children": i}) for i in range(3)]
+
+    # Ten streams waiting at once on two threads, not one after another.
+    assert time.monotonic() - started < 2
+    assert len(threads) <= 2
+    assert all(name.startswith("dash-event-callback-step") for name in threads)
+
+
+def test_blocking_generators_keep_a_worker(streams, stepped):
+    threads = set()
+
+    def blocking(n_clicks):
+        for i in range(2):
+            threads.add(threading.current_thread().name)
+            yield stream_props("out", {"children": i})
+
+    data = streams.data(register(blocking, blocking=True), n_clicks=1)
+    assert props(data) == [("out", {"children": 0}), ("out", {"children": 1})]
+    assert len(threads) == 1
+    assert not threads.pop().startswith("dash-event-callback-step")
+
+
+def test_step_source_closes_the_generator(stepped):
+    closed = threading.Event()
+
+    def numbers():
+        try:
+            while True:
+                yield 1
+        finally:
+            closed.set()
+
+    async def run():
+        source = StepSource(numbers(), contextvars.copy_context())
+        assert await anext(source) == 1
+        await source.aclose()
+
+    asyncio.run(run())
+    assert closed.wait(2)
+
+
+def test_step_source_passes_context_variables(stepped):
+    variable = contextvars.ContextVar("variable")
+    variable.set("value")
+
+    def read():
+        yield variable.get()
+
+    async def run():
+        source = StepSource(read(), contextvars.copy_context())
+        return [item async for item in source]
+
+    assert asyncio.run(run()) == ["value"]
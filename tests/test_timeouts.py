@@ -0,0 +1,79 @@
+import asyncio
+import time
+
+import pytest
+
+from dash_event_callback import StreamRuntime, stream_props, stream_sleep
+
+from conftest import props, register
+
+
+def test_timeout(streams):
+    async def endless(n_clicks):
+        while True:
+            yield stream_props("out", {"children": "tick"})
+            await asyncio.sleep(0.05)
+
+    data = streams.data(register(endless, timeout=0.2), n_clicks=1)
+    assert data[-1][0] == "[ERROR]"
+    assert "exceeded its timeout" in data[-1][2]["error"]
+
+
+def test_idle_timeout(streams):
+    async def stalls(n_clicks):
+        yield stream_props("out", {"children": "first"})
+        await asyncio.sleep(5)
+        yield stream_props("out", {"children": "never"})
+
+    data = streams.data(register(stalls, idle_timeout=0.2), n_clicks=1)
+    assert props(data) == [("out", {"children": "first"})]
+    assert "produced nothing for" in data[-1][2]["error"]
+
+
+def test_idle_timeout_of_a_blocked_sync_generator(streams):
+    def stalls(n_clicks):
+        yield stream_props("out", {"children": "first"})
+        time.sleep(0.5)
+        yield stream_props("out", {"children": "late"})
+
+    data = streams.data(register(stalls, idle_timeout=0.2), n_clicks=1)
+    assert props(data) == [("out", {"children": "first"})]
+    assert "produced nothing for" in data[-1][2]["error"]
+
+
+@pytest.fixture(params=["async", "sync", "stepped"])
+def sleeper(request):
+    """A generator that waits in `stream_sleep` longer than the idle timeout."""
+    if request.param == "stepped":
+        StreamRuntime.configure(step_workers=2)
+
+    if request.param == "async":
+
+        async def sleeper(n_clicks):
+            for i in range(2):
+                yield stream_props("out", {"children": i})
+                yield stream_sleep(0.3)
+
+    else:
+
+        def sleeper(n_clicks):
+            for i in range(2):
+                yield stream_props("out", {"children": i})
+                yield stream_sleep(0.3)
+
+    return sleeper
+
+
+def test_stream_sleep_is_not_idle_time(streams, sleeper):
+    started = time.monotonic()
+    data = streams.data(register(sleeper, idle_timeout=0.2), n_clicks=1)
+    assert props(data) == [("out", {"children": 0}), ("out", {"children": 1})]
+    assert time.monotonic() - started >= 0.6
+
+
+def test_stream_sleep_counts_toward_the_timeout(streams, sleeper):
+    started = time.monotonic()
+    data = streams.data(register(sleeper, timeout=0.2), n_clicks=1)
+    assert props(data) == [("out", {"children": 0})]
+    assert "exceeded its timeout" in data[-1][2]["error"]
+    assert time.monotonic() - started < 0.3